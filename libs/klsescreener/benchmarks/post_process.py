@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Benchmark KLSEScreener._post_process_dataframe against the row by row implementation it replaced.
+
+C:\\Users\\KLSEScreener> python libs\\klsescreener\\benchmarks\\post_process.py --rows 10000
+"""
+
+# Import standard libraries
+from urllib.parse import urljoin
+import argparse
+import timeit
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from klsescreener import KLSEScreener
+
+
+def legacy_post_process_dataframe(url: str, dataframe_raw: pandas.DataFrame) -> pandas.DataFrame:
+    dataframe = pandas.DataFrame()
+    for (column, _), series in dataframe_raw.items():
+        values = series.apply(lambda x: x[0])
+        links = series.apply(lambda x: x[1])
+        if values.isna().all():
+            dataframe[column] = links
+        elif links.isna().all():
+            dataframe[column] = values
+        else:
+            dataframe[f"{column}Link"] = links.apply(lambda x: urljoin(url, x) if x else "")
+            dataframe[column] = values
+
+    number_of_columns = len(dataframe.columns)
+    rows_to_drop = []
+    for index, row in dataframe.iterrows():
+        if len(row.unique()) < (0.5 * number_of_columns):
+            rows_to_drop.append(index)
+    for index in reversed(rows_to_drop):
+        dataframe.drop(labels=index, inplace=True)
+
+    dataframe = dataframe.loc[:, ~(dataframe.isin(["", "View"])).all()]
+    dataframe.reset_index(inplace=True)
+    return dataframe
+
+
+def synthetic_table(rows: int, seed: int = 0) -> pandas.DataFrame:
+    """Table shaped like pandas.read_html(extract_links="all") output of a report page, with dummy rows mixed in.
+    """
+    rng = numpy.random.default_rng(seed)
+    codes = rng.integers(0, 9999, rows)
+    data = {
+        ("Name", None): [(f"STOCK{code}", f"/v2/stocks/view/{code:04d}") for code in codes],
+        ("Date", None): [(f"2024-{month:02d}-01", None) for month in rng.integers(1, 13, rows)],
+        ("Price", None): [(f"{price:.3f}", None) for price in rng.random(rows) * 10],
+        ("Change", None): [(f"{change:.2f}%", None) for change in rng.normal(0, 2, rows)],
+        ("Volume", None): [(f"{volume}k", None) for volume in rng.integers(1, 5000, rows)],
+        ("Remark", None): [("", None)] * rows,
+        ("Report", None): [("View", f"/v2/financial-reports/{code}") for code in codes],
+        ("", "/v2/chart"): [(None, f"/v2/charting/chart/{code:04d}") for code in codes],
+    }
+    dataframe = pandas.DataFrame(data=data)
+    dummy = rng.random(rows) < 0.1
+    dataframe.loc[dummy, :] = pandas.Series([("Quarter", None)] * len(dataframe.columns), index=dataframe.columns).to_numpy()
+    return dataframe
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    klsescreener = KLSEScreener()
+    dataframe_raw = synthetic_table(rows=args.rows)
+    pandas.testing.assert_frame_equal(
+        klsescreener._post_process_dataframe(dataframe_raw.copy()),
+        legacy_post_process_dataframe(klsescreener.url, dataframe_raw.copy()),
+    )
+
+    legacy = min(timeit.repeat(lambda: legacy_post_process_dataframe(klsescreener.url, dataframe_raw), number=1, repeat=args.repeat))
+    vectorized = min(timeit.repeat(lambda: klsescreener._post_process_dataframe(dataframe_raw), number=1, repeat=args.repeat))
+    print(f"rows={args.rows} legacy={legacy:.4f}s vectorized={vectorized:.4f}s speedup={legacy / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
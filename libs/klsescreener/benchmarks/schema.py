@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Memory of a screener table before and after the screener schema, and the time of a filter on each.
+
+C:\\Users\\KLSEScreener> python libs\\klsescreener\\benchmarks\\schema.py --rows 1000
+"""
+
+# Import standard libraries
+import argparse
+import random
+import timeit
+
+# Import third-party libraries
+import pandas
+
+# Import internal libraries
+from klsescreener import SCHEMAS, memory_report
+
+
+def synthetic_screener(rows: int) -> pandas.DataFrame:
+    """Screener table with text values like the downloaded one.
+    """
+    generator = random.Random(0)
+    categories = ["Construction", "Financial Services", "Technology", "Health Care", "Utilities", "Property", "REIT"]
+    markets = ["Main Market", "Ace Market", "Leap Market", "ETF"]
+    return pandas.DataFrame(data={
+        "Name": [f"STOCK{row}" for row in range(rows)],
+        "Code": [f"{row:04d}" for row in range(rows)],
+        "Category": [generator.choice(categories) for _ in range(rows)],
+        "Price": [f"{generator.uniform(0.05, 30):.3f}" for _ in range(rows)],
+        "Change%": [f"{generator.uniform(-10, 10):.2f}%" for _ in range(rows)],
+        "Volume": [f"{generator.uniform(1, 999):.1f}k" for _ in range(rows)],
+        "EPS": [f"{generator.uniform(-5, 50):.2f}" for _ in range(rows)],
+        "DPS": [f"{generator.uniform(0, 20):.2f}" for _ in range(rows)],
+        "NTA": [f"{generator.uniform(0, 5):.4f}" for _ in range(rows)],
+        "PE": [generator.choice(["-", f"{generator.uniform(1, 60):.2f}"]) for _ in range(rows)],
+        "DY": [f"{generator.uniform(0, 12):.2f}" for _ in range(rows)],
+        "ROE": [f"{generator.uniform(-20, 40):.2f}" for _ in range(rows)],
+        "PTBV": [f"{generator.uniform(0.1, 10):.2f}" for _ in range(rows)],
+        "MCap.(M)": [f"{generator.uniform(5, 90000):,.2f}" for _ in range(rows)],
+        "Market": [generator.choice(markets) for _ in range(rows)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dataframe = synthetic_screener(rows=args.rows)
+    typed = SCHEMAS["screener"].apply(dataframe=dataframe)
+    print(memory_report(before=dataframe, after=typed).to_string())
+
+    text = min(timeit.repeat(lambda: (pandas.to_numeric(dataframe["DY"], errors="coerce") > 5) & (dataframe["Market"] == "Main Market"), number=1, repeat=args.repeat))
+    compact = min(timeit.repeat(lambda: (typed["DY"] > 5) & (typed["Market"] == "Main Market"), number=1, repeat=args.repeat))
+    print(f"rows={args.rows} filter text={text:.5f}s typed={compact:.5f}s speedup={text / compact:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Benchmark TableExtractor against pandas.read_html on a page shaped like a stock page.
+
+C:\\Users\\KLSEScreener> python libs\\klsescreener\\benchmarks\\tables.py --rows 200
+"""
+
+# Import standard libraries
+from io import StringIO
+import argparse
+import timeit
+
+# Import third-party libraries
+import pandas
+
+# Import internal libraries
+from klsescreener import TableExtractor
+
+
+def synthetic_page(tables: int, rows: int) -> str:
+    """Page with a number of report tables, each with a link column.
+    """
+    body = "".join(
+        f"<tr><td>{2000 + row}</td><td>{row * 1000:,}</td><td>{row / 7:.4f}</td><td><a href='/v2/financial-reports/{row}'>View</a></td></tr>"
+        for row in range(rows)
+    )
+    return "<html><body>" + "".join(
+        f"<table><tr><th>Financial Year</th><th>Revenue</th><th>EPS</th><th>Report</th></tr>{body}</table>" for _ in range(tables)
+    ) + "</body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = synthetic_page(tables=args.tables, rows=args.rows)
+    pandas.testing.assert_frame_equal(TableExtractor(document=html).table(index=1, extract_links="all"), pandas.read_html(StringIO(html), extract_links="all")[1])
+
+    read_html = min(timeit.repeat(lambda: pandas.read_html(StringIO(html), extract_links="all")[1], number=1, repeat=args.repeat))
+    extractor = min(timeit.repeat(lambda: TableExtractor(document=html).table(index=1, extract_links="all"), number=1, repeat=args.repeat))
+    print(f"tables={args.tables} rows={args.rows} read_html={read_html:.4f}s extractor={extractor:.4f}s speedup={read_html / extractor:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,13 @@
 
 # -*- coding: utf-8 -*-
 
+from .cache import ResponseCache
+from .engine import FetchEngine
+from .flight import SingleFlight
+from .limiter import AdaptiveLimiter, TokenBucket
+from .query import QueryEngine
 from .resolution import Resolution
+from .schema import SCHEMAS, Schema, memory_report
 from .screener import KLSEScreener
+from .snapshot import ScreenerSnapshot
+from .tables import TableExtractor
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Responses of the website kept on disk between calls and between processes.
+
+A response is served from disk while it is younger than the time to live of its url. Once it is older, it is
+revalidated with If-None-Match / If-Modified-Since when the server sent an ETag or Last-Modified, a 304 Not Modified
+keeps the stored body. Tables parsed from a body are stored next to it as JSON and are only used with that exact body.
+Least recently used entries are evicted once the cache is larger than max_bytes.
+"""
+
+# Import standard libraries
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+import os
+import re
+
+# Import third-party libraries
+from requests.structures import CaseInsensitiveDict
+import requests
+import pandas
+import numpy
+
+
+# Seconds each url is kept before it is revalidated, the first pattern searched in the url decides, 0 is not cached
+TTLS = [
+    (r"/screener(?:_warrants)?/quote_results", 300),
+    (r"/stocks/view/", 6 * 3600),
+    (r"/entitlements/|/financial-reports", 3600),
+    (r"/markets", 300),
+    (r"/history", 60),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER,
+    headers TEXT,
+    encoding TEXT,
+    body BLOB,
+    digest TEXT,
+    stored REAL,
+    accessed REAL,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS frames (
+    url TEXT,
+    key TEXT,
+    digest TEXT,
+    data BLOB,
+    accessed REAL,
+    size INTEGER,
+    PRIMARY KEY (url, key)
+);
+"""
+
+
+def digest(content: bytes | str) -> str:
+    return hashlib.sha1(content.encode("utf-8") if isinstance(content, str) else content).hexdigest()
+
+
+def _encode_value(value: object) -> object:
+    """JSON value of a cell or column label, tuples like the (text, link) cells of extract_links are tagged.
+    """
+    if isinstance(value, tuple):
+        return {"tuple": [_encode_value(value=item) for item in value]}
+    if isinstance(value, numpy.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return {"text": str(value)}
+
+
+def _decode_value(value: object) -> object:
+    if isinstance(value, dict):
+        return tuple(_decode_value(value=item) for item in value["tuple"]) if "tuple" in value else value["text"]
+    return value
+
+
+def _encode_index(index: pandas.Index) -> dict:
+    if isinstance(index, pandas.RangeIndex):
+        return {"range": [index.start, index.stop, index.step], "names": list(index.names)}
+    return {"values": [_encode_value(value=value) for value in index], "multi": isinstance(index, pandas.MultiIndex), "names": list(index.names)}
+
+
+def _decode_index(data: dict) -> pandas.Index:
+    if "range" in data:
+        return pandas.RangeIndex(*data["range"], name=data["names"][0])
+    values = [_decode_value(value=value) for value in data["values"]]
+    if data["multi"]:
+        return pandas.MultiIndex.from_tuples(values, names=data["names"])
+    return pandas.Index(values, dtype=object if not values else None, tupleize_cols=False, name=data["names"][0])
+
+
+def encode_frames(value: pandas.DataFrame | list) -> bytes:
+    """JSON of a dataframe or a list of them with their columns, index and dtypes, so that nothing but data is stored.
+    """
+    def encode(dataframe):
+        return {
+            "columns": _encode_index(index=dataframe.columns),
+            "index": _encode_index(index=dataframe.index),
+            "dtypes": [str(dtype) for dtype in dataframe.dtypes],
+            "data": [[_encode_value(value=cell) for cell in dataframe.iloc[:, position].tolist()] for position in range(dataframe.shape[1])],
+        }
+    data = {"frames": [encode(dataframe) for dataframe in value]} if isinstance(value, list) else {"frame": encode(value)}
+    return json.dumps(data).encode("utf-8")
+
+
+def decode_frames(data: bytes) -> pandas.DataFrame | list:
+    def decode(frame):
+        index = _decode_index(data=frame["index"])
+        columns = {position: pandas.Series(data=[_decode_value(value=cell) for cell in cells], index=index, dtype=object).astype(dtype) for position, (cells, dtype) in enumerate(zip(frame["data"], frame["dtypes"]))}
+        dataframe = pandas.DataFrame(data=columns, index=index)
+        dataframe.columns = _decode_index(data=frame["columns"])
+        return dataframe
+    value = json.loads(data)
+    return [decode(frame) for frame in value["frames"]] if "frames" in value else decode(value["frame"])
+
+
+class ResponseCache:
+    """HTTP cache keyed by url in a SQLite file under directory, safe to share between threads and processes.
+    ttls is a list of (url pattern, seconds) searched in order, urls without a match use default_ttl.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 ** 2, ttls: list | None = None, default_ttl: float = 0):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), seconds) for pattern, seconds in (TTLS if ttls is None else ttls)]
+        self.default_ttl = default_ttl
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        # Running total of the stored bytes, counted again from the file only when it is over max_bytes
+        self._bytes = self.size()
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def ttl(self, url: str) -> float:
+        for pattern, seconds in self.ttls:
+            if pattern.search(url):
+                return seconds
+        return self.default_ttl
+
+    def lookup(self, url: str) -> dict | None:
+        """Stored entry of a url with whether it is still fresh, None if the url is not stored or not cached.
+        """
+        ttl = self.ttl(url=url)
+        if ttl <= 0:
+            return None
+        rows = self._execute("SELECT status, headers, encoding, body, stored FROM responses WHERE url = ?", (url,))
+        if not rows:
+            return None
+        status, headers, encoding, body, stored = rows[0]
+        now = time.time()
+        self._execute("UPDATE responses SET accessed = ? WHERE url = ?", (now, url))
+        return {"url": url, "status": status, "headers": json.loads(headers), "encoding": encoding, "body": body, "fresh": now - stored < ttl}
+
+    def validators(self, entry: dict) -> dict:
+        """Headers of a conditional request for a stale entry, empty if the server sent neither ETag nor Last-Modified.
+        """
+        headers = CaseInsensitiveDict(entry["headers"])
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def response(self, entry: dict) -> requests.Response:
+        """requests.Response with the stored status, headers and body of an entry.
+        """
+        response = requests.Response()
+        response.url = entry["url"]
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response._content = entry["body"]
+        return response
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Keep a 200 OK response of a cached url.
+        """
+        if response.status_code != 200 or self.ttl(url=url) <= 0:
+            return
+        body = response.content
+        now = time.time()
+        with self._lock:
+            previous = self._execute("SELECT size FROM responses WHERE url = ?", (url,))
+            self._execute(
+                "INSERT OR REPLACE INTO responses (url, status, headers, encoding, body, digest, stored, accessed, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(dict(response.headers)), response.encoding, body, digest(content=body), now, now, len(body)),
+            )
+            self._bytes += len(body) - (previous[0][0] if previous else 0)
+        self._evict()
+
+    def revalidated(self, entry: dict, response: requests.Response) -> requests.Response:
+        """Stored response of an entry the server answered 304 Not Modified, fresh again from now.
+        """
+        headers = {**entry["headers"], **{key: value for key, value in response.headers.items() if key in ("ETag", "Last-Modified", "Date", "Cache-Control", "Expires")}}
+        self._execute("UPDATE responses SET headers = ?, stored = ? WHERE url = ?", (json.dumps(headers), time.time(), entry["url"]))
+        return self.response(entry={**entry, "headers": headers})
+
+    def frame(self, url: str, key: str, content: bytes | str) -> object | None:
+        """Value parsed from content under key, None unless it was stored with the same content.
+        """
+        rows = self._execute("SELECT data FROM frames WHERE url = ? AND key = ? AND digest = ?", (url, key, digest(content=content)))
+        if not rows:
+            return None
+        self._execute("UPDATE frames SET accessed = ? WHERE url = ? AND key = ?", (time.time(), url, key))
+        try:
+            return decode_frames(data=rows[0][0])
+        except (ValueError, KeyError, TypeError, UnicodeDecodeError):
+            # Written by another version, parse the body again
+            return None
+
+    def store_frame(self, url: str, key: str, content: bytes | str, value: pandas.DataFrame | list) -> None:
+        if self.ttl(url=url) <= 0:
+            return
+        data = encode_frames(value=value)
+        with self._lock:
+            previous = self._execute("SELECT size FROM frames WHERE url = ? AND key = ?", (url, key))
+            self._execute(
+                "INSERT OR REPLACE INTO frames (url, key, digest, data, accessed, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, key, digest(content=content), data, time.time(), len(data)),
+            )
+            self._bytes += len(data) - (previous[0][0] if previous else 0)
+        self._evict()
+
+    def size(self) -> int:
+        rows = self._execute("SELECT (SELECT COALESCE(SUM(size), 0) FROM responses) + (SELECT COALESCE(SUM(size), 0) FROM frames)")
+        return rows[0][0]
+
+    def _evict(self) -> None:
+        """Drop least recently used responses and tables until the cache fits in max_bytes.
+        The file is only scanned once the running total is over max_bytes, other processes may have evicted already.
+        """
+        with self._lock:
+            if self._bytes <= self.max_bytes:
+                return
+            self._bytes = self.size()
+            if self._bytes <= self.max_bytes:
+                return
+            rows = self._execute("SELECT 'responses', url, '', size, accessed FROM responses UNION ALL SELECT 'frames', url, key, size, accessed FROM frames ORDER BY accessed")
+            for table, url, key, size, _ in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                if table == "responses":
+                    self._execute("DELETE FROM responses WHERE url = ?", (url,))
+                else:
+                    self._execute("DELETE FROM frames WHERE url = ? AND key = ?", (url, key))
+                self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._execute("DELETE FROM responses")
+            self._execute("DELETE FROM frames")
+            self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+import weakref
+import asyncio
+
+
+class FetchEngine:
+    """Run blocking fetch calls from asyncio with a bounded number of calls in flight.
+    Callers may schedule any number of coroutines, at most `concurrency` of them hold a worker at a time
+    and the rest wait on the semaphore without costing a thread.
+    The transport is still the blocking requests session, so every call in flight holds one thread of the pool:
+    `concurrency` is the number of requests actually in flight and each of them costs a thread. Hundreds in flight
+    need a pool of hundreds of threads, and the shared session's pool_size (see configure_session()) as well.
+    """
+
+    def __init__(self, concurrency: int = 32):
+        self.concurrency = concurrency
+        self._executor = None
+        self._lock = threading.Lock()
+        # asyncio.Semaphore is bound to the loop it is first used on, keep one per running loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="klsescreener")
+            return self._executor
+
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._semaphores:
+                self._semaphores[loop] = asyncio.Semaphore(value=self.concurrency)
+            return self._semaphores[loop]
+
+    def resize(self, concurrency: int) -> None:
+        """Change the number of calls allowed in flight, takes effect for loops started afterwards.
+        """
+        with self._lock:
+            self.concurrency = concurrency
+            self._semaphores = weakref.WeakKeyDictionary()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def run(self, func, *args, **kwargs):
+        """Await a blocking call once a slot is free.
+        """
+        async with self.semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once their calls are done, the next call starts new ones.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
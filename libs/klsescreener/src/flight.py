@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from concurrent.futures import Future
+import threading
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one.
+    The first caller of a key runs the call, callers arriving while it runs wait for it and share its result or
+    its exception. A call arriving after it finished runs again, nothing is kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: object, func, *args, **kwargs) -> tuple:
+        """Run func(*args, **kwargs) unless a call of key is already running, returns (result, shared).
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Rate and concurrency limits of the requests sent to the website.
+
+A token bucket caps the request rate of the process. On top of it the number of requests in flight follows AIMD:
+it grows by one for every limit's worth of healthy responses and is halved on a 429, a 5xx, a failed connection or a
+response much slower than usual. A Retry-After header stops every request of the process until it has passed.
+"""
+
+# Import standard libraries
+from email.utils import parsedate_to_datetime
+import contextlib
+import threading
+import datetime
+import time
+
+
+def retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (moment - datetime.datetime.now(tz=datetime.timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """rate tokens per second up to burst tokens, acquire() takes one and waits for it if none is left.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, returns the seconds waited for it.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Give out no token for seconds from now, a longer pause already running is kept.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class AdaptiveLimiter:
+    """Token bucket with an AIMD limit on the requests in flight, shared by every thread of the process.
+    The limit starts at initial, the default thread_count of generate_dashboard, and stays within [minimum, maximum].
+    It is decreased at most once per smoothed latency so that one burst of errors only halves it once.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 20, initial: int = 16, minimum: int = 1, maximum: int = 32, decrease: float = 0.5, latency_factor: float = 3.0):
+        self.bucket = TokenBucket(rate=rate, burst=burst)
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latency = None  # Smoothed latency of healthy responses in seconds
+        self.in_flight = 0
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a slot under the limit and a token, returns the seconds waited.
+        """
+        start = time.monotonic()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            self.bucket.acquire()
+        except BaseException:
+            self.release(status=None, latency=0.0, adapt=False)
+            raise
+        return time.monotonic() - start
+
+    def release(self, status: int | None, latency: float, retry_after: float | None = None, adapt: bool = True) -> None:
+        """Give back a slot with the outcome of its request, status is None when the request failed to complete.
+        adapt=False gives the slot back without changing the limit.
+        """
+        if retry_after:
+            self.bucket.pause(seconds=retry_after)
+        with self._condition:
+            self.in_flight -= 1
+            if adapt:
+                now = time.monotonic()
+                slow = self.latency is not None and latency > self.latency_factor * self.latency
+                if status is None or status == 429 or status >= 500 or slow:
+                    if now - self._decreased >= (self.latency or 0.0):
+                        self.limit = max(float(self.minimum), self.limit * self.decrease)
+                        self._decreased = now
+                else:
+                    self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                    self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Context of one request, yields a dict where the caller sets the status and retry_after of its response.
+        waited is the seconds spent waiting for the slot. A request leaving without a status, e.g. on an exception,
+        counts as failed.
+        """
+        waited = self.acquire()
+        start = time.monotonic()
+        outcome = {"status": None, "retry_after": None, "waited": waited}
+        try:
+            yield outcome
+        finally:
+            self.release(status=outcome["status"], latency=time.monotonic() - start, retry_after=outcome["retry_after"])
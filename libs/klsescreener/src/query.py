@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Screening queries over a screener table.
+
+Expressions are python comparisons joined with and/or/not, e.g. 'PE < 12 and DY > 5 and Market == "Main Market"'.
+A column name that is not a python identifier is quoted with backticks, e.g. '`MCap.(M)` > 1000'.
+"""
+
+# Import standard libraries
+import operator
+import threading
+import ast
+import re
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from .schema import MISSING, to_number
+
+
+# Columns indexed when the engine is built, any other numeric column is indexed the first time it is used
+INDEXED = ("Price", "Change%", "Volume", "EPS", "DPS", "NTA", "PE", "DY", "ROE", "PTBV", "MCap.(M)")
+
+# Columns kept as text even when their values look like numbers, e.g. stock codes with leading zeros
+TEXT = ("Code", "Name", "Category", "Market")
+
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+# Searchsorted side and whether the rows before (True) or after (False) the position match
+RANGES = {
+    ast.Lt: ("left", True),
+    ast.LtE: ("right", True),
+    ast.Gt: ("right", False),
+    ast.GtE: ("left", False),
+}
+
+MIRRORED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+
+
+def parse_numeric(series: pandas.Series) -> numpy.ndarray | None:
+    """Column as float64 if every present value is a number, otherwise None.
+    Text is parsed with schema.to_number, so "12.5%", "1,234" and "12.3k" are numbers here as in screener(typed=True).
+    """
+    if pandas.api.types.is_numeric_dtype(series):
+        numbers = series if pandas.api.types.is_bool_dtype(series) else to_number(series=series)
+        return numbers.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+    text = series.astype("string").str.strip()
+    missing = text.isna() | text.isin(MISSING)
+    numbers = to_number(series=series)
+    if missing.all() or (numbers.isna() & ~missing).any():
+        return None
+    return numbers.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+
+
+class SortedIndex:
+    """Row positions of a numeric column sorted by value, missing values last.
+    """
+
+    def __init__(self, values: numpy.ndarray):
+        self.order = numpy.argsort(values, kind="stable")
+        self.values = values[self.order]
+        self.count = int(numpy.count_nonzero(~numpy.isnan(values)))
+
+    def rows(self, comparison: type, value: float) -> numpy.ndarray:
+        side, before = RANGES[comparison]
+        position = numpy.searchsorted(self.values[:self.count], value, side=side)
+        return self.order[:position] if before else self.order[position:self.count]
+
+
+class Query:
+    """Compiled expression, evaluate() returns the boolean mask of the matching rows.
+    """
+
+    def __init__(self, expression: str, evaluate):
+        self.expression = expression
+        self.evaluate = evaluate
+
+
+class QueryEngine:
+    """Screens over one screener table, which must not change afterwards.
+    Numeric columns are parsed once into float arrays, compiled queries and their masks are cached by expression.
+    """
+
+    def __init__(self, dataframe: pandas.DataFrame, indexed: tuple = INDEXED):
+        self.dataframe = dataframe
+        self.columns = {}
+        self.numeric = set()
+        for column in dataframe.columns:
+            values = None if column in TEXT else parse_numeric(dataframe[column])
+            if values is None:
+                self.columns[column] = dataframe[column].to_numpy(dtype=object)
+            else:
+                self.columns[column] = values
+                self.numeric.add(column)
+        self.indexes = {column: SortedIndex(self.columns[column]) for column in indexed if column in self.numeric}
+        self._queries = {}
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    def index(self, column: str) -> SortedIndex:
+        with self._lock:
+            if column not in self.indexes:
+                self.indexes[column] = SortedIndex(self.columns[column])
+            return self.indexes[column]
+
+    def compile(self, expression: str) -> Query:
+        """Parse an expression into a Query, cached by expression.
+        """
+        with self._lock:
+            query = self._queries.get(expression)
+        if query is None:
+            names = {}
+
+            def quote(match):
+                names[f"__column_{len(names)}"] = match.group(1)
+                return f"__column_{len(names) - 1}"
+
+            tree = ast.parse(re.sub(r"`([^`]+)`", quote, expression), mode="eval")
+            query = Query(expression=expression, evaluate=self._condition(node=tree.body, names=names))
+            with self._lock:
+                self._queries[expression] = query
+        return query
+
+    def mask(self, expression: str | None) -> numpy.ndarray:
+        """Boolean mask of the rows matching an expression, every row if None.
+        """
+        if expression is None:
+            return numpy.ones(len(self.dataframe), dtype=bool)
+        with self._lock:
+            mask = self._masks.get(expression)
+        if mask is None:
+            mask = self.compile(expression=expression).evaluate()
+            mask.flags.writeable = False
+            with self._lock:
+                self._masks[expression] = mask
+        return mask
+
+    def rows(self, where: str | None = None, order_by: str | None = None, ascending: bool = True, limit: int | None = None) -> numpy.ndarray:
+        """Row positions matching where, sorted by the order_by column with missing values last, at most limit of them.
+        """
+        mask = self.mask(expression=where)
+        if order_by is None:
+            rows = numpy.flatnonzero(mask)
+        else:
+            if order_by in self.numeric:
+                index = self.index(column=order_by)
+                order = index.order if ascending else numpy.concatenate((index.order[:index.count][::-1], index.order[index.count:]))
+            else:
+                keys = pandas.Series(self.columns[order_by]).astype("string")
+                order = keys.sort_values(ascending=ascending, na_position="last", kind="stable").index.to_numpy()
+            rows = order[mask[order]]
+        return rows if limit is None else rows[:limit]
+
+    def select(self, where: str | None = None, order_by: str | None = None, ascending: bool = True, limit: int | None = None, columns: list | None = None) -> pandas.DataFrame:
+        """Rows of the screener table matching where, see rows().
+        """
+        dataframe = self.dataframe.iloc[self.rows(where=where, order_by=order_by, ascending=ascending, limit=limit)]
+        return dataframe if columns is None else dataframe[columns]
+
+    def _column(self, name: str, names: dict) -> str:
+        column = names.get(name, name)
+        if column not in self.columns:
+            raise KeyError(f"Unknown screener column \"{column}\".")
+        return column
+
+    def _value(self, node: ast.AST, names: dict):
+        """Compile an operand, returns (evaluate, column) where column is set for a plain column reference.
+        """
+        if isinstance(node, ast.Name):
+            column = self._column(name=node.id, names=names)
+            return (lambda: self.columns[column]), column
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and not isinstance(node.value, bool):
+            value = node.value
+            return (lambda: value), None
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand, _ = self._value(node=node.operand, names=names)
+            return (lambda: -operand()), None
+        if isinstance(node, ast.BinOp) and type(node.op) in ARITHMETIC:
+            function = ARITHMETIC[type(node.op)]
+            left, _ = self._value(node=node.left, names=names)
+            right, _ = self._value(node=node.right, names=names)
+
+            def arithmetic():
+                with numpy.errstate(divide="ignore", invalid="ignore"):
+                    return function(left(), right())
+            return arithmetic, None
+        raise ValueError(f"Unsupported expression \"{ast.unparse(node)}\".")
+
+    def _comparison(self, comparison: ast.cmpop, left: ast.AST, right: ast.AST, names: dict):
+        length = len(self.dataframe)
+        if type(comparison) in (ast.In, ast.NotIn):
+            if not isinstance(right, (ast.List, ast.Tuple, ast.Set)):
+                raise ValueError(f"Expected a list after \"in\", got \"{ast.unparse(right)}\".")
+            values = [self._value(node=element, names=names)[0]() for element in right.elts]
+            operand, _ = self._value(node=left, names=names)
+            invert = isinstance(comparison, ast.NotIn)
+            return lambda: numpy.isin(numpy.broadcast_to(operand(), (length,)), values) ^ invert
+
+        left_value, left_column = self._value(node=left, names=names)
+        right_value, right_column = self._value(node=right, names=names)
+        if left_column is None and right_column is not None:
+            # Constant on the left, 5 < DY is the same as DY > 5
+            left_value, left_column, right_value, right_column = right_value, right_column, left_value, left_column
+            comparison = MIRRORED[type(comparison)]()
+        if type(comparison) not in COMPARISONS:
+            raise ValueError(f"Unsupported comparison \"{type(comparison).__name__}\".")
+
+        if left_column in self.numeric and right_column is None and type(comparison) in RANGES and isinstance(right_value(), (int, float)):
+            # Range over a numeric column, the sorted index gives the matching rows directly
+            column, value = left_column, float(right_value())
+
+            def ranged():
+                mask = numpy.zeros(length, dtype=bool)
+                mask[self.index(column=column).rows(comparison=type(comparison), value=value)] = True
+                return mask
+            return ranged
+
+        for column, other in ((left_column, right_value), (right_column, left_value)):
+            if column is not None and column not in self.numeric and isinstance(other(), (int, float)):
+                raise ValueError(f"Column \"{column}\" is not numeric, it cannot be compared with {other()}.")
+        function = COMPARISONS[type(comparison)]
+
+        def compare():
+            with numpy.errstate(invalid="ignore"):
+                try:
+                    result = function(left_value(), right_value())
+                except TypeError as error:
+                    raise ValueError(f"Cannot compare \"{ast.unparse(left)}\" with \"{ast.unparse(right)}\": {error}") from error
+            return numpy.broadcast_to(numpy.asarray(result, dtype=bool), (length,))
+        return compare
+
+    def _condition(self, node: ast.AST, names: dict):
+        if isinstance(node, ast.BoolOp):
+            conditions = [self._condition(node=value, names=names) for value in node.values]
+            reduce = numpy.logical_and if isinstance(node.op, ast.And) else numpy.logical_or
+            return lambda: reduce.reduce([condition() for condition in conditions])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            condition = self._condition(node=node.operand, names=names)
+            return lambda: ~condition()
+        if isinstance(node, ast.Compare):
+            # a < b < c is a < b and b < c
+            operands = [node.left] + node.comparators
+            conditions = [self._comparison(comparison=comparison, left=left, right=right, names=names) for comparison, left, right in zip(node.ops, operands[:-1], operands[1:])]
+            return lambda: numpy.logical_and.reduce([condition() for condition in conditions])
+        raise ValueError(f"Unsupported condition \"{ast.unparse(node)}\".")
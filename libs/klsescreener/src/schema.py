@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Column types of the tables downloaded from KLSE Screener.
+
+The site renders every value as text, e.g. "1.23", "5.5%", "12.3k", "-" or "21 Mar 2024". A Schema converts the
+columns of one table once into compact dtypes, a column is matched by a regular expression on its name so that
+renamed or added columns of the same kind are converted as well. Columns without a match, and columns with a
+value that does not convert, are left as they are.
+"""
+
+# Import standard libraries
+import logging
+import re
+
+# Import third-party libraries
+import pandas
+import numpy
+
+
+MISSING = ("", "-", "--", "N/A", "n/a", "None", "nan")
+
+# Multiplier of a number suffix, e.g. volumes like "12.3k" or market capitalisation like "1.2B"
+SUFFIXES = {"": 1, "k": 1e3, "m": 1e6, "b": 1e9}
+
+# Accounting negatives are in parentheses, e.g. "(1.23)" or "(5.5%)" is negative
+NUMBER = re.compile(r"^(\()?(?:RM)?\s*([-+]?\d[\d,]*\.?\d*|[-+]?\.\d+)\s*([kKmMbB]?)(?(1)\s*%?\))\s*%?$")
+
+
+def to_number(series: pandas.Series) -> pandas.Series:
+    """Numbers of a text column as float64, text that is not a number is NaN. This is the one parser of numbers
+    from the site, the query engine uses it too. A float32 column is widened through its shortest decimal text,
+    so a typed 10.1 is the float64 10.1 again and compares the same as the text it came from.
+    """
+    if series.dtype == numpy.float32:
+        return pandas.Series(data=series.to_numpy().astype(str).astype(numpy.float64), index=series.index, name=series.name)
+    if pandas.api.types.is_numeric_dtype(series) and not pandas.api.types.is_bool_dtype(series):
+        return series.astype(numpy.float64)
+    text = series.astype("string").str.strip()
+    parts = text.str.extract(NUMBER)
+    numbers = pandas.to_numeric(parts[1].str.replace(",", "", regex=False), errors="coerce")
+    multipliers = parts[2].str.lower().map(SUFFIXES).astype(numpy.float64)
+    signs = parts[0].notna().map({True: -1.0, False: 1.0}).astype(numpy.float64)
+    return (numbers * multipliers.fillna(1) * signs).astype(numpy.float64)
+
+
+def to_float(series: pandas.Series) -> pandas.Series:
+    return to_number(series=series).astype(numpy.float32)
+
+
+def to_int(series: pandas.Series) -> pandas.Series:
+    """Whole numbers as int64, or the nullable Int64 when some are missing.
+    """
+    numbers = to_number(series=series).round()
+    return numbers.astype(numpy.int64) if numbers.notna().all() else numbers.astype("Int64")
+
+
+def to_datetime(series: pandas.Series) -> pandas.Series:
+    if pandas.api.types.is_datetime64_any_dtype(series):
+        return series
+    text = series.astype("string").str.strip()
+    return pandas.to_datetime(text.where(~text.isin(MISSING)), format="mixed", dayfirst=True, errors="coerce")
+
+
+def to_category(series: pandas.Series) -> pandas.Series:
+    return series.astype("category")
+
+
+CONVERTERS = {
+    "float": to_float,
+    "int": to_int,
+    "datetime": to_datetime,
+    "category": to_category,
+}
+
+
+class Schema:
+    """Per-table list of (column name pattern, kind), the first pattern that fully matches a column decides its kind.
+    kind is one of float (float32), int (int64), datetime (datetime64) and category.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = [(re.compile(pattern), kind) for pattern, kind in columns]
+
+    def kind(self, column: str) -> str | None:
+        for pattern, kind in self.columns:
+            if pattern.fullmatch(str(column)):
+                return kind
+        return None
+
+    def apply(self, dataframe: pandas.DataFrame) -> pandas.DataFrame:
+        """Copy of the dataframe with every matched column converted, link columns are never converted.
+        """
+        dataframe = dataframe.copy()
+        for column in dataframe.columns:
+            kind = None if str(column).endswith("Link") else self.kind(column=column)
+            if kind is None:
+                continue
+            series = dataframe[column]
+            converted = CONVERTERS[kind](series)
+            missing = series.isna() | series.astype("string").str.strip().isin(MISSING)
+            if (converted.isna() & ~missing).any():
+                logging.debug(f"Keeping column \"{column}\" as {series.dtype}, some of its values are not {kind}.")
+                continue
+            dataframe[column] = converted
+        return dataframe
+
+
+# Shared by the report tables of the site
+REPORT = [
+    (r".*Date|Date.*", "datetime"),
+    (r"F\.?Y\.?|Financial Year|Year", "int"),
+    (r"#|No\.?|Quarter|Q", "int"),
+    (r"Revenue|PBT|Net Profit|Profit.*|NP Margin|EPS|DPS|NTA|ROE|PE|DY|Amount|Price|Ratio.*|Change.*|Shares?.*|Volume|Value|%.*|.*%", "float"),
+    (r"Type|Subject|Category|Market", "category"),
+]
+
+SCHEMAS = {
+    "screener": Schema(columns=[
+        (r"Price|Change%?|EPS|DPS|NTA|PE|DY|ROE|PTBV|MCap\.?\s*\(M\)|.*%", "float"),
+        (r"Volume", "int"),
+        (r"Category|Market", "category"),
+    ]),
+    "warrant_screener": Schema(columns=[
+        (r"Volume", "int"),
+        (r"Maturity|Expiry.*|.*Date", "datetime"),
+        (r"Price|Change%?|Mother.*|Exercise.*|Ratio|Premium.*|Gearing.*|Days.*|.*%", "float"),
+        (r"Type|Category|Market", "category"),
+    ]),
+    "dividends": Schema(columns=REPORT),
+    "shares_issue": Schema(columns=REPORT),
+    "financial_reports": Schema(columns=REPORT),
+    "reports": Schema(columns=REPORT),
+    "shareholding_changes": Schema(columns=[
+        (r".*Date.*", "datetime"),
+        (r"Shares?.*|Change.*|Total.*|.*%", "float"),
+        (r"Type|Name", "category"),
+    ]),
+}
+
+
+def memory_report(before: pandas.DataFrame, after: pandas.DataFrame) -> pandas.DataFrame:
+    """Memory of every column before and after conversion in bytes, with a Total row.
+    """
+    before_bytes = before.memory_usage(index=False, deep=True)
+    after_bytes = after.memory_usage(index=False, deep=True).reindex(before_bytes.index)
+    report = pandas.DataFrame(data={
+        "Before Dtype": before.dtypes.astype(str),
+        "After Dtype": after.dtypes.reindex(before.columns).astype(str),
+        "Before Bytes": before_bytes,
+        "After Bytes": after_bytes,
+    })
+    report.loc["Total"] = ["", "", before_bytes.sum(), after_bytes.sum()]
+    report["Saved Bytes"] = report["Before Bytes"] - report["After Bytes"]
+    report["Saved %"] = (report["Saved Bytes"] / report["Before Bytes"].replace(0, numpy.nan) * 100).round(1)
+    return report
@@ -3,7 +3,12 @@
 # -*- coding: utf-8 -*-
 
 # Import standard libraries
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit, urlunsplit
+import collections
+import contextlib
+import threading
+import asyncio
+import random
 import warnings
 import logging
 import urllib3
@@ -12,104 +17,387 @@ import time
 import re
 
 # Import third-party libraries
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree
 import requests
 import pandas
+import numpy
 
 # Import internal libraries
 from shared.decorators import performance
+from .snapshot import ScreenerSnapshot
+from .cache import ResponseCache
+from .flight import SingleFlight
+from .limiter import AdaptiveLimiter, retry_after
+from .schema import SCHEMAS
+from .tables import TableExtractor
+from .engine import FetchEngine
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
+# Stands in for None when counting distinct values, pandas.factorize() would merge None with NaN
+_NONE = object()
+
+# Responses retried after their Retry-After or a backoff, see _send()
+RETRY_STATUSES = (429, 502, 503, 504)
+
 
 class KLSEScreener:
 
+    # Connection pool shared by every KLSEScreener and Stock instance, see configure_session()
+    _session = None
+    _session_lock = threading.Lock()
+    _session_config = {
+        "pool_size": 32,
+        "timeout": (10, 60),
+        "headers": {
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        },
+    }
+
+    # Event loop bridge shared by every async method, see FetchEngine
+    engine = FetchEngine()
+
+    # Exponential backoff in seconds while the website answers 202 Accepted, see _poll()
+    poll_base = 0.25
+    poll_cap = 4.0
+
+    # Responses kept on disk between calls and processes, see configure_cache()
+    cache = None
+
+    # Concurrent requests of the same url share one response, see _get()
+    flight = SingleFlight()
+
+    # Request rate and concurrency shared by every instance, off until configure_limiter() turns it on
+    limiter = None
+    max_retries = 3
+    retry_base = 1.0
+    retry_cap = 30.0
+
+    _statistics = collections.Counter()
+    _statistics_lock = threading.Lock()
+
+    # Screener table shared by get_stockcodes(), get_stocknames(), get_categories() and get_markets()
+    snapshot_ttl = 300  # seconds
+    _snapshot = None
+    _snapshot_lock = threading.Lock()
+
     def __init__(self):
         self.url = "https://www.klsescreener.com/v2"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
         }
 
+    @classmethod
+    def configure_session(cls, pool_size: int | None = None, timeout: float | tuple | None = None, headers: dict | None = None) -> None:
+        """Configure the shared connection pool.
+        pool_size is the number of keep-alive connections kept per host, timeout is passed to every request
+        as (connect, read) seconds and headers are sent with every request on top of the instance headers.
+        The current pool is closed and rebuilt on next use.
+        """
+        with cls._session_lock:
+            config = dict(cls._session_config)
+            if pool_size is not None:
+                config["pool_size"] = pool_size
+            if timeout is not None:
+                config["timeout"] = timeout
+            if headers is not None:
+                config["headers"] = {**config["headers"], **headers}
+            cls._session_config = config
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Get the shared session, creating it on first use.
+        The adapter blocks when all pooled connections are busy instead of opening throwaway connections,
+        so the pool can be shared by any number of threads.
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                pool_size = cls._session_config["pool_size"]
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+                session = requests.Session()
+                session.mount(prefix="https://", adapter=adapter)
+                session.mount(prefix="http://", adapter=adapter)
+                session.headers.update(cls._session_config["headers"])
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def configure_cache(cls, directory: str | None, max_bytes: int | None = None, ttls: list | None = None) -> None:
+        """Keep responses and the tables parsed from them in directory, None turns the cache off.
+        max_bytes bounds the size of the cache and ttls is a list of (url pattern, seconds), see ResponseCache.
+        """
+        if cls.cache is not None:
+            cls.cache.close()
+        if directory is None:
+            cls.cache = None
+        else:
+            kwargs = {} if max_bytes is None else {"max_bytes": max_bytes}
+            cls.cache = ResponseCache(directory=directory, ttls=ttls, **kwargs)
+
+    @classmethod
+    def configure_limiter(cls, rate: float | None, burst: int | None = None, initial: int | None = None, maximum: int | None = None) -> None:
+        """Limit requests to rate per second with bursts of burst, None turns the limiter off (the default).
+        The number of requests in flight starts at initial and adapts up to maximum, see AdaptiveLimiter. Start it at
+        least at the thread_count of generate_dashboard, or the dashboard runs slower until the limit has grown.
+        """
+        if rate is None:
+            cls.limiter = None
+        else:
+            kwargs = {"burst": burst, "initial": initial, "maximum": maximum}
+            cls.limiter = AdaptiveLimiter(rate=rate, **{key: value for key, value in kwargs.items() if value is not None})
+
+    @classmethod
+    def _count(cls, **counts) -> None:
+        with cls._statistics_lock:
+            cls._statistics.update(counts)
+
+    @classmethod
+    def statistics(cls) -> dict:
+        """Request counters shared by every instance.
+        requests: requests sent, accepted: fetches answered 202 Accepted at least once, polls: requests repeated
+        because of 202, poll_wait: seconds spent waiting between those, poll_timeouts: fetches that gave up,
+        cache_hits: responses served from the cache, revalidated: stale responses the server answered 304 Not Modified,
+        coalesced: requests that shared the response of the same request already in flight, retries: requests
+        repeated after a 429 or 5xx, limiter_wait: seconds spent waiting for the rate and concurrency limits.
+        """
+        with cls._statistics_lock:
+            return dict(cls._statistics)
+
+    @classmethod
+    def reset_statistics(cls) -> None:
+        with cls._statistics_lock:
+            cls._statistics.clear()
+
+    def _get(self, url: str, verify: bool = True) -> requests.Response:
+        """Send a GET request through the shared connection pool.
+        A request of a url that another thread is already requesting waits for that response and shares it,
+        the response is fully read so it can be used from any number of threads.
+        """
+        response, shared = self.flight.do((url, verify), self._request, url=url, verify=verify)
+        if shared:
+            self._count(coalesced=1)
+        return response
+
+    def _request(self, url: str, verify: bool = True) -> requests.Response:
+        """With a cache, a fresh stored response is returned without a request and a stale one is revalidated.
+        """
+        cache = self.cache
+        entry = None if cache is None else cache.lookup(url=url)
+        if entry is not None and entry["fresh"]:
+            self._count(cache_hits=1)
+            return cache.response(entry=entry)
+        headers = self.headers if entry is None else {**self.headers, **cache.validators(entry=entry)}
+        response = self._send(url=url, headers=headers, verify=verify)
+        if cache is not None:
+            if entry is not None and response.status_code == 304:
+                self._count(revalidated=1)
+                return cache.revalidated(entry=entry, response=response)
+            cache.store(url=url, response=response)
+        return response
+
+    def _send(self, url: str, headers: dict, verify: bool = True) -> requests.Response:
+        """Send a request under the limiter. A 429, 502, 503 or 504 is sent again up to max_retries times,
+        after its Retry-After or an exponential backoff with jitter, which also holds back every other request.
+        """
+        attempt = 0
+        while True:
+            self._count(requests=1)
+            limiter = self.limiter
+            with (contextlib.nullcontext({}) if limiter is None else limiter.slot()) as outcome:
+                if outcome:
+                    self._count(limiter_wait=outcome["waited"])
+                response = self.session().get(url=url, headers=headers, timeout=self._session_config["timeout"], verify=verify)
+                outcome["status"] = response.status_code
+                outcome["retry_after"] = retry_after(value=response.headers.get("Retry-After"))
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            delay = outcome["retry_after"]
+            if delay is None:
+                delay = min(self.retry_cap, self.retry_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+            logging.debug(f"Retrying {url} in {delay:.2f} seconds after status {response.status_code}.")
+            if limiter is None:
+                time.sleep(delay)
+            else:
+                limiter.bucket.pause(seconds=delay)
+            self._count(retries=1)
+            attempt += 1
+
+    def _parsed(self, url: str, key: str, content: bytes | str, parse) -> object:
+        """parse(), or its value stored in the cache for this exact content of url.
+        """
+        cache = self.cache
+        if cache is None:
+            return parse()
+        value = cache.frame(url=url, key=key, content=content)
+        if value is None:
+            value = parse()
+            cache.store_frame(url=url, key=key, content=content, value=value)
+        return value
+
     def fetch_html(self, url: str, match: str = ".+", extract_links: str | None = None) -> list:
         """Fetch html from website.
         """
         logging.debug(f"Fetching html from {url} with match={match} and extract_links={extract_links}")
-        response = requests.get(url=url, headers=self.headers)
+        response = self._get(url=url)
         response.raise_for_status()
-        dataframes = pandas.read_html(io=response.text, match=match, extract_links=extract_links)
-        # Post-process dataframes
-        for dataframe in dataframes:
-            # If all values in a column are NaN, drop the column
-            dataframe.dropna(axis=1, how="all", inplace=True)
+        key = json.dumps(["tables", match, extract_links])
+        dataframes = self._parsed(url=url, key=key, content=response.content, parse=lambda: TableExtractor(document=response.text).tables(match=match, extract_links=extract_links))
+        if not dataframes:
+            raise ValueError(f"No tables found matching regex {match!r}")
         return dataframes
 
-    def fetch_json(self, url: str, timeout: int = 20) -> list:
+    def fetch_table(self, url: str, index: int = 0, match: str = ".+", extract_links: str | None = None, id: str | None = None, caption: str | None = None, header: str | None = None) -> pandas.DataFrame:
+        """Fetch one table from website, same as fetch_html(url)[index] but the other tables are not parsed.
+        The table can also be found by its id, caption or header text, see TableExtractor.find().
+        """
+        logging.debug(f"Fetching table {index} from {url} with match={match} and extract_links={extract_links}")
+        response = self._get(url=url)
+        response.raise_for_status()
+        key = json.dumps(["table", index, match, extract_links, id, caption, header])
+        return self._parsed(url=url, key=key, content=response.content, parse=lambda: TableExtractor(document=response.text).table(index=index, match=match, extract_links=extract_links, id=id, caption=caption, header=header))
+
+    def _poll(self, url: str, timeout: float):
+        """Decide how long to wait before each request of a json fetch, the caller does the waiting and the requests.
+        Yields the delay before the next request and is sent its response, returns the first response that is not
+        202 Accepted. The delays grow exponentially with jitter and never run past the deadline of timeout seconds.
+        """
+        due_time = time.monotonic() + timeout
+        response = yield 0
+        attempt = 0
+        if response.status_code == 202:
+            self._count(accepted=1)
+        while response.status_code == 202:
+            delay = min(self.poll_cap, self.poll_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+            remaining = due_time - time.monotonic()
+            if remaining <= 0:
+                self._count(poll_timeouts=1)
+                raise TimeoutError(f"Timeout after {timeout} seconds while fetching data from {url}.")
+            delay = min(delay, remaining)
+            self._count(polls=1, poll_wait=delay)
+            response = yield delay
+            attempt += 1
+        return response
+
+    def _json_dataframe(self, response: requests.Response) -> pandas.DataFrame:
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, dict) and data.get("s") == "no_data":
+            # TradingView reply for a range without any bar
+            return pandas.DataFrame()
+        dataframe = pandas.DataFrame(data=data)
+        return dataframe
+
+    def fetch_json(self, url: str, timeout: int = 20) -> pandas.DataFrame:
         """Fetch json from website.
+        While the website answers 202 Accepted the request is repeated, see _poll().
         """
         logging.debug(f"Fetching json from {url}.")
-        with requests.Session() as session:
-            due_time = time.time() + timeout
-            response = session.get(url=url, headers=self.headers)
-            while response.status_code == 202:
-                time.sleep(1)  # Wait for 1 second before retrying
-                response = session.get(url=url, headers=self.headers)
-                if time.time() > due_time:
-                    raise TimeoutError(f"Timeout after {timeout} seconds while fetching data from {url}.")
-        dataframe = pandas.DataFrame(data=response.json())
-        return dataframe
+        poll = self._poll(url=url, timeout=timeout)
+        delay = next(poll)
+        while True:
+            time.sleep(delay)
+            response = self._get(url=url)
+            try:
+                delay = poll.send(response)
+            except StopIteration:
+                break
+        return self._json_dataframe(response=response)
 
     def fetch_text(self, url: str) -> str:
         """Fetch text from website.
         """
         logging.debug(f"Fetching text from {url}.")
-        response = requests.get(url=url, headers=self.headers, verify=False)
+        response = self._get(url=url, verify=False)
         response.raise_for_status()
         content = response.text
         return content
 
+    async def afetch_html(self, url: str, match: str = ".+", extract_links: str | None = None) -> list:
+        """Async variant of fetch_html.
+        """
+        return await self.engine.run(self.fetch_html, url=url, match=match, extract_links=extract_links)
+
+    async def afetch_json(self, url: str, timeout: int = 20) -> pandas.DataFrame:
+        """Async variant of fetch_json.
+        Between polls the request is parked on the event loop and gives its engine slot to other requests.
+        """
+        logging.debug(f"Fetching json from {url}.")
+        poll = self._poll(url=url, timeout=timeout)
+        delay = next(poll)
+        while True:
+            await asyncio.sleep(delay)
+            response = await self.engine.run(self._get, url=url)
+            try:
+                delay = poll.send(response)
+            except StopIteration:
+                break
+        return self._json_dataframe(response=response)
+
+    async def afetch_text(self, url: str) -> str:
+        """Async variant of fetch_text.
+        """
+        return await self.engine.run(self.fetch_text, url=url)
+
     @performance()
-    def screener(self) -> pandas.DataFrame:
-        """Get the KLSE Screener data.
+    def screener(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the KLSE Screener data, with typed=True the numeric columns are float32/int64 and Category and Market categorical.
         """
 
         def remove_consecutive_duplicates(text):
             return re.sub(r"\b(\w+)\b(\s+\1\b)+", r"\1", text, flags=re.IGNORECASE)
 
         pattern = r"\b(?:Main Market|Ace Market|Leap Market)|ETF\b"
-        dataframe = self.fetch_html(url=f"{self.url}/screener/quote_results")[0]
+        dataframe = self.fetch_table(url=f"{self.url}/screener/quote_results")
         dataframe["Name"] = dataframe["Name"].str.strip("[s]").str.strip("")
         dataframe["Market"] = dataframe["Category"].str.extract(f"({pattern})", flags=re.IGNORECASE)
         dataframe["Category"] = dataframe["Category"].str.replace(pattern, "", case=False, regex=True).str.replace(r"[ ,]+", " ", regex=True).str.strip().apply(remove_consecutive_duplicates)
         dataframe["KLSEScreener"] = dataframe["Code"].apply(lambda x: f"{self.url}/stocks/view/{x}")
         dataframe["KLSEScreener Chart"] = dataframe["Code"].apply(lambda x: f"{self.url}/charting/chart/{x}")
-        return dataframe
+        return SCHEMAS["screener"].apply(dataframe=dataframe) if typed else dataframe
+
+    async def ascreener(self, typed: bool = False) -> pandas.DataFrame:
+        """Async variant of screener.
+        """
+        return await self.engine.run(self.screener, typed=typed)
 
     @performance()
-    def warrant_screener(self) -> pandas.DataFrame:
-        """Get the KLSE Warrant Screener data.
+    def warrant_screener(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the KLSE Warrant Screener data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/screener_warrants/quote_results")[0]
-        return dataframe
+        dataframe = self.fetch_table(url=f"{self.url}/screener_warrants/quote_results")
+        return SCHEMAS["warrant_screener"].apply(dataframe=dataframe) if typed else dataframe
+
+    async def awarrant_screener(self, typed: bool = False) -> pandas.DataFrame:
+        """Async variant of warrant_screener.
+        """
+        return await self.engine.run(self.warrant_screener, typed=typed)
 
     @performance()
     def bursa_index(self) -> pandas.DataFrame:
         """Get the Bursa Index data.
         """
-        context = self.fetch_text(url=f"{self.url}/markets")
-        soup = BeautifulSoup(markup=context, features="html.parser")
-        node = soup.find(lambda tag: tag.string == "Bursa Index").find_next_sibling()
+        tree = etree.HTML(text=self.fetch_text(url=f"{self.url}/markets"))
+        # First element whose only content is the text "Bursa Index", possibly wrapped in single child elements
+        heading = next(element for element in tree.xpath("//*[string() = 'Bursa Index']") if not element.xpath("descendant-or-self::*[count(node()) != 1]"))
+        node = heading.xpath("following-sibling::*[1]")[0]
+        anchors = node.xpath(".//a")
         dataframe = pandas.DataFrame(data={
-            "Index": [a.text for a in node.find_all("a")],
-            "Code" : [a.get("href").split("/")[-1] for a in node.find_all("a")],
-            "Link" : [urljoin(self.url, a.get("href")) for a in node.find_all("a")],
-            "Price": [span.text for span in node.find_all("span", attrs={"class": "last"})],
+            "Index": ["".join(a.itertext()) for a in anchors],
+            "Code" : [a.get("href").split("/")[-1] for a in anchors],
+            "Link" : [urljoin(self.url, a.get("href")) for a in anchors],
+            "Price": ["".join(span.itertext()) for span in node.xpath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' last ')]")],
         })
         dataframe["Chart Link"] = dataframe["Code"].apply(lambda x: f"{self.url}/charting/chart/{x}")
 
         for row_index, row in dataframe.iterrows():
-            df = self.fetch_html(url=row["Link"])[0].dropna().transpose()
+            df = self.fetch_table(url=row["Link"]).dropna().transpose()
             df.columns = df.iloc[0]
             df.drop(labels=df.index[0], inplace=True)
             series = pandas.Series(data=json.loads(s=df.to_json(orient="records"))[0])
@@ -121,37 +409,61 @@ class KLSEScreener:
         dataframe = self.bursa_index()
         for row_index, row in dataframe.iterrows():
             if row["Code"].startswith("00"):
-                context = self.fetch_text(url=f"{self.url}/markets/bursa/" + row["Code"])
-                soup = BeautifulSoup(markup=context, features="html.parser")
-                node = soup.find(name="div", attrs={"class": "container"}).find_next_sibling().find_next_sibling()
-                dataframe.at[row_index, "Components"] = str([a.text for a in node.find_all("a")])
+                tree = etree.HTML(text=self.fetch_text(url=f"{self.url}/markets/bursa/" + row["Code"]))
+                node = tree.xpath("(//div[contains(concat(' ', normalize-space(@class), ' '), ' container ')])[1]/following-sibling::*[2]")[0]
+                dataframe.at[row_index, "Components"] = str(["".join(a.itertext()) for a in node.xpath(".//a")])
             elif row["Code"] in ("0200I"):
-                df = self.fetch_html(url=row["Link"])[-1]
+                df = self.fetch_table(url=row["Link"], index=-1)
                 dataframe.at[row_index, "Components"] = str(df["Name"].to_list())
         return dataframe
 
+    def _join_links(self, links: numpy.ndarray) -> numpy.ndarray:
+        """Same as urljoin(self.url, link) if link else "" for every link.
+        Plain root-relative paths are prefixed with the site origin directly, the rest go through urljoin.
+        """
+        series = pandas.Series(data=links, dtype=object)
+        plain = series.str.match(r"/(?!/)[^?#;\s]*$", na=False) & ~series.str.contains("/.", regex=False, na=False)
+        origin = urlunsplit(urlsplit(self.url)[:2] + ("", "", ""))
+        joined = numpy.where(plain, origin + series.where(plain, ""), "").astype(object)
+        for index in numpy.flatnonzero(~plain.to_numpy()):
+            joined[index] = urljoin(self.url, links[index]) if links[index] else ""
+        return joined
+
     def _post_process_dataframe(self, dataframe_raw: pandas.DataFrame) -> pandas.DataFrame:
-        dataframe = pandas.DataFrame()
-        # Iterate each column and insert values and links if available
-        for (column, _), series in dataframe_raw.items():
-            values = series.apply(lambda x: x[0])
-            links = series.apply(lambda x: x[1])
-            if values.isna().all():
-                dataframe[column] = links
-            elif links.isna().all():
-                dataframe[column] = values
+        # Split every (value, link) cell in one pass, padding cells that are not tuples have no link
+        cells = dataframe_raw.to_numpy(dtype=object)
+        try:
+            pairs = numpy.array(cells.ravel().tolist(), dtype=object).reshape(cells.shape + (2,))
+        except ValueError:
+            pairs = numpy.empty(shape=cells.shape + (2,), dtype=object)
+            pairs[..., 0] = numpy.frompyfunc(lambda x: x[0] if isinstance(x, tuple) else x, 1, 1)(cells)
+            pairs[..., 1] = numpy.frompyfunc(lambda x: x[1] if isinstance(x, tuple) else None, 1, 1)(cells)
+        values, links = pairs[..., 0], pairs[..., 1]
+        values_missing = pandas.isna(values).all(axis=0)
+        links_missing = pandas.isna(links).all(axis=0)
+
+        # Insert values and links if available, same column order as assigning them one by one
+        data = {}
+        for position, (column, _) in enumerate(dataframe_raw.columns):
+            if values_missing[position]:
+                data[column] = links[:, position]
+            elif links_missing[position]:
+                data[column] = values[:, position]
             else:
-                dataframe[f"{column}Link"] = links.apply(lambda x: urljoin(self.url, x) if x else "")
-                dataframe[column] = values
+                data[f"{column}Link"] = self._join_links(links[:, position])
+                data[column] = values[:, position]
+        dataframe = pandas.DataFrame(data={column: pandas.Series(data=array, index=dataframe_raw.index).infer_objects() for column, array in data.items()}, index=dataframe_raw.index)
 
-        # Remove dummy rows
+        # Remove dummy rows, a row is a dummy when it has fewer distinct values than half of the columns.
+        # None and NaN count as different values, same as Series.unique().
         number_of_columns = len(dataframe.columns)
-        rows_to_drop = []
-        for index, row in dataframe.iterrows():
-            if len(row.unique()) < (0.5 * number_of_columns):
-                rows_to_drop.append(index)
-        for index in reversed(rows_to_drop):
-            dataframe.drop(labels=index, inplace=True)
+        if number_of_columns and len(dataframe):
+            flat = dataframe.to_numpy(dtype=object).ravel()
+            flat = numpy.where(numpy.equal(flat, None), _NONE, flat)
+            codes = pandas.factorize(flat, use_na_sentinel=False)[0].reshape(dataframe.shape)
+            codes.sort(axis=1)
+            number_of_uniques = 1 + (numpy.diff(codes, axis=1) != 0).sum(axis=1)
+            dataframe = dataframe[number_of_uniques >= (0.5 * number_of_columns)]
 
         # Remove columns that only contain 'View'.
         dataframe = dataframe.loc[:, ~(dataframe.isin(["", "View"])).all()]
@@ -161,65 +473,78 @@ class KLSEScreener:
         return dataframe
 
     @performance()
-    def recent_dividends(self) -> pandas.DataFrame:
-        """Get the recent dividends data.
+    def recent_dividends(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the recent dividends data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/entitlements/dividends", extract_links="all")[0]
+        dataframe = self.fetch_table(url=f"{self.url}/entitlements/dividends", extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["dividends"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def upcoming_dividends(self) -> pandas.DataFrame:
-        """Get the upcoming dividends data.
+    def upcoming_dividends(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the upcoming dividends data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/entitlements/dividends", extract_links="all")[1]
+        dataframe = self.fetch_table(url=f"{self.url}/entitlements/dividends", index=1, extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["dividends"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def recent_share_issue(self) -> pandas.DataFrame:
-        """Get the recent share issue data.
+    def recent_share_issue(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the recent share issue data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/entitlements/shares-issue", extract_links="all")[0]
+        dataframe = self.fetch_table(url=f"{self.url}/entitlements/shares-issue", extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["shares_issue"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def upcoming_share_issue(self) -> pandas.DataFrame:
-        """Get the upcoming share issue data.
+    def upcoming_share_issue(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the upcoming share issue data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/entitlements/shares-issue", extract_links="all")[1]
+        dataframe = self.fetch_table(url=f"{self.url}/entitlements/shares-issue", index=1, extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["shares_issue"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def recent_quarterly_reports(self) -> pandas.DataFrame:
-        """Get the recent quarterly reports data.
+    def recent_quarterly_reports(self, typed: bool = False) -> pandas.DataFrame:
+        """Get the recent quarterly reports data, see screener() for typed.
         """
-        dataframe = self.fetch_html(url=f"{self.url}/financial-reports", extract_links="all")[0]
+        dataframe = self.fetch_table(url=f"{self.url}/financial-reports", extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["financial_reports"].apply(dataframe=dataframe) if typed else dataframe
+
+    def snapshot(self) -> ScreenerSnapshot:
+        """Get the screener table with its lookup indexes, downloaded again once it is older than snapshot_ttl.
+        """
+        with KLSEScreener._snapshot_lock:
+            if KLSEScreener._snapshot is None or KLSEScreener._snapshot.expired:
+                KLSEScreener._snapshot = ScreenerSnapshot(dataframe=self.screener(), ttl=self.snapshot_ttl)
+            return KLSEScreener._snapshot
+
+    def screen(self, where: str | None = None, order_by: str | None = None, ascending: bool = True, limit: int | None = None, columns: list | None = None) -> pandas.DataFrame:
+        """Select rows of the screener snapshot, e.g. screen(where="PE < 12 and DY > 5", order_by="DY", ascending=False, limit=20).
+        See klsescreener.query for the expression syntax.
+        """
+        return self.snapshot().query_engine().select(where=where, order_by=order_by, ascending=ascending, limit=limit, columns=columns)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the screener snapshot, the next accessor downloads it again.
+        """
+        with KLSEScreener._snapshot_lock:
+            KLSEScreener._snapshot = None
 
     @performance()
     def get_stockcodes(self) -> list:
-        stockcodes = self.screener()["Code"].dropna().to_list()
-        stockcodes.sort(reverse=False)
-        return stockcodes
+        return list(self.snapshot().stockcodes)
 
     @performance()
     def get_stocknames(self) -> list:
-        stocknames = self.screener()["Name"].dropna().to_list()
-        stocknames.sort(reverse=False)
-        return stocknames
+        return list(self.snapshot().stocknames)
 
     @performance()
     def get_categories(self) -> list:
-        categories = list(set(self.screener()["Category"].dropna().to_list()))
-        categories.sort(reverse=False)
-        return categories
+        return list(self.snapshot().categories)
 
     @performance()
     def get_markets(self) -> list:
-        markets = list(set(self.screener()["Market"].dropna().to_list()))
-        markets.sort(reverse=False)
-        return markets
+        return list(self.snapshot().markets)
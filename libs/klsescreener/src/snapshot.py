@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+import time
+
+# Import third-party libraries
+import pandas
+
+# Import internal libraries
+from .query import QueryEngine
+
+
+class ScreenerSnapshot:
+    """Screener table downloaded at one point in time, with lookup indexes built once.
+    """
+
+    def __init__(self, dataframe: pandas.DataFrame, ttl: float):
+        self.dataframe = dataframe
+        self.created = time.time()
+        self.expires = self.created + ttl
+
+        self.code_index = {}      # Code -> row position
+        self.name_index = {}      # Name -> Code
+        self.category_index = {}  # Category -> [Code]
+        self.market_index = {}    # Market -> [Code]
+        columns = [dataframe[column].to_list() if column in dataframe.columns else [None] * len(dataframe) for column in ("Code", "Name", "Category", "Market")]
+        for position, (code, name, category, market) in enumerate(zip(*columns)):
+            if pandas.isna(code):
+                continue
+            self.code_index.setdefault(code, position)
+            if not pandas.isna(name):
+                self.name_index.setdefault(name, code)
+            if not pandas.isna(category):
+                self.category_index.setdefault(category, []).append(code)
+            if not pandas.isna(market):
+                self.market_index.setdefault(market, []).append(code)
+
+        self.stockcodes = sorted(dataframe["Code"].dropna().to_list())
+        self.stocknames = sorted(dataframe["Name"].dropna().to_list())
+        self.categories = sorted(self.category_index)
+        self.markets = sorted(self.market_index)
+        self._query_engine = None
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires
+
+    def row(self, code: int | str) -> pandas.Series | None:
+        """Get the screener row of a stock code.
+        """
+        position = self.code_index.get(code)
+        return None if position is None else self.dataframe.iloc[position]
+
+    def code(self, name: str) -> int | str | None:
+        """Get the stock code of a stock name.
+        """
+        return self.name_index.get(name)
+
+    def query_engine(self) -> QueryEngine:
+        """Query engine over the screener table, built on first use.
+        """
+        if self._query_engine is None:
+            self._query_engine = QueryEngine(dataframe=self.dataframe)
+        return self._query_engine
+
+    def codes_by_category(self, category: str) -> list:
+        return list(self.category_index.get(category, []))
+
+    def codes_by_market(self, market: str) -> list:
+        return list(self.market_index.get(market, []))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+import re
+
+# Import third-party libraries
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+from lxml import etree
+import pandas
+
+
+WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _hidden(element: etree._Element) -> bool:
+    return element.tag == "style" or "display:none" in element.get("style", "").replace(" ", "")
+
+
+def _text(element: etree._Element) -> str:
+    """Visible text of an element, <br> is a line break.
+    """
+    parts = [element.text or ""] if isinstance(element.tag, str) else []
+    for child in element:
+        # Comments have no text, hidden elements are skipped, the text after either still counts
+        if isinstance(child.tag, str) and not _hidden(child):
+            parts.append(_text(child))
+            if child.tag == "br":
+                parts.append("\n")
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _cells(row: etree._Element) -> list:
+    return [cell for cell in row.xpath("./td|./th") if not _hidden(cell)]
+
+
+def _visible(rows: list) -> list:
+    return [row for row in rows if not any(_hidden(element) for element in row.iterancestors("tr", "thead", "tbody", "tfoot")) and not _hidden(row)]
+
+
+class TableExtractor:
+    """Tables of a parsed html document, same as pandas.read_html but only the tables asked for are parsed.
+    Tables can be found by id, caption or header text besides the text anywhere in them, every table is parsed
+    at most once per extract_links mode. Hidden tables, rows and cells are skipped and columns without any value
+    are dropped, same as fetch_html.
+    """
+
+    def __init__(self, document: str | etree._Element):
+        self.document = etree.HTML(text=document) if isinstance(document, str) else document
+        self._nodes = [node for node in self.document.xpath("//table") if not _hidden(node)]
+        self._frames = {}
+        self._empty = {}
+
+    def _sections(self, node: etree._Element) -> tuple:
+        """<tr> elements of the header, body and footer, top rows of only <th> are the header without a <thead>.
+        """
+        head = []
+        for thead in node.xpath(".//thead"):
+            head.extend(thead.xpath("./tr"))
+            # A <thead> with its cells directly inside is read as one row
+            if thead.xpath("./td|./th"):
+                head.append(thead)
+        body = node.xpath(".//tbody//tr") + node.xpath("./tr")
+        foot = node.xpath(".//tfoot//tr")
+        head, body, foot = _visible(head), _visible(body), _visible(foot)
+        if not head:
+            while body and all(cell.tag == "th" for cell in _cells(body[0])):
+                head.append(body.pop(0))
+        return head, body, foot
+
+    def _expand(self, rows: list, section: str, extract_links: str | None) -> list:
+        """Text of every cell of rows, a cell with colspan or rowspan is repeated over the cells it spans.
+        """
+        texts = []
+        remainder = []  # (column, text, rows left) of cells spanning into the next rows
+        for row in rows:
+            values = []
+            next_remainder = []
+            column = 0
+            for cell in _cells(row):
+                while remainder and remainder[0][0] <= column:
+                    previous_column, text, span = remainder.pop(0)
+                    values.append(text)
+                    if span > 1:
+                        next_remainder.append((previous_column, text, span - 1))
+                    column += 1
+
+                text = WHITESPACE.sub(" ", _text(cell).strip())
+                if extract_links in ("all", section):
+                    href = cell.xpath(".//a/@href")
+                    text = (text, href[0] if href else None)
+                rowspan = int(cell.get("rowspan") or 1)
+                colspan = int(cell.get("colspan") or 1)
+                for _ in range(colspan):
+                    values.append(text)
+                    if rowspan > 1:
+                        next_remainder.append((column, text, rowspan - 1))
+                    column += 1
+
+            for previous_column, text, span in remainder:
+                values.append(text)
+                if span > 1:
+                    next_remainder.append((previous_column, text, span - 1))
+            texts.append(values)
+            remainder = next_remainder
+
+        while remainder:
+            texts.append([text for _, text, _ in remainder])
+            remainder = [(column, text, span - 1) for column, text, span in remainder if span > 1]
+        return texts
+
+    def _parse(self, position: int, extract_links: str | None) -> pandas.DataFrame | None:
+        key = (position, extract_links)
+        if key not in self._frames:
+            head, body, foot = self._sections(node=self._nodes[position])
+            head = self._expand(rows=head, section="header", extract_links=extract_links)
+            rows = head + self._expand(rows=body, section="body", extract_links=extract_links) + self._expand(rows=foot, section="footer", extract_links=extract_links)
+            header = None
+            if head:
+                header = 0 if len(head) == 1 else [index for index, row in enumerate(head) if any(text for text in row)]
+            if rows:
+                # Pad ragged rows, then let TextParser type every column from its list of strings
+                width = max(len(row) for row in rows)
+                rows = [row + [""] * (width - len(row)) for row in rows]
+            try:
+                with TextParser(rows, header=header, thousands=",", decimal=".") as parser:
+                    dataframe = parser.read()
+            except EmptyDataError:
+                dataframe = None
+            if dataframe is not None:
+                if extract_links in ("all", "header") and isinstance(dataframe.columns, pandas.MultiIndex):
+                    dataframe.columns = pandas.Index(((column[0], None if pandas.isna(column[1]) else column[1]) for column in dataframe.columns), tupleize_cols=False)
+                dataframe.dropna(axis=1, how="all", inplace=True)
+            self._frames[key] = dataframe
+        return self._frames[key]
+
+    def find(self, match: str = ".+", id: str | None = None, caption: str | None = None, header: str | None = None) -> list:
+        """Positions of the visible tables with a text matching match, and the given id, caption or header text.
+        caption and header are regular expressions searched in the <caption> and in the header cells.
+        """
+        regex = re.compile(match)
+        positions = []
+        for position, node in enumerate(self._nodes):
+            if id is not None and node.get("id") != id:
+                continue
+            if caption is not None and not any(re.search(caption, _text(element)) for element in node.xpath("./caption")):
+                continue
+            if header is not None:
+                head, _, _ = self._sections(node=node)
+                if not any(re.search(header, _text(cell)) for row in head for cell in _cells(row)):
+                    continue
+            if position not in self._empty:
+                # pandas.read_html leaves out tables without rows, so do not count them either
+                self._empty[position] = not any(self._sections(node=node))
+            if not self._empty[position] and any(regex.search(text) for text in node.xpath(".//text()")):
+                positions.append(position)
+        return positions
+
+    def tables(self, match: str = ".+", extract_links: str | None = None, id: str | None = None, caption: str | None = None, header: str | None = None) -> list:
+        """Dataframes of every table found with find().
+        """
+        dataframes = [self._parse(position=position, extract_links=extract_links) for position in self.find(match=match, id=id, caption=caption, header=header)]
+        return [dataframe.copy() for dataframe in dataframes if dataframe is not None]
+
+    def table(self, index: int = 0, match: str = ".+", extract_links: str | None = None, id: str | None = None, caption: str | None = None, header: str | None = None) -> pandas.DataFrame:
+        """Dataframe of the table at index among the tables found with find(), same as tables()[index]
+        but only the tables up to it are parsed. Tables without any data are skipped the same way.
+        """
+        positions = self.find(match=match, id=id, caption=caption, header=header)
+        # A negative index counts from the last table
+        remaining = index if index >= 0 else -index - 1
+        for position in positions if index >= 0 else reversed(positions):
+            dataframe = self._parse(position=position, extract_links=extract_links)
+            if dataframe is None:
+                continue
+            if remaining == 0:
+                return dataframe.copy()
+            remaining -= 1
+        raise IndexError(f"No table at index {index}, found {len(positions)} tables matching regex {match!r} and some may be empty.")
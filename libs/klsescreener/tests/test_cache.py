@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from unittest.mock import MagicMock, patch
+import time
+import os
+import re
+
+# Import third-party libraries
+import requests
+import pandas
+import pytest
+
+# Import internal libraries
+from klsescreener import KLSEScreener, ResponseCache, TableExtractor
+
+
+URL = "https://www.klsescreener.com/v2/stocks/view/1818"
+HTML = "<table><tr><th>Financial Year</th><th>EPS</th></tr><tr><td>2024</td><td>1.5</td></tr></table>"
+
+
+def make_response(status: int = 200, body: str = HTML, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode("utf-8")
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+
+@pytest.fixture
+def cached(tmp_path):
+    """Fixture to turn the cache on for the duration of a test."""
+    KLSEScreener.configure_cache(directory=str(tmp_path))
+    KLSEScreener.reset_statistics()
+    yield KLSEScreener.cache
+    KLSEScreener.configure_cache(directory=None)
+
+
+def test_fresh_response_served_from_disk(cached):
+    """Test that a fresh response is served from the cache without a request."""
+    session = MagicMock()
+    session.get.return_value = make_response(headers={"ETag": "\"v1\""})
+    with patch.object(KLSEScreener, "session", return_value=session):
+        assert KLSEScreener().fetch_text(url=URL) == HTML
+        assert KLSEScreener().fetch_text(url=URL) == HTML
+    assert session.get.call_count == 1
+    assert KLSEScreener.statistics()["cache_hits"] == 1
+
+    # A new process opens the same file
+    other = ResponseCache(directory=os.path.dirname(cached.path))
+    assert other.lookup(url=URL)["fresh"]
+    other.close()
+
+
+def test_stale_response_revalidated(cached):
+    """Test that a stale response is revalidated and kept on 304 Not Modified."""
+    session = MagicMock()
+    session.get.side_effect = [make_response(headers={"ETag": "\"v1\"", "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}), make_response(status=304, body="")]
+    cached.ttls = [(re.compile("/stocks/view/"), 0.01)]
+    with patch.object(KLSEScreener, "session", return_value=session):
+        KLSEScreener().fetch_text(url=URL)
+        time.sleep(0.02)
+        assert KLSEScreener().fetch_text(url=URL) == HTML
+    headers = session.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == "\"v1\""
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert KLSEScreener.statistics()["revalidated"] == 1
+    assert cached.lookup(url=URL)["fresh"]
+
+
+def test_uncached_url_not_stored(cached):
+    """Test that urls without a time to live are not cached."""
+    session = MagicMock()
+    session.get.return_value = make_response()
+    with patch.object(KLSEScreener, "session", return_value=session):
+        KLSEScreener().fetch_text(url="https://www.klsescreener.com/v2/unknown")
+        KLSEScreener().fetch_text(url="https://www.klsescreener.com/v2/unknown")
+    assert session.get.call_count == 2
+
+
+def test_parsed_table_cached(cached):
+    """Test that tables parsed from a cached body are not parsed again."""
+    session = MagicMock()
+    session.get.return_value = make_response()
+    with patch.object(KLSEScreener, "session", return_value=session):
+        first = KLSEScreener().fetch_table(url=URL)
+        with patch("klsescreener.screener.TableExtractor", wraps=TableExtractor) as extractor:
+            second = KLSEScreener().fetch_table(url=URL)
+            extractor.assert_not_called()
+            # Another selection of the same page is parsed
+            KLSEScreener().fetch_html(url=URL)
+            extractor.assert_called_once()
+    pandas.testing.assert_frame_equal(first, second)
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used responses are evicted over max_bytes."""
+    cache = ResponseCache(directory=str(tmp_path), max_bytes=2500)
+    for code in range(3):
+        cache.store(url=f"{URL[:-4]}{code}", response=make_response(body="x" * 1000))
+        time.sleep(0.01)
+    assert cache.lookup(url=f"{URL[:-4]}0") is None
+    assert cache.lookup(url=f"{URL[:-4]}2") is not None
+    assert cache.size() <= 2500
+
+
+def test_frames_stored_as_data(tmp_path):
+    """Test that parsed tables are stored as JSON and that other data is a miss."""
+    cache = ResponseCache(directory=str(tmp_path))
+    tables = TableExtractor(document=HTML).tables(extract_links="all")
+    cache.store_frame(url=URL, key="tables", content=HTML, value=tables)
+    data = cache._execute("SELECT data FROM frames")[0][0]
+    assert data.startswith(b"{")
+    pandas.testing.assert_frame_equal(cache.frame(url=URL, key="tables", content=HTML)[0], tables[0])
+    # Anything that is not the JSON layout is a miss, never executed
+    cache._execute("UPDATE frames SET data = ?", (b"\x80\x05garbage",))
+    assert cache.frame(url=URL, key="tables", content=HTML) is None
+    cache.close()
+
+
+def test_eviction_scans_only_over_limit(tmp_path):
+    """Test that the cache file is only scanned once the running total is over max_bytes."""
+    cache = ResponseCache(directory=str(tmp_path), max_bytes=2500)
+    with patch.object(ResponseCache, "size", wraps=cache.size) as size:
+        cache.store(url=URL, response=make_response(body="x" * 1000))
+        cache.store(url=URL, response=make_response(body="y" * 1000))
+        size.assert_not_called()
+        assert cache._bytes == 1000
+        cache.store(url=f"{URL[:-4]}0", response=make_response(body="x" * 1000))
+        cache.store(url=f"{URL[:-4]}1", response=make_response(body="x" * 1000))
+        size.assert_called_once()
+    assert cache._bytes == cache.size() <= 2500
+    cache.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+import threading
+import time
+
+# Import third-party libraries
+import requests
+import pytest
+
+# Import internal libraries
+from klsescreener import KLSEScreener, SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    """Test that concurrent calls with the same key share the result of one run."""
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "page"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flight.do, "url", slow)
+        started.wait()
+        followers = [executor.submit(flight.do, "url", slow) for _ in range(7)]
+        results = [leader.result()] + [future.result() for future in followers]
+    assert len(calls) == 1
+    assert results[0] == ("page", False)
+    assert all(result == ("page", True) for result in results[1:])
+    assert flight.in_flight() == 0
+
+
+def test_exception_shared_then_forgotten():
+    """Test that an exception is raised to every waiting call and the key is then forgotten."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait()
+        raise ConnectionError("down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "url", failing)
+        started.wait()
+        follower = executor.submit(flight.do, "url", failing)
+        time.sleep(0.05)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError):
+                future.result()
+    # Nothing is kept once the call finished
+    assert flight.do("url", lambda: "page") == ("page", False)
+
+
+def test_get_coalesced():
+    """Test that concurrent downloads of one url send a single request."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"<html></html>"
+    response.encoding = "utf-8"
+    session = MagicMock()
+    session.get.side_effect = lambda **kwargs: time.sleep(0.2) or response
+    KLSEScreener.reset_statistics()
+    with patch.object(KLSEScreener, "session", return_value=session):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            texts = list(executor.map(lambda _: KLSEScreener().fetch_text(url="https://www.klsescreener.com/v2/markets"), range(4)))
+    assert texts == ["<html></html>"] * 4
+    assert session.get.call_count == 1
+    assert KLSEScreener.statistics()["coalesced"] == 3
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+import threading
+import datetime
+import time
+
+# Import third-party libraries
+import requests
+import pytest
+
+# Import internal libraries
+from klsescreener import KLSEScreener, AdaptiveLimiter, TokenBucket
+from klsescreener.limiter import retry_after
+
+
+def make_response(status: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    response.headers.update(headers or {})
+    return response
+
+
+def test_retry_after():
+    """Test Retry-After headers given as seconds, as an HTTP date and invalid."""
+    assert retry_after(value="2") == 2.0
+    assert retry_after(value=None) is None
+    assert retry_after(value="soon") is None
+    moment = datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert 25 < retry_after(value=format_datetime(moment, usegmt=True)) <= 30
+
+
+def test_token_bucket_rate():
+    """Test that the token bucket gives out a burst at once and then tokens at its rate."""
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # 5 tokens at once, the next 10 at 50 per second
+    assert 0.15 < time.monotonic() - start < 0.5
+
+
+def test_token_bucket_pause():
+    """Test that a paused token bucket gives out no token until the pause has passed."""
+    bucket = TokenBucket(rate=1000, burst=10)
+    bucket.pause(seconds=0.1)
+    assert bucket.acquire() >= 0.09
+
+
+def test_aimd_limit():
+    """Test the limit growing on healthy responses and halved once per burst of errors."""
+    limiter = AdaptiveLimiter(rate=1000, burst=1000, initial=4, maximum=6)
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release(status=200, latency=0.01)
+    assert 5 < limiter.limit <= 6
+    limiter.acquire()
+    limiter.release(status=503, latency=0.01)
+    assert 2.5 < limiter.limit < 3
+    # A second error of the same burst does not decrease it again
+    limiter.acquire()
+    limiter.release(status=429, latency=0.0)
+    assert 2.5 < limiter.limit < 3
+    time.sleep(0.02)
+    limiter.acquire()
+    limiter.release(status=None, latency=0.0)
+    assert limiter.limit < 1.5
+    assert limiter.in_flight == 0
+
+
+def test_latency_spike_decreases_limit():
+    """Test that a response much slower than usual halves the limit."""
+    limiter = AdaptiveLimiter(rate=1000, burst=1000, initial=8)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(status=200, latency=0.01)
+    limit = limiter.limit
+    limiter.acquire()
+    limiter.release(status=200, latency=1.0)
+    assert limiter.limit == pytest.approx(limit / 2)
+
+
+def test_concurrency_bounded_by_limit():
+    """Test that no more requests than the limit are in flight."""
+    limiter = AdaptiveLimiter(rate=1000, burst=1000, initial=2, maximum=2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def request(_):
+        with limiter.slot() as outcome:
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            outcome["status"] = 200
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(request, range(16)))
+    assert max(peak) == 2
+
+
+def test_get_retries_after_retry_after():
+    """Test that a 429 is sent again after its Retry-After has passed."""
+    session = MagicMock()
+    session.get.side_effect = [make_response(status=429, headers={"Retry-After": "0.1"}), make_response(status=200)]
+    KLSEScreener.reset_statistics()
+    with patch.object(KLSEScreener, "session", return_value=session), patch.object(KLSEScreener, "limiter", AdaptiveLimiter()):
+        start = time.monotonic()
+        response = KLSEScreener()._get(url="https://www.klsescreener.com/v2/markets")
+        elapsed = time.monotonic() - start
+    assert response.status_code == 200
+    assert elapsed >= 0.09
+    assert KLSEScreener.statistics()["retries"] == 1
+    assert KLSEScreener.statistics()["requests"] == 2
+
+
+def test_get_gives_up_after_max_retries():
+    """Test that a request is sent at most max_retries more times."""
+    session = MagicMock()
+    session.get.return_value = make_response(status=503)
+    with patch.object(KLSEScreener, "session", return_value=session), patch.object(KLSEScreener, "limiter", None), patch.object(KLSEScreener, "retry_base", 0.001):
+        response = KLSEScreener()._get(url="https://www.klsescreener.com/v2/markets")
+    assert response.status_code == 503
+    assert session.get.call_count == KLSEScreener.max_retries + 1
+
+
+def test_limiter_opt_in():
+    """Test that the limiter is off until configure_limiter turns it on."""
+    assert KLSEScreener.limiter is None
+    KLSEScreener.configure_limiter(rate=50)
+    assert KLSEScreener.limiter.bucket.rate == 50
+    assert KLSEScreener.limiter.limit == 16
+    KLSEScreener.configure_limiter(rate=None)
+    assert KLSEScreener.limiter is None
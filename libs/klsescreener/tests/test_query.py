@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from unittest.mock import patch
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from klsescreener import KLSEScreener, QueryEngine
+
+
+@pytest.fixture
+def dataframe():
+    """Fixture to create a screener table with text numbers like the downloaded one."""
+    return pandas.DataFrame(data={
+        "Code": ["5398", "1818", "0166", "7113", "5347"],
+        "Name": ["GAMUDA", "BURSA", "INARI", "TOPGLOV", "TENAGA"],
+        "Category": ["Construction", "Financial Services", "Technology", "Health Care", "Utilities"],
+        "Market": ["Main Market", "Main Market", "Main Market", "Main Market", "ACE Market"],
+        "PE": ["15.2", "24.0", "-", "8.5", "11.9"],
+        "DY": ["2.1%", "5.5%", "3.0%", "6.2%", "5.1%"],
+        "MCap.(M)": ["25,000.1", "6,000", "9,000", "3,500", "70,000"],
+    })
+
+
+@pytest.fixture
+def engine(dataframe):
+    """Fixture to create a QueryEngine."""
+    return QueryEngine(dataframe=dataframe)
+
+
+def test_typed_columns(engine):
+    """Test the numeric columns, missing values and indexes of a QueryEngine."""
+    assert engine.numeric == {"PE", "DY", "MCap.(M)"}
+    assert numpy.isnan(engine.columns["PE"][2])
+    assert engine.columns["MCap.(M)"][0] == 25000.1
+    assert "PE" in engine.indexes
+
+
+def test_select(engine, dataframe):
+    """Test selecting rows with comparisons, boolean operators, chained comparisons and arithmetic."""
+    selected = engine.select(where="PE < 12 and DY > 5 and Market == \"Main Market\"")
+    assert selected["Code"].to_list() == ["7113"]
+    assert engine.select(where="DY >= 5.1 or Category in ['Technology']")["Code"].to_list() == ["1818", "0166", "7113", "5347"]
+    assert engine.select(where="not PE > 12")["Code"].to_list() == ["0166", "7113", "5347"]
+    assert engine.select(where="10 < PE <= 15.2")["Code"].to_list() == ["5398", "5347"]
+    assert engine.select(where="`MCap.(M)` / 1000 > PE")["Code"].to_list() == ["5398", "5347"]
+    pandas.testing.assert_frame_equal(engine.select(), dataframe)
+
+
+def test_order_and_limit(engine):
+    """Test ordering, limiting and choosing the columns of a selection."""
+    assert engine.select(order_by="PE", columns=["Code"])["Code"].to_list() == ["7113", "5347", "5398", "1818", "0166"]
+    assert engine.select(order_by="PE", ascending=False, limit=3)["Code"].to_list() == ["1818", "5398", "5347"]
+    assert engine.select(where="Market == 'Main Market'", order_by="Name", limit=2)["Name"].to_list() == ["BURSA", "GAMUDA"]
+
+
+def test_compiled_query_cache(engine):
+    """Test that compiled queries and their masks are cached."""
+    assert engine.compile("DY > 5") is engine.compile("DY > 5")
+    assert engine.mask("DY > 5") is engine.mask("DY > 5")
+
+
+def test_invalid(engine):
+    """Test queries on unknown columns and queries that are not expressions of columns."""
+    with pytest.raises(KeyError):
+        engine.select(where="Unknown > 1")
+    with pytest.raises(ValueError):
+        engine.select(where="__import__('os').getcwd()")
+
+
+def test_screen(dataframe):
+    """Test KLSEScreener.screen on the downloaded screener table."""
+    KLSEScreener.invalidate()
+    with patch.object(KLSEScreener, "screener", return_value=dataframe):
+        assert KLSEScreener().screen(where="DY > 6")["Name"].to_list() == ["TOPGLOV"]
+    KLSEScreener.invalidate()
+
+
+def test_suffixed_volume():
+    """Test volumes with k and M suffixes compared as numbers."""
+    dataframe = pandas.DataFrame(data={
+        "Code": ["5398", "1818", "0166", "7113"],
+        "Volume": ["12.3k", "900", "2M", "-"],
+    })
+    engine = QueryEngine(dataframe=dataframe)
+    assert "Volume" in engine.numeric
+    assert engine.select(where="Volume > 1000")["Code"].to_list() == ["5398", "0166"]
+    assert engine.select(order_by="Volume")["Code"].to_list() == ["1818", "5398", "0166", "7113"]
+    assert engine.select(order_by="Volume", ascending=False)["Code"].to_list() == ["0166", "5398", "1818", "7113"]
+
+
+def test_number_compared_with_text(engine):
+    """Test that comparing a text column with a number raises a ValueError."""
+    with pytest.raises(ValueError, match="not numeric"):
+        engine.select(where="Market > 1000")
+    with pytest.raises(ValueError, match="not numeric"):
+        engine.select(where="5 < Name")
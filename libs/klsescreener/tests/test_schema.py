@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from unittest.mock import patch
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from klsescreener import KLSEScreener, QueryEngine, SCHEMAS, Schema, memory_report
+
+
+@pytest.fixture
+def dataframe():
+    """Fixture to create a screener table with text numbers like the downloaded one."""
+    return pandas.DataFrame(data={
+        "Code": ["5398", "1818", "0166", "7113"] * 50,
+        "Name": ["GAMUDA", "BURSA", "INARI", "TOPGLOV"] * 50,
+        "Category": ["Construction", "Financial Services", "Technology", "Health Care"] * 50,
+        "Market": ["Main Market", "Main Market", "Main Market", "ACE Market"] * 50,
+        "Price": ["4.50", "7.12", "2.80", "0.95"] * 50,
+        "Volume": ["12.3k", "1,500", "2M", "800"] * 50,
+        "PE": ["15.2", "24.0", "-", "8.5"] * 50,
+        "DY": ["2.1%", "5.5%", "3.0%", "6.2%"] * 50,
+        "MCap.(M)": ["25,000.1", "6,000", "9,000", "3,500"] * 50,
+    })
+
+
+def test_screener_schema(dataframe):
+    """Test the dtypes of the screener schema on text numbers, suffixes, percentages and codes."""
+    typed = SCHEMAS["screener"].apply(dataframe=dataframe)
+    assert typed["Price"].dtype == numpy.float32
+    assert typed["Volume"].dtype == numpy.int64
+    assert typed["Volume"].iloc[:4].to_list() == [12300, 1500, 2000000, 800]
+    assert typed["PE"].isna().to_list()[:4] == [False, False, True, False]
+    assert typed["DY"].iloc[1] == numpy.float32(5.5)
+    assert typed["MCap.(M)"].iloc[0] == numpy.float32(25000.1)
+    assert isinstance(typed["Market"].dtype, pandas.CategoricalDtype)
+    # Codes keep their leading zeros
+    assert typed["Code"].iloc[2] == "0166"
+    # The downloaded table is left as it is
+    assert dataframe["Price"].dtype == object
+
+
+def test_unconvertible_column_kept():
+    """Test that a column with a value that does not convert is kept as it is."""
+    dataframe = pandas.DataFrame(data={"Price": ["1.00", "see note"], "Volume": ["100", None], "Ann. Date": ["21 Mar 2024", "-"]})
+    typed = Schema(columns=[(r"Price", "float"), (r"Volume", "int"), (r".*Date", "datetime")]).apply(dataframe=dataframe)
+    assert typed["Price"].to_list() == ["1.00", "see note"]
+    assert str(typed["Volume"].dtype) == "Int64"
+    assert typed["Ann. Date"].iloc[0] == pandas.Timestamp("2024-03-21")
+    assert pandas.isna(typed["Ann. Date"].iloc[1])
+
+
+def test_link_columns_not_converted():
+    """Test that link columns are never converted."""
+    dataframe = pandas.DataFrame(data={"DateLink": ["https://www.klsescreener.com/v2/a"], "Date": ["01 Feb 2024"]})
+    typed = SCHEMAS["reports"].apply(dataframe=dataframe)
+    assert typed["DateLink"].dtype == object
+    assert typed["Date"].iloc[0] == pandas.Timestamp("2024-02-01")
+
+
+def test_memory_report(dataframe):
+    """Test the bytes saved per column and in total by memory_report."""
+    report = memory_report(before=dataframe, after=SCHEMAS["screener"].apply(dataframe=dataframe))
+    assert report.loc["Price", "After Dtype"] == "float32"
+    assert report.loc["Total", "Saved Bytes"] > 0
+    assert report.loc["Code", "Saved Bytes"] == 0
+    assert report.loc["Total", "Before Bytes"] == dataframe.memory_usage(index=False, deep=True).sum()
+
+
+def test_query_engine_on_typed_table(dataframe):
+    """Test that a query selects the same rows of a typed table as of the text table."""
+    typed = SCHEMAS["screener"].apply(dataframe=dataframe)
+    expression = 'PE < 20 and DY > 2 and Market == "Main Market"'
+    assert QueryEngine(dataframe=typed).rows(where=expression).tolist() == QueryEngine(dataframe=dataframe).rows(where=expression).tolist()
+
+
+def test_screener_typed(dataframe):
+    """Test KLSEScreener.screener with typed=True."""
+    with patch.object(KLSEScreener, "fetch_table", return_value=dataframe.copy()):
+        typed = KLSEScreener().screener(typed=True)
+    assert typed["PE"].dtype == numpy.float32
+    assert isinstance(typed["Category"].dtype, pandas.CategoricalDtype)
+
+
+def test_typed_thresholds_same_as_text():
+    """Test that thresholds on float32 columns select the same rows as on the text they came from."""
+    dataframe = pandas.DataFrame(data={"Code": ["A", "B", "C"], "PE": ["10.1", "10.09", "-"], "Volume": ["1.5k", "1,500", "900"]})
+    typed = SCHEMAS["screener"].apply(dataframe=dataframe)
+    assert typed["PE"].dtype == numpy.float32
+    for expression in ("PE <= 10.1", "PE < 10.1", "PE == 10.1", "Volume >= 1500"):
+        assert QueryEngine(dataframe=typed).rows(where=expression).tolist() == QueryEngine(dataframe=dataframe).rows(where=expression).tolist()
+    assert QueryEngine(dataframe=typed).columns["PE"][0] == 10.1
+
+
+def test_accounting_negatives():
+    """Test numbers in parentheses converted to negatives by the schema and the query engine."""
+    dataframe = pandas.DataFrame(data={"Code": ["A", "B", "C"], "Net Profit": ["(1.23)", "4.56", "(RM 2.5k)"], "DY": ["(3.0%)", "2.0%", "1.0%"]})
+    typed = SCHEMAS["reports"].apply(dataframe=dataframe)
+    assert typed["Net Profit"].to_list() == pytest.approx([-1.23, 4.56, -2500.0])
+    assert typed["DY"].iloc[0] == numpy.float32(-3.0)
+    assert QueryEngine(dataframe=dataframe).rows(where="`Net Profit` < 0").tolist() == [0, 2]
+    # Unbalanced parentheses are not a number
+    assert Schema(columns=[(r"Price", "float")]).apply(dataframe=pandas.DataFrame(data={"Price": ["(1.2", "1.2"]}))["Price"].dtype == object
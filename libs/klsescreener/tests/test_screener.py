@@ -2,7 +2,12 @@
 
 # -*- coding: utf-8 -*-
 
+# Import standard libraries
+from unittest.mock import patch
+import asyncio
+
 # Import third-party libraries
+import requests
 import pandas
 import pytest
 
@@ -16,6 +21,17 @@ def klsescreener():
     return KLSEScreener()
 
 
+def test_session(klsescreener):
+    """Test that every instance shares one pooled session."""
+    session = klsescreener.session()
+    assert session is KLSEScreener().session()
+    KLSEScreener.configure_session(pool_size=4, timeout=5)
+    assert klsescreener.session() is not session
+    assert klsescreener.session().get_adapter("https://").poolmanager.connection_pool_kw["maxsize"] == 4
+    assert klsescreener._session_config["timeout"] == 5
+    KLSEScreener.configure_session(pool_size=32, timeout=(10, 60))
+
+
 def test_screener(klsescreener):
     """Test the screener method."""
     dataframe = klsescreener.screener()
@@ -24,6 +40,13 @@ def test_screener(klsescreener):
     assert "Name" in dataframe.columns
 
 
+def test_ascreener(klsescreener):
+    """Test the ascreener method."""
+    dataframe = asyncio.run(klsescreener.ascreener())
+    assert isinstance(dataframe, pandas.DataFrame)
+    assert not dataframe.empty
+
+
 def test_warrant_screener(klsescreener):
     """Test the warrant_screener method."""
     dataframe = klsescreener.warrant_screener()
@@ -94,3 +117,75 @@ def test_get_markets(klsescreener):
     markets = klsescreener.get_markets()
     assert isinstance(markets, list)
     assert len(markets) == 4
+
+
+def test_snapshot(klsescreener):
+    """Test that the accessors share one screener download until invalidated."""
+    dataframe = pandas.DataFrame(data={
+        "Code": ["5398", "1818", "0166"],
+        "Name": ["GAMUDA", "BURSA", "INARI"],
+        "Category": ["Construction", "Financial Services", "Technology"],
+        "Market": ["Main Market", "Main Market", "Main Market"],
+    })
+    KLSEScreener.invalidate()
+    with patch.object(KLSEScreener, "screener", return_value=dataframe) as mock_screener:
+        assert klsescreener.get_stockcodes() == ["0166", "1818", "5398"]
+        assert klsescreener.get_categories() == ["Construction", "Financial Services", "Technology"]
+        assert KLSEScreener().get_markets() == ["Main Market"]
+        assert mock_screener.call_count == 1
+
+        snapshot = klsescreener.snapshot()
+        assert snapshot.row("1818")["Name"] == "BURSA"
+        assert snapshot.code("INARI") == "0166"
+        assert snapshot.codes_by_market("Main Market") == ["5398", "1818", "0166"]
+
+        KLSEScreener.invalidate()
+        klsescreener.get_stocknames()
+        assert mock_screener.call_count == 2
+    KLSEScreener.invalidate()
+
+
+def test_post_process_dataframe(klsescreener):
+    """Test that links are split into their own columns and dummy rows are removed."""
+    dataframe_raw = pandas.DataFrame(data={
+        ("Name", None): [("BURSA", "/v2/stocks/view/1818"), ("Quarter", None), ("GAMUDA", "/v2/stocks/view/5398")],
+        ("Price", None): [("9.50", None), ("Quarter", None), ("4.80", None)],
+        ("Date", None): [("2024-05-01", None), ("Quarter", None), ("2024-05-02", None)],
+        ("Report", None): [("View", "/v2/reports/1"), ("Quarter", None), ("View", "/v2/reports/2")],
+    })
+    dataframe = klsescreener._post_process_dataframe(dataframe_raw)
+    assert list(dataframe.columns) == ["index", "NameLink", "Name", "Price", "Date", "ReportLink"]
+    assert list(dataframe["index"]) == [0, 2]
+    assert list(dataframe["NameLink"]) == [f"https://www.klsescreener.com/v2/stocks/view/{code}" for code in ("1818", "5398")]
+    assert list(dataframe["ReportLink"]) == ["https://www.klsescreener.com/v2/reports/1", "https://www.klsescreener.com/v2/reports/2"]
+
+
+def response(status_code: int, content: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_fetch_json_polls_accepted(klsescreener, asynchronous):
+    """Test that 202 Accepted is polled with backoff and counted."""
+    responses = [response(202), response(202), response(200, b'{"t": [1, 2], "c": [1.0, 2.0]}')]
+    KLSEScreener.reset_statistics()
+    with patch.object(KLSEScreener, "_get", side_effect=responses), patch.object(KLSEScreener, "poll_base", 0.01):
+        if asynchronous:
+            dataframe = asyncio.run(klsescreener.afetch_json(url="https://www.klsescreener.com/v2/trading_view/history"))
+        else:
+            dataframe = klsescreener.fetch_json(url="https://www.klsescreener.com/v2/trading_view/history")
+    assert list(dataframe["t"]) == [1, 2]
+    statistics = KLSEScreener.statistics()
+    assert statistics["accepted"] == 1
+    assert statistics["polls"] == 2
+    assert statistics["poll_wait"] < 0.1
+
+
+def test_fetch_json_deadline(klsescreener):
+    """Test that polling gives up at the deadline."""
+    with patch.object(KLSEScreener, "_get", return_value=response(202)), patch.object(KLSEScreener, "poll_base", 0.01):
+        with pytest.raises(TimeoutError):
+            klsescreener.fetch_json(url="https://www.klsescreener.com/v2/trading_view/history", timeout=0.1)
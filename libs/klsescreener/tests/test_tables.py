@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from io import StringIO
+
+# Import third-party libraries
+import pandas
+import pytest
+
+# Import internal libraries
+from klsescreener import TableExtractor
+
+
+HTML = """<html><body>
+<table id="quarter"><caption>Quarter Reports</caption>
+<thead><tr><th>Financial Year</th><th colspan="2">Revenue</th><th>Report</th></tr></thead>
+<tbody>
+<tr><td>2024</td><td>1,234</td><td>5.5</td><td><a href="/v2/financial-reports/1">View</a></td></tr>
+<tr style="display: none"><td>hidden</td><td>1</td><td>2</td><td>3</td></tr>
+<tr><td rowspan="2">2023</td><td>1,000</td><td>-</td><td><a href="/v2/financial-reports/2">View</a><br>PDF</td></tr>
+<tr><td>900</td><td>3.2</td><td></td></tr>
+</tbody></table>
+<table style="display:none"><tr><td>Financial Year</td></tr></table>
+<table></table>
+<table><tr><th>Name</th><th>Date Change</th></tr><tr><th>Sub</th><th></th></tr>
+<tr><td>A  <span style="display:none">secret</span> B</td><td>2024-01-01</td></tr>
+<tr><td>C<!-- comment --></td><td><style>.x{}</style>2024-02-01</td><td>extra</td></tr></table>
+<table><tr><td>1</td><td></td></tr><tr><td>2</td><td></td></tr><tfoot><tr><td>Total</td><td>3</td></tr></tfoot></table>
+<table><thead><th>Ratio</th><th>Value</th></thead><tr><td>1:2</td><td>0.5</td></tr></table>
+</body></html>"""
+
+
+@pytest.mark.parametrize("extract_links", [None, "all", "body", "header"])
+@pytest.mark.parametrize("match", [".+", "Financial Year", "Date Change", "Ratio"])
+def test_same_as_read_html(match, extract_links):
+    """Test that TableExtractor gives the same tables as pandas.read_html."""
+    expected = pandas.read_html(StringIO(HTML), match=match, extract_links=extract_links)
+    for dataframe in expected:
+        dataframe.dropna(axis=1, how="all", inplace=True)
+    dataframes = TableExtractor(document=HTML).tables(match=match, extract_links=extract_links)
+    assert len(dataframes) == len(expected)
+    for index, dataframe in enumerate(expected):
+        pandas.testing.assert_frame_equal(dataframes[index], dataframe)
+        pandas.testing.assert_frame_equal(TableExtractor(document=HTML).table(index=index, match=match, extract_links=extract_links), dataframe)
+        pandas.testing.assert_frame_equal(TableExtractor(document=HTML).table(index=index - len(expected), match=match, extract_links=extract_links), dataframe)
+
+
+def test_find():
+    """Test finding tables by id, caption, header and text."""
+    extractor = TableExtractor(document=HTML)
+    assert extractor.find(id="quarter") == extractor.find(caption="^Quarter") == [0]
+    assert extractor.find(header="Date Change") == [2]
+    assert extractor.find(match="Financial Year") == [0]
+    assert extractor.table(header="Ratio")["Value"].to_list() == [0.5]
+
+
+def test_parse_only_requested():
+    """Test that only the tables up to the requested one are parsed and a copy is returned."""
+    extractor = TableExtractor(document=HTML)
+    extractor.table(index=1)
+    assert list(extractor._frames) == [(0, None), (2, None)]
+    assert extractor.table(index=1) is not extractor.table(index=1)
+
+
+def test_empty_table_skipped():
+    """Test that tables without rows are skipped when indexing like read_html."""
+    html = "<table><caption>Empty</caption><tr></tr></table><table><tr><th>A</th></tr><tr><td>1</td></tr></table>"
+    extractor = TableExtractor(document=html)
+    assert extractor.find() == [0, 1]
+    assert len(extractor.tables()) == 1
+    pandas.testing.assert_frame_equal(extractor.table(index=0), extractor.tables()[0])
+    pandas.testing.assert_frame_equal(extractor.table(index=-1), extractor.tables()[-1])
+    with pytest.raises(IndexError):
+        extractor.table(caption="Empty")
@@ -2,4 +2,12 @@
 
 # -*- coding: utf-8 -*-
 
-from .stock import Stock, generate_dashboard
+from .analytics import screener_analytics
+from .backtest import Fees, backtest, sweep
+from .indicators import Indicators, add_indicators
+from .panel import PricePanel
+from .resample import resample
+from .sinks import CsvSink, JsonLinesSink
+from .stats import PriceStats
+from .stock import Stock, gather_stocks, generate_dashboard, iter_dashboard
+from .store import Bars, BarStore
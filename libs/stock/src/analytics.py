@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Cross-sectional analytics of a PricePanel, computed with matrix products over every stock at once.
+
+Returns are simple daily returns, a stock has no return on a bar it did not trade.
+Statistics between two series use the bars where both have a return (pairwise complete), same as pandas corr().
+"""
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from klsescreener import KLSEScreener
+from .panel import PricePanel
+from .store import Bars
+
+
+def returns(panel: PricePanel, column: str = "c") -> numpy.ndarray:
+    """(codes, times - 1) returns from the previous traded bar of each stock.
+    """
+    filled = panel.filled(column=column)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        change = filled[:, 1:] / filled[:, :-1] - 1
+    return numpy.where(panel.mask[:, 1:], change, numpy.nan)
+
+
+def _moments(x: numpy.ndarray, y: numpy.ndarray) -> tuple:
+    """Pairwise complete count, covariance and variances of every row of x against every row of y.
+    """
+    x_mask, y_mask = ~numpy.isnan(x), ~numpy.isnan(y)
+    x_mask_f, y_mask_f = x_mask.astype(numpy.float64), y_mask.astype(numpy.float64)
+    x, y = numpy.where(x_mask, x, 0.0), numpy.where(y_mask, y, 0.0)
+    count = x_mask_f @ y_mask_f.T
+    x_sum, y_sum = x @ y_mask_f.T, x_mask_f @ y.T
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        covariance = (x @ y.T - x_sum * y_sum / count) / (count - 1)
+        x_variance = ((x * x) @ y_mask_f.T - x_sum ** 2 / count) / (count - 1)
+        y_variance = (x_mask_f @ (y * y).T - y_sum ** 2 / count) / (count - 1)
+    return count, covariance, x_variance, y_variance
+
+
+def _rolling_moments(x: numpy.ndarray, y: numpy.ndarray, window: int) -> tuple:
+    """Same as _moments of every row of x against the same row of y, over the window bars ending at each bar.
+    Window sums are differences of cumulative sums, so every bar costs the same whatever the window.
+    """
+    x, y = numpy.broadcast_arrays(numpy.asarray(x, dtype=numpy.float64), numpy.asarray(y, dtype=numpy.float64))
+    both = ~numpy.isnan(x) & ~numpy.isnan(y)
+    x, y = numpy.where(both, x, 0.0), numpy.where(both, y, 0.0)
+
+    def window_sum(values):
+        total = numpy.cumsum(numpy.concatenate((numpy.zeros(values.shape[:-1] + (1,)), values), axis=-1), axis=-1)
+        return total[..., 1:] - total[..., numpy.maximum(numpy.arange(values.shape[-1]) - window + 1, 0)]
+
+    count = window_sum(both.astype(numpy.float64))
+    x_sum, y_sum = window_sum(x), window_sum(y)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        covariance = (window_sum(x * y) - x_sum * y_sum / count) / (count - 1)
+        x_variance = (window_sum(x * x) - x_sum ** 2 / count) / (count - 1)
+        y_variance = (window_sum(y * y) - y_sum ** 2 / count) / (count - 1)
+    return count, covariance, x_variance, y_variance
+
+
+def correlation(returns: numpy.ndarray, min_periods: int = 20) -> numpy.ndarray:
+    """(codes, codes) correlation matrix of returns, NaN for pairs with fewer than min_periods common returns.
+    This is one value over every bar given, see rolling_correlation() for a value per bar.
+    """
+    count, covariance, x_variance, y_variance = _moments(x=returns, y=returns)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        result = covariance / numpy.sqrt(x_variance * y_variance)
+    result = numpy.clip(result, -1, 1)
+    result[count < max(min_periods, 2)] = numpy.nan
+    return result
+
+
+def beta(returns: numpy.ndarray, benchmark: numpy.ndarray, min_periods: int = 20) -> tuple:
+    """Beta and correlation of every row of returns against the benchmark returns, one value over every bar given.
+    See rolling_beta() for a value per bar.
+    """
+    count, covariance, x_variance, y_variance = [value[:, 0] for value in _moments(x=returns, y=numpy.asarray(benchmark, dtype=numpy.float64)[None, :])]
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        betas = covariance / y_variance
+        correlations = numpy.clip(covariance / numpy.sqrt(x_variance * y_variance), -1, 1)
+    enough = count >= max(min_periods, 2)
+    return numpy.where(enough, betas, numpy.nan), numpy.where(enough, correlations, numpy.nan)
+
+
+def rolling_correlation(returns: numpy.ndarray, window: int = 60, min_periods: int = 20) -> numpy.ndarray:
+    """(times, codes, codes) correlation matrix over the window bars ending at each bar, the matrix of correlation()
+    computed over a sliding window. It holds codes * codes values per bar, select the stocks of interest first.
+    """
+    result = numpy.full((returns.shape[-1], returns.shape[0], returns.shape[0]), numpy.nan)
+    for end in range(min(max(min_periods, 2), returns.shape[-1] + 1) - 1, returns.shape[-1]):
+        result[end] = correlation(returns=returns[:, max(end - window + 1, 0):end + 1], min_periods=min_periods)
+    return result
+
+
+def rolling_beta(returns: numpy.ndarray, benchmark: numpy.ndarray, window: int = 60, min_periods: int = 20) -> tuple:
+    """(codes, times) beta and correlation of every row of returns against the benchmark returns, over the window bars
+    ending at each bar, NaN where fewer than min_periods of them are common. The last bar is the same as beta()
+    over the last window bars.
+    """
+    count, covariance, x_variance, y_variance = _rolling_moments(x=returns, y=numpy.asarray(benchmark, dtype=numpy.float64)[None, :], window=window)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        betas = covariance / y_variance
+        correlations = numpy.clip(covariance / numpy.sqrt(x_variance * y_variance), -1, 1)
+    enough = count >= max(min_periods, 2)
+    return numpy.where(enough, betas, numpy.nan), numpy.where(enough, correlations, numpy.nan)
+
+
+def group_correlation(correlations: numpy.ndarray, groups: list) -> numpy.ndarray:
+    """Average correlation of each stock with the other stocks of its group, e.g. its Category.
+    """
+    labels, group_index = numpy.unique(numpy.array([str(group) for group in groups], dtype=object), return_inverse=True)
+    members = numpy.zeros((len(groups), len(labels)))
+    members[numpy.arange(len(groups)), group_index] = 1
+    valid = ~numpy.isnan(correlations)
+    numpy.fill_diagonal(valid, False)
+    sums = numpy.where(valid, correlations, 0.0) @ members
+    counts = valid.astype(numpy.float64) @ members
+    rows = numpy.arange(len(groups))
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return sums[rows, group_index] / counts[rows, group_index]
+
+
+def relative_strength(panel: PricePanel, lookback: int = 63) -> numpy.ndarray:
+    """Return of each stock over the last lookback bars of the panel.
+    """
+    filled = panel.filled()
+    if filled.shape[-1] <= lookback:
+        return numpy.full(len(panel), numpy.nan)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return filled[:, -1] / filled[:, -1 - lookback] - 1
+
+
+def percentile_rank(values: numpy.ndarray) -> numpy.ndarray:
+    """Percentile rank from 0 to 100 of each value among the others, NaN stays NaN.
+    """
+    return pandas.Series(values).rank(pct=True).to_numpy() * 100
+
+
+def align(bars: Bars, t: numpy.ndarray, column: str = "c") -> numpy.ndarray:
+    """Column of bars at the times t, NaN where bars has no bar.
+    """
+    index = numpy.clip(numpy.searchsorted(bars.t, t), 0, max(len(bars) - 1, 0))
+    if len(bars) == 0:
+        return numpy.full(len(t), numpy.nan)
+    return numpy.where(bars.t[index] == t, numpy.asarray(getattr(bars, column), dtype=numpy.float64)[index], numpy.nan)
+
+
+def screener_analytics(screener: pandas.DataFrame | None = None, panel: PricePanel | None = None, benchmark: Bars | None = None, index: str = "0200I", window: int = 250, lookback: int = 63, min_periods: int = 20) -> pandas.DataFrame:
+    """Screener table with correlation, beta and relative strength columns added.
+    Beta and Index Correlation are measured against a Bursa index, one of the codes of KLSEScreener.bursa_index(),
+    over the last window bars only. Sector Correlation is the average correlation with the other stocks of the same
+    Category over the same bars. rolling_beta() and rolling_correlation() give these values for every bar.
+    The panel and the index bars are downloaded if not given.
+    """
+    screener = KLSEScreener().screener() if screener is None else screener.copy()
+    codes = screener["Code"].to_list()
+    panel = PricePanel.build(codes=codes) if panel is None else panel
+    panel = panel.select(codes=codes)
+    panel = panel.between(stimestamp=panel.t[max(len(panel.t) - window - 1, 0)], etimestamp=panel.t[-1]) if len(panel.t) else panel
+    if benchmark is None:
+        stimestamp = int(panel.t[0]) if len(panel.t) else 0
+        benchmark = PricePanel.build(codes=[index], resolution=panel.resolution, stimestamp=stimestamp)
+        benchmark = Bars(t=benchmark.t, **{column: benchmark[column][0] for column in PricePanel.columns})
+
+    stock_returns = returns(panel=panel)
+    closes = align(bars=benchmark, t=panel.t)
+    benchmark_panel = PricePanel(codes=[index], t=panel.t, values={column: closes[None, :] for column in PricePanel.columns}, resolution=panel.resolution)
+    betas, index_correlations = beta(returns=stock_returns, benchmark=returns(panel=benchmark_panel)[0], min_periods=min_periods)
+    categories = screener.set_index("Code")["Category"].reindex(panel.codes).to_list() if "Category" in screener.columns else [None] * len(panel)
+    sector_correlations = group_correlation(correlations=correlation(returns=stock_returns, min_periods=min_periods), groups=categories)
+    strength = relative_strength(panel=panel, lookback=lookback)
+
+    analytics = pandas.DataFrame(data={
+        "Beta": betas,
+        "Index Correlation": index_correlations,
+        "Sector Correlation": sector_correlations,
+        "Relative Strength": strength,
+        "RS Percentile": percentile_rank(strength),
+    }, index=pandas.Index(panel.codes, name="Code"))
+    analytics = analytics.reindex(screener["Code"])
+    for column in analytics.columns:
+        screener[column] = analytics[column].to_numpy()
+    return screener
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Vectorized backtests of signals over a PricePanel.
+
+A signal is a (codes, times) array with the target weight of each stock after each bar, a boolean signal is weight 1
+and a negative weight is a short position.
+Each stock is sized from its own fixed allocation when its weight changes, rounded down to board lots, then held.
+Trades only happen on bars a stock traded, and cash is not checked, a run may be invested more than its capital.
+"""
+
+# Import standard libraries
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from .panel import PricePanel
+
+
+LOT = 100  # Shares per board lot on Bursa Malaysia
+YEAR = 252  # Trading days per year
+
+
+class Fees:
+    """Bursa Malaysia trading costs of each trade, from its value in RM.
+    Brokerage is a rate with a minimum per trade plus SST on it, stamp duty is charged per RM1,000 or part of it
+    (RM1 since 2024), stamp duty and the clearing fee are capped per trade.
+    """
+
+    def __init__(self, brokerage: float = 0.001, brokerage_minimum: float = 8.0, sst: float = 0.08, stamp_duty: float = 1.0, stamp_duty_cap: float = 1000.0, clearing: float = 0.0003, clearing_cap: float = 1000.0):
+        self.brokerage = brokerage
+        self.brokerage_minimum = brokerage_minimum
+        self.sst = sst
+        self.stamp_duty = stamp_duty
+        self.stamp_duty_cap = stamp_duty_cap
+        self.clearing = clearing
+        self.clearing_cap = clearing_cap
+
+    def __call__(self, value: numpy.ndarray) -> numpy.ndarray:
+        value = numpy.abs(numpy.asarray(value, dtype=numpy.float64))
+        brokerage = numpy.maximum(value * self.brokerage, self.brokerage_minimum) * (1 + self.sst)
+        stamp_duty = numpy.minimum(numpy.ceil(value / 1000) * self.stamp_duty, self.stamp_duty_cap)
+        clearing = numpy.minimum(value * self.clearing, self.clearing_cap)
+        return numpy.where(value > 0, brokerage + stamp_duty + clearing, 0.0)
+
+
+class BacktestResult:
+    """Positions, trades and equity curve of a backtest.
+    """
+
+    def __init__(self, panel: PricePanel, shares: numpy.ndarray, trades: numpy.ndarray, prices: numpy.ndarray, fees: numpy.ndarray, equity: numpy.ndarray, capital: float):
+        self.panel = panel
+        self.shares = shares  # (codes, times) shares held after each bar
+        self.trades = trades  # (codes, times) shares bought (> 0) or sold (< 0) on each bar
+        self.prices = prices  # (codes, times) execution price of each bar
+        self.fees = fees      # (codes, times) fees paid on each bar
+        self.equity = equity  # (times,) cash plus holdings at each close
+        self.capital = capital
+
+    def equity_curve(self) -> pandas.Series:
+        return pandas.Series(data=self.equity, index=pandas.Index(self.panel.d, name="d"), name="Equity")
+
+    def round_trips(self) -> pandas.DataFrame:
+        """One row per long or short position from entry until it is closed, or still open at the last bar.
+        A position going from long to short, or back, on one bar closes one round trip and opens the next, the trade
+        and its fees are split between them. Profit includes fees, an open position is valued at the last close, and
+        Return is the profit over the value bought (long) or sold short (short).
+        """
+        side = numpy.sign(self.shares)
+        previous = numpy.concatenate((numpy.zeros((side.shape[0], 1)), side[:, :-1]), axis=-1)
+        entries = (side != 0) & (side != previous)
+        exits = (previous != 0) & (side != previous)
+        flips = entries & exits
+        number = numpy.cumsum(entries, axis=-1)
+        prices = numpy.nan_to_num(self.prices)
+
+        # On a flip the shares held before are closed in the previous round trip, the rest opens the next one
+        before = numpy.concatenate((numpy.zeros((side.shape[0], 1)), self.shares[:, :-1]), axis=-1)
+        closing = numpy.where(flips, -before, 0.0)
+        opening = self.trades - closing
+        closing_fees = numpy.divide(self.fees * numpy.abs(closing), numpy.abs(self.trades), out=numpy.zeros_like(self.fees), where=flips)
+        opening_fees = self.fees - closing_fees
+        flows = -opening * prices - opening_fees
+        flows[:, -1] += self.shares[:, -1] * numpy.nan_to_num(self.panel.filled(column="c")[:, -1])
+
+        rows, columns = numpy.nonzero(entries)
+        trips = numpy.cumsum(entries.sum(axis=-1)) - entries.sum(axis=-1)  # First round trip of each stock
+        key = trips[:, None] + number - 1
+        counted = number > 0
+        profit = numpy.bincount(key[counted], weights=flows[counted], minlength=len(rows))
+        profit += numpy.bincount(key[flips] - 1, weights=-closing[flips] * prices[flips] - closing_fees[flips], minlength=len(rows))
+        fees = numpy.bincount(key[counted], weights=opening_fees[counted], minlength=len(rows))
+        fees += numpy.bincount(key[flips] - 1, weights=closing_fees[flips], minlength=len(rows))
+        exit_rows, exit_columns = numpy.nonzero(exits)
+        exit_index = numpy.full(len(rows), -1)
+        exit_index[key[exit_rows, exit_columns] - flips[exit_rows, exit_columns]] = exit_columns
+        cost = numpy.bincount(key[counted], weights=numpy.where(opening[counted] * side[counted] > 0, numpy.abs(opening[counted]) * prices[counted], 0.0), minlength=len(rows))
+
+        return pandas.DataFrame(data={
+            "Code": [self.panel.codes[row] for row in rows],
+            "Side": numpy.where(side[rows, columns] > 0, "Long", "Short"),
+            "Entry": self.panel.d[columns],
+            "Exit": numpy.where(exit_index >= 0, self.panel.d[exit_index], numpy.datetime64("NaT")),
+            "Bars": numpy.where(exit_index >= 0, exit_index, len(self.panel.t)) - columns,
+            "Profit": profit,
+            "Return": profit / cost,
+            "Fees": fees,
+        })
+
+    def statistics(self) -> dict:
+        returns = numpy.diff(self.equity) / self.equity[:-1] if len(self.equity) > 1 else numpy.empty(0)
+        drawdown = self.equity / numpy.maximum.accumulate(self.equity) - 1 if len(self.equity) else numpy.zeros(1)
+        round_trips = self.round_trips()
+        deviation = returns.std(ddof=1) if len(returns) > 1 else numpy.nan
+        growth = self.equity[-1] / self.capital if len(self.equity) else 1.0
+        return {
+            "Total Return": growth - 1,
+            "Annual Return": growth ** (YEAR / len(self.equity)) - 1 if len(self.equity) and growth > 0 else numpy.nan,
+            "Volatility": deviation * numpy.sqrt(YEAR),
+            "Sharpe Ratio": returns.mean() / deviation * numpy.sqrt(YEAR) if deviation else numpy.nan,
+            "Max Drawdown": drawdown.min(),
+            "Trades": int(numpy.count_nonzero(self.trades)),
+            "Round Trips": len(round_trips),
+            "Win Rate": (round_trips["Profit"] > 0).mean() if len(round_trips) else numpy.nan,
+            "Average Profit": round_trips["Profit"].mean() if len(round_trips) else numpy.nan,
+            "Fees": self.fees.sum(),
+        }
+
+
+def backtest(panel: PricePanel, signals: numpy.ndarray, capital: float = 100000.0, allocation: float | None = None, fees: Fees | None = None, execution: str = "open") -> BacktestResult:
+    """Simulate holding the weights of signals, each stock is allocated allocation * weight RM, capital / codes if not given.
+    With execution="open" a signal of a bar is traded at the open of the next bar the stock trades,
+    with execution="close" at the close of the same bar.
+    """
+    fees = Fees() if fees is None else fees
+    allocation = capital / max(len(panel), 1) if allocation is None else allocation
+    weights = numpy.nan_to_num(numpy.asarray(signals, dtype=numpy.float64))
+    if execution == "open":
+        weights = numpy.concatenate((numpy.zeros((weights.shape[0], 1)), weights[:, :-1]), axis=-1)
+        prices = panel["o"]
+    elif execution == "close":
+        prices = panel["c"]
+    else:
+        raise ValueError(f"Execution must be \"open\" or \"close\", got \"{execution}\".")
+
+    # A stock can only trade on its own bars, hold the previous weight on the others
+    mask = panel.mask & ~numpy.isnan(prices)
+    positions = numpy.arange(weights.shape[-1])
+    index = numpy.where(mask, positions, -1)
+    numpy.maximum.accumulate(index, axis=-1, out=index)
+    weights = numpy.where(index >= 0, numpy.take_along_axis(weights, numpy.maximum(index, 0), axis=-1), 0.0)
+
+    # Size a position when its weight changes, then keep the number of shares
+    previous = numpy.concatenate((numpy.zeros((weights.shape[0], 1)), weights[:, :-1]), axis=-1)
+    changed = mask & (weights != previous)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        sized = numpy.floor(allocation * weights / (prices * LOT)) * LOT
+    index = numpy.where(changed, positions, -1)
+    numpy.maximum.accumulate(index, axis=-1, out=index)
+    shares = numpy.where(index >= 0, numpy.take_along_axis(numpy.nan_to_num(sized), numpy.maximum(index, 0), axis=-1), 0.0)
+
+    trades = numpy.diff(shares, axis=-1, prepend=0.0)
+    paid = fees(trades * numpy.nan_to_num(prices))
+    cash = capital - numpy.cumsum((trades * numpy.nan_to_num(prices) + paid).sum(axis=0))
+    holdings = (shares * numpy.nan_to_num(panel.filled(column="c"))).sum(axis=0)
+    return BacktestResult(panel=panel, shares=shares, trades=trades, prices=prices, fees=paid, equity=cash + holdings, capital=capital)
+
+
+def _run(panel: PricePanel, strategy, parameters: dict, kwargs: dict) -> dict:
+    result = backtest(panel=panel, signals=strategy(panel, **parameters), **kwargs)
+    return {**parameters, **result.statistics()}
+
+
+def sweep(panel: PricePanel, strategy, grid: dict, processes: int | None = None, **kwargs) -> pandas.DataFrame:
+    """Backtest strategy(panel, **parameters) for every combination of the grid {parameter: values}, one row each.
+    With processes the runs are spread over a process pool, the strategy must then be a module level function.
+    Other keyword arguments are passed to backtest().
+    """
+    combinations = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    if processes is None:
+        rows = [_run(panel, strategy, parameters, kwargs) for parameters in combinations]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            rows = list(executor.map(_run, itertools.repeat(panel), itertools.repeat(strategy), combinations, itertools.repeat(kwargs)))
+    return pandas.DataFrame(data=rows)
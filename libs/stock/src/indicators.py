@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+"""Technical indicators over bars sorted by t.
+
+Every function works on the last axis, so the same call takes the prices of one stock or a (stocks, bars) panel.
+A row may start with NaN, e.g. a stock listed later than the others in a panel, its indicators start at its first bar.
+Windowed indicators are NaN until their window is full, smoothed indicators hold their value over a NaN bar.
+"""
+
+# Import third-party libraries
+from numpy.lib.stride_tricks import sliding_window_view
+import pandas
+import numpy
+
+
+def _pad(values: numpy.ndarray, length: int) -> numpy.ndarray:
+    """Left pad values with NaN to length along the last axis.
+    """
+    padding = numpy.full(values.shape[:-1] + (length - values.shape[-1],), numpy.nan)
+    return numpy.concatenate((padding, values), axis=-1)
+
+
+def _shift(values: numpy.ndarray, previous: numpy.ndarray | float | None = None) -> numpy.ndarray:
+    """Values one bar earlier, the first bar takes previous.
+    """
+    first = numpy.full(values.shape[:-1] + (1,), numpy.nan if previous is None else previous, dtype=numpy.float64)
+    return numpy.concatenate((first, values[..., :-1]), axis=-1)
+
+
+def _rolling_sum(values: numpy.ndarray, window: int) -> numpy.ndarray:
+    """Sum over the last window bars, NaN unless every bar of the window has a value.
+    """
+    valid = ~numpy.isnan(values)
+    zeros = numpy.zeros(values.shape[:-1] + (1,))
+    sums = numpy.concatenate((zeros, numpy.cumsum(numpy.where(valid, values, 0.0), axis=-1)), axis=-1)
+    counts = numpy.concatenate((zeros, numpy.cumsum(valid, axis=-1)), axis=-1)
+    window_sums = sums[..., window:] - sums[..., :-window]
+    window_counts = counts[..., window:] - counts[..., :-window]
+    return _pad(numpy.where(window_counts == window, window_sums, numpy.nan), values.shape[-1])
+
+
+def _windows(values: numpy.ndarray, window: int) -> numpy.ndarray | None:
+    if values.shape[-1] < window:
+        return None
+    return sliding_window_view(values, window_shape=window, axis=-1)
+
+
+def sma(values: numpy.ndarray, window: int = 20) -> numpy.ndarray:
+    """Simple moving average.
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    return _rolling_sum(values=values, window=window) / window
+
+
+def ema(values: numpy.ndarray, span: int | None = None, alpha: float | None = None, initial: numpy.ndarray | float | None = None) -> numpy.ndarray:
+    """Exponential moving average y = (1 - alpha) * y' + alpha * x, same as pandas ewm(adjust=False).
+    Starts at the first value of each row, or continues from initial, the average of the bar before.
+    The recurrence is solved in closed form block by block, a block is short enough that (1 - alpha) ** -block stays
+    small and keeps the scaled cumulative sum accurate.
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    alpha = 2 / (span + 1) if alpha is None else alpha
+    if not 0 < alpha < 1:
+        raise ValueError(f"EMA smoothing factor must be between 0 and 1, got {alpha}.")
+    decay = 1 - alpha
+    valid = ~numpy.isnan(values)
+    inputs = numpy.where(valid, values, 0.0)
+    started = numpy.logical_or.accumulate(valid, axis=-1) if values.shape[-1] else valid
+
+    length = values.shape[-1]
+    state = numpy.take_along_axis(values, numpy.expand_dims(valid.argmax(axis=-1), axis=-1), axis=-1)[..., 0] if length else numpy.full(values.shape[:-1], numpy.nan)
+    if initial is not None:
+        initial = numpy.broadcast_to(numpy.asarray(initial, dtype=numpy.float64), state.shape)
+        state = numpy.where(numpy.isnan(initial), state, initial)
+        started = started | ~numpy.isnan(initial)[..., None]
+
+    result = numpy.empty_like(values)
+    block = max(1, int(numpy.log(1e6) / -numpy.log(decay)))
+    for start in range(0, length, block):
+        scale = decay ** numpy.cumsum(valid[..., start:start + block], axis=-1)
+        averages = scale * (state[..., None] + alpha * numpy.cumsum(inputs[..., start:start + block] / scale, axis=-1))
+        result[..., start:start + block] = averages
+        state = averages[..., -1]
+    return numpy.where(started, result, numpy.nan)
+
+
+def _rsi(average_gain: numpy.ndarray, average_loss: numpy.ndarray) -> numpy.ndarray:
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return numpy.where(average_loss == 0, numpy.where(average_gain == 0, 50.0, 100.0), 100 - 100 / (1 + average_gain / average_loss))
+
+
+def rsi(close: numpy.ndarray, period: int = 14) -> numpy.ndarray:
+    """Relative strength index with Wilder smoothing (alpha = 1 / period) of the gains and losses.
+    """
+    close = numpy.asarray(close, dtype=numpy.float64)
+    change = close - _shift(close)
+    average_gain = ema(numpy.where(numpy.isnan(change), numpy.nan, numpy.maximum(change, 0)), alpha=1 / period)
+    average_loss = ema(numpy.where(numpy.isnan(change), numpy.nan, numpy.maximum(-change, 0)), alpha=1 / period)
+    return _rsi(average_gain=average_gain, average_loss=average_loss)
+
+
+def macd(close: numpy.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """MACD line, signal line and histogram.
+    """
+    line = ema(close, span=fast) - ema(close, span=slow)
+    signal_line = ema(line, span=signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close: numpy.ndarray, window: int = 20, k: float = 2.0) -> tuple:
+    """Middle, upper and lower Bollinger band, the bands are k population standard deviations from the middle.
+    """
+    close = numpy.asarray(close, dtype=numpy.float64)
+    middle = sma(close, window=window)
+    windows = _windows(close, window=window)
+    if windows is None:
+        return middle, middle.copy(), middle.copy()
+    deviation = _pad(windows.std(axis=-1), close.shape[-1])
+    return middle, middle + k * deviation, middle - k * deviation
+
+
+def true_range(high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, previous_close: numpy.ndarray | float | None = None) -> numpy.ndarray:
+    """Largest of high - low and the gaps from the previous close, the first bar without a previous close is high - low.
+    """
+    high = numpy.asarray(high, dtype=numpy.float64)
+    low = numpy.asarray(low, dtype=numpy.float64)
+    previous = _shift(numpy.asarray(close, dtype=numpy.float64), previous=previous_close)
+    return numpy.fmax(high - low, numpy.fmax(numpy.abs(high - previous), numpy.abs(low - previous)))
+
+
+def atr(high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, period: int = 14) -> numpy.ndarray:
+    """Average true range with Wilder smoothing (alpha = 1 / period).
+    """
+    return ema(true_range(high=high, low=low, close=close), alpha=1 / period)
+
+
+def vwap(high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, volume: numpy.ndarray, window: int | None = None) -> numpy.ndarray:
+    """Volume weighted average of the typical price (high + low + close) / 3, since the first bar or over a rolling window.
+    """
+    typical = (numpy.asarray(high, dtype=numpy.float64) + numpy.asarray(low, dtype=numpy.float64) + numpy.asarray(close, dtype=numpy.float64)) / 3
+    volume = numpy.asarray(volume, dtype=numpy.float64)
+    if window is not None:
+        weighted, total = _rolling_sum(typical * volume, window=window), _rolling_sum(volume, window=window)
+    else:
+        weighted, total = numpy.nancumsum(typical * volume, axis=-1), numpy.nancumsum(volume, axis=-1)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return numpy.where(total > 0, weighted / total, numpy.nan)
+
+
+def rolling_high(high: numpy.ndarray, window: int = 20) -> numpy.ndarray:
+    """Highest high of the last window bars.
+    """
+    high = numpy.asarray(high, dtype=numpy.float64)
+    windows = _windows(high, window=window)
+    return numpy.full(high.shape, numpy.nan) if windows is None else _pad(windows.max(axis=-1), high.shape[-1])
+
+
+def rolling_low(low: numpy.ndarray, window: int = 20) -> numpy.ndarray:
+    """Lowest low of the last window bars.
+    """
+    low = numpy.asarray(low, dtype=numpy.float64)
+    windows = _windows(low, window=window)
+    return numpy.full(low.shape, numpy.nan) if windows is None else _pad(windows.min(axis=-1), low.shape[-1])
+
+
+class Indicators:
+    """All indicators of bars that keep growing, update() only computes the bars appended since the last call.
+    Windowed indicators are computed over the new bars plus the window before them, smoothed indicators continue
+    from their last average, so the result equals computing everything again from the first bar.
+    """
+
+    columns = (
+        "sma",
+        "ema",
+        "rsi",
+        "macd",
+        "macd_signal",
+        "macd_histogram",
+        "bollinger_middle",
+        "bollinger_upper",
+        "bollinger_lower",
+        "atr",
+        "vwap",
+        "rolling_high",
+        "rolling_low",
+    )
+
+    def __init__(self, sma: int = 20, ema: int = 20, rsi: int = 14, macd: tuple = (12, 26, 9), bollinger: tuple = (20, 2.0), atr: int = 14, rolling: int = 20):
+        self.sma = sma
+        self.ema = ema
+        self.rsi = rsi
+        self.macd = macd
+        self.bollinger = bollinger
+        self.atr = atr
+        self.rolling = rolling
+        self.values = {}
+        self._history = None  # Last bars still inside a window
+        self._state = {}  # Last average of every smoothed series
+
+    def _smooth(self, key: str, values: numpy.ndarray, **kwargs) -> numpy.ndarray:
+        averages = ema(values, initial=self._state.get(key), **kwargs)
+        if averages.shape[-1]:
+            self._state[key] = numpy.where(numpy.isnan(averages[..., -1]), self._state.get(key, numpy.nan), averages[..., -1])
+        return averages
+
+    def update(self, high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, volume: numpy.ndarray) -> dict:
+        """Append bars along the last axis and return the indicators of the appended bars.
+        The indicators of every bar so far are kept in values.
+        """
+        bars = {
+            "high": numpy.asarray(high, dtype=numpy.float64),
+            "low": numpy.asarray(low, dtype=numpy.float64),
+            "close": numpy.asarray(close, dtype=numpy.float64),
+            "volume": numpy.asarray(volume, dtype=numpy.float64),
+        }
+        length = bars["close"].shape[-1]
+        if self._history is None:
+            self._history = {key: value[..., :0] for key, value in bars.items()}
+        extended = {key: numpy.concatenate((self._history[key], value), axis=-1) for key, value in bars.items()}
+        previous_close = self._history["close"][..., -1] if self._history["close"].shape[-1] else None
+
+        result = {}
+        result["sma"] = sma(extended["close"], window=self.sma)[..., -length:]
+        result["ema"] = self._smooth("ema", bars["close"], span=self.ema)
+
+        change = bars["close"] - _shift(bars["close"], previous=previous_close)
+        average_gain = self._smooth("rsi_gain", numpy.where(numpy.isnan(change), numpy.nan, numpy.maximum(change, 0)), alpha=1 / self.rsi)
+        average_loss = self._smooth("rsi_loss", numpy.where(numpy.isnan(change), numpy.nan, numpy.maximum(-change, 0)), alpha=1 / self.rsi)
+        result["rsi"] = _rsi(average_gain=average_gain, average_loss=average_loss)
+
+        fast, slow, signal = self.macd
+        result["macd"] = self._smooth("macd_fast", bars["close"], span=fast) - self._smooth("macd_slow", bars["close"], span=slow)
+        result["macd_signal"] = self._smooth("macd_signal", result["macd"], span=signal)
+        result["macd_histogram"] = result["macd"] - result["macd_signal"]
+
+        window, k = self.bollinger
+        middle, upper, lower = bollinger(extended["close"], window=window, k=k)
+        result["bollinger_middle"], result["bollinger_upper"], result["bollinger_lower"] = middle[..., -length:], upper[..., -length:], lower[..., -length:]
+
+        result["atr"] = self._smooth("atr", true_range(high=bars["high"], low=bars["low"], close=bars["close"], previous_close=previous_close), alpha=1 / self.atr)
+
+        typical = (bars["high"] + bars["low"] + bars["close"]) / 3
+        weighted = self._state.get("vwap_weighted", 0.0) + numpy.nancumsum(typical * bars["volume"], axis=-1)
+        total = self._state.get("vwap_volume", 0.0) + numpy.nancumsum(bars["volume"], axis=-1)
+        if length:
+            self._state["vwap_weighted"], self._state["vwap_volume"] = weighted[..., -1], total[..., -1]
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            result["vwap"] = numpy.where(total > 0, weighted / total, numpy.nan)
+
+        result["rolling_high"] = rolling_high(extended["high"], window=self.rolling)[..., -length:]
+        result["rolling_low"] = rolling_low(extended["low"], window=self.rolling)[..., -length:]
+
+        keep = max(self.sma, self.bollinger[0], self.rolling) - 1
+        self._history = {key: value[..., value.shape[-1] - min(keep, value.shape[-1]):] for key, value in extended.items()}
+        self.values = {column: numpy.concatenate((self.values[column], result[column]), axis=-1) if column in self.values else result[column] for column in self.columns}
+        return result
+
+
+def add_indicators(dataframe: pandas.DataFrame, **kwargs) -> pandas.DataFrame:
+    """Historical data with a column per indicator, in the same row order. Keyword arguments are passed to Indicators.
+    """
+    order = numpy.argsort(dataframe["t"].to_numpy(), kind="stable")
+    values = Indicators(**kwargs).update(
+        high=dataframe["h"].to_numpy()[order],
+        low=dataframe["l"].to_numpy()[order],
+        close=dataframe["c"].to_numpy()[order],
+        volume=dataframe["v"].to_numpy()[order],
+    )
+    dataframe = dataframe.copy()
+    for column in Indicators.columns:
+        restored = numpy.empty(len(order))
+        restored[order] = values[column]
+        dataframe[column] = restored
+    return dataframe
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import logging
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from klsescreener import KLSEScreener, ScreenerSnapshot
+from klsescreener.resolution import Resolution
+from .store import Bars
+from .stock import Stock
+
+
+class PricePanel:
+    """Bars of many stocks aligned on the union of their bar times.
+    Each of o/h/l/c/v is a float (codes, times) array, a stock without a bar at a time is NaN there.
+    """
+
+    columns = ("o", "h", "l", "c", "v")
+
+    def __init__(self, codes: list, t: numpy.ndarray, values: dict, resolution: Resolution | str = Resolution.DAILY):
+        self.codes = list(codes)
+        self.t = t
+        self.values = values
+        self.resolution = Resolution(resolution)
+        self._positions = {code: position for position, code in enumerate(self.codes)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, column: str) -> numpy.ndarray:
+        return self.values[column]
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.codes), len(self.t))
+
+    @property
+    def mask(self) -> numpy.ndarray:
+        """True where a stock has a bar.
+        """
+        return ~numpy.isnan(self.values["c"])
+
+    @property
+    def d(self) -> numpy.ndarray:
+        """Bar time in Malaysia time (UTC+8), computed on demand.
+        """
+        return self.t.astype("datetime64[s]") + numpy.timedelta64(8, "h")
+
+    @classmethod
+    def from_bars(cls, bars: dict, resolution: Resolution | str = Resolution.DAILY) -> "PricePanel":
+        """Align {code: Bars} on the union of their bar times.
+        """
+        t = numpy.unique(numpy.concatenate([item.t for item in bars.values()] + [numpy.empty(0, dtype=numpy.int64)]).astype(numpy.int64))
+        values = {column: numpy.full((len(bars), len(t)), numpy.nan) for column in cls.columns}
+        for row, item in enumerate(bars.values()):
+            if len(item) == 0:
+                continue
+            index = numpy.searchsorted(t, item.t)
+            for column in cls.columns:
+                values[column][row, index] = getattr(item, column)
+        return cls(codes=list(bars), t=t, values=values, resolution=resolution)
+
+    @classmethod
+    def build(cls, codes: list | None = None, resolution: Resolution | str = Resolution.DAILY, stimestamp: int | None = None, etimestamp: int | None = None, thread_count: int = 16) -> "PricePanel":
+        """Download the bars of many stocks concurrently and align them, every stock of the screener if codes is None.
+        Bars come through Stock.historical_data(), so a Stock.store is used when set.
+        The window defaults to the last 360 days up to now. A stock that fails is logged and left without bars.
+        """
+        resolution = Resolution(resolution)
+        codes = KLSEScreener().snapshot().stockcodes if codes is None else list(codes)
+        etimestamp = int(datetime.datetime.now().timestamp()) if etimestamp is None else etimestamp
+        stimestamp = int((datetime.datetime.now() - datetime.timedelta(days=360)).timestamp()) if stimestamp is None else stimestamp
+
+        def fetch(code):
+            try:
+                dataframe = Stock(code=code).historical_data(resolution=resolution.value, stimestamp=stimestamp, etimestamp=etimestamp)
+                return Bars.from_dataframe(dataframe=dataframe)
+            except Exception as exception:
+                logging.warning(f"Failed to fetch bars of stock \"{code}\": {exception!r}")
+                return Bars.empty()
+
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            bars = dict(zip(codes, executor.map(fetch, codes)))
+        return cls.from_bars(bars=bars, resolution=resolution)
+
+    def select(self, codes: list) -> "PricePanel":
+        """Panel of the given codes in that order, codes that are not in the panel are skipped.
+        """
+        codes = [code for code in codes if code in self._positions]
+        rows = numpy.array([self._positions[code] for code in codes], dtype=numpy.intp)
+        return PricePanel(codes=codes, t=self.t, values={column: values[rows] for column, values in self.values.items()}, resolution=self.resolution)
+
+    def by_category(self, category: str, snapshot: ScreenerSnapshot | None = None) -> "PricePanel":
+        snapshot = KLSEScreener().snapshot() if snapshot is None else snapshot
+        return self.select(codes=snapshot.codes_by_category(category=category))
+
+    def by_market(self, market: str, snapshot: ScreenerSnapshot | None = None) -> "PricePanel":
+        snapshot = KLSEScreener().snapshot() if snapshot is None else snapshot
+        return self.select(codes=snapshot.codes_by_market(market=market))
+
+    def between(self, stimestamp: float, etimestamp: float) -> "PricePanel":
+        """Bars with stimestamp <= t <= etimestamp, as views over the same arrays.
+        """
+        start = numpy.searchsorted(self.t, stimestamp, side="left")
+        end = numpy.searchsorted(self.t, etimestamp, side="right")
+        return PricePanel(codes=self.codes, t=self.t[start:end], values={column: values[:, start:end] for column, values in self.values.items()}, resolution=self.resolution)
+
+    def filled(self, column: str = "c") -> numpy.ndarray:
+        """Column with each missing bar taken from the previous bar of the same stock, NaN before its first bar.
+        """
+        values = self.values[column]
+        index = numpy.where(self.mask, numpy.arange(values.shape[-1]), 0)
+        numpy.maximum.accumulate(index, axis=-1, out=index)
+        filled = numpy.take_along_axis(values, index, axis=-1)
+        filled[~numpy.logical_or.accumulate(self.mask, axis=-1)] = numpy.nan
+        return filled
+
+    def to_dataframe(self, column: str = "c") -> pandas.DataFrame:
+        """One column as a dataframe with a row per code and a column per bar time.
+        """
+        return pandas.DataFrame(data=self.values[column], index=pandas.Index(self.codes, name="Code"), columns=pandas.Index(self.d, name="d"))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import numpy
+
+# Import internal libraries
+from klsescreener.resolution import Resolution
+from .store import Bars
+
+
+UTC_OFFSET = 8 * 3600  # Bursa Malaysia trades in UTC+8
+DAY = 86400
+
+# Start of each Bursa trading session in seconds after local midnight, intraday bars are aligned to these
+SESSIONS = (9 * 3600, 14 * 3600 + 30 * 60)
+
+MINUTES = {
+    Resolution.MINUTE_1: 1,
+    Resolution.MINUTE_5: 5,
+    Resolution.MINUTE_15: 15,
+    Resolution.MINUTE_30: 30,
+    Resolution.HOUR_1: 60,
+    Resolution.HOUR_4: 240,
+}
+
+MONTHS = {
+    Resolution.MONTH_1: 1,
+    Resolution.MONTH_3: 3,
+    Resolution.MONTH_6: 6,
+    Resolution.YEAR_1: 12,
+    Resolution.YEAR_5: 60,
+    Resolution.YEAR_10: 120,
+}
+
+
+def is_intraday(resolution: Resolution | str) -> bool:
+    return Resolution(resolution) in MINUTES
+
+
+def source_resolution(resolution: Resolution | str) -> Resolution:
+    """Finest resolution a bar of the given resolution is built from, 1 minute bars for intraday and daily bars otherwise.
+    """
+    return Resolution.MINUTE_1 if is_intraday(resolution) else Resolution.DAILY
+
+
+def labels(t: numpy.ndarray, resolution: Resolution | str) -> numpy.ndarray:
+    """Timestamp of the bar each t falls into.
+    Intraday bars are labelled with their start time, counted from the start of their trading session.
+    Daily and longer bars are labelled with 00:00 UTC of their first local date, same as the upstream daily bars.
+    """
+    resolution = Resolution(resolution)
+    t = numpy.asarray(t, dtype=numpy.int64)
+    local = t + UTC_OFFSET
+    date = numpy.floor_divide(local, DAY)
+
+    if resolution in MINUTES:
+        width = MINUTES[resolution] * 60
+        seconds = local - date * DAY
+        anchor = numpy.where(seconds >= SESSIONS[1], SESSIONS[1], SESSIONS[0])
+        return date * DAY - UTC_OFFSET + anchor + numpy.floor_divide(seconds - anchor, width) * width
+    if resolution == Resolution.DAILY:
+        return date * DAY
+    if resolution == Resolution.WEEKLY:
+        # 1970-01-01 is a Thursday, shift by 3 days so weeks start on Monday
+        return (numpy.floor_divide(date + 3, 7) * 7 - 3) * DAY
+    # Months since 0000-01 so that multi-month bars align to calendar quarters and years
+    width = MONTHS[resolution]
+    month = date.astype("datetime64[D]").astype("datetime64[M]").astype(numpy.int64) + 1970 * 12
+    month = numpy.floor_divide(month, width) * width - 1970 * 12
+    return month.astype("datetime64[M]").astype("datetime64[D]").astype(numpy.int64) * DAY
+
+
+def period_start(timestamp: float, resolution: Resolution | str) -> int:
+    """Epoch time at which the bar containing timestamp starts.
+    """
+    label = int(labels(numpy.array([int(timestamp)]), resolution)[0])
+    return label if is_intraday(resolution) else label - UTC_OFFSET
+
+
+def resample(bars: Bars, resolution: Resolution | str) -> Bars:
+    """Aggregate bars sorted by t into coarser bars of the given resolution.
+    Open is the first open, high the highest high, low the lowest low, close the last close and volume the sum.
+    """
+    if len(bars) == 0:
+        return Bars.empty()
+    key = labels(t=bars.t, resolution=resolution)
+    starts = numpy.flatnonzero(numpy.concatenate(([True], key[1:] != key[:-1])))
+    ends = numpy.concatenate((starts[1:], [len(key)])) - 1
+    return Bars(
+        t=key[starts],
+        o=numpy.asarray(bars.o)[starts],
+        h=numpy.maximum.reduceat(bars.h, starts),
+        l=numpy.minimum.reduceat(bars.l, starts),
+        c=numpy.asarray(bars.c)[ends],
+        v=numpy.add.reduceat(bars.v, starts),
+    )
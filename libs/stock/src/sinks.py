@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+import threading
+import datetime
+import logging
+import json
+import csv
+import os
+
+# Import third-party libraries
+import numpy
+
+
+def json_default(value):
+    """Serialize what json cannot, numpy scalars as python numbers and dates as ISO 8601 strings.
+    """
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class JsonLinesSink:
+    """Append each record as one JSON line, flushed to disk before the next record is taken.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = open(path, "a+", encoding="utf-8")
+        if self._file.tell() > 0:
+            # Start on a new line if the last run was cut off in the middle of one
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def __call__(self, record: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, default=json_default) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @staticmethod
+    def read(path: str) -> list:
+        """Records of a JSON lines file, a line cut short by a crash is ignored.
+        """
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logging.warning(f"Ignoring incomplete line in {path}.")
+        return records
+
+
+class CsvSink:
+    """Append each record as one CSV row, the columns are taken from the first record written to the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._writer = None
+
+    def __call__(self, record: dict) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, fieldnames=list(record), extrasaction="ignore")
+                if self._file.tell() == 0:
+                    self._writer.writeheader()
+            self._writer.writerow({key: json_default(value) if isinstance(value, (numpy.generic, datetime.date, datetime.time)) else value for key, value in record.items()})
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import pandas
+import numpy
+
+# Import internal libraries
+from .store import Bars
+
+
+UTC_OFFSET = numpy.timedelta64(8, "h")  # Bursa Malaysia trades in UTC+8
+DAY = 86400
+
+
+class PriceStats:
+    """All time high and low, listing and last trade statistics of daily bars, computed in one go over the arrays.
+    Works on the last axis, so a 2-D batch of many stocks padded with NaN prices gives one value per stock.
+    Indexes count from the first bar sorted by t, when a price repeats the latest bar wins.
+    """
+
+    fields = (
+        "ath_price",
+        "ath_index",
+        "ath_timestamp",
+        "ath_date",
+        "atl_price",
+        "atl_index",
+        "atl_timestamp",
+        "atl_date",
+        "listing_open_price",
+        "listing_timestamp",
+        "last_traded_timestamp",
+        "last_traded_date",
+        "listed_days",
+    )
+
+    def __init__(self, t: numpy.ndarray, o: numpy.ndarray, h: numpy.ndarray, l: numpy.ndarray, now: float | None = None):
+        t = numpy.asarray(t, dtype=numpy.int64)
+        o = numpy.asarray(o, dtype=numpy.float64)
+        h = numpy.asarray(h, dtype=numpy.float64)
+        l = numpy.asarray(l, dtype=numpy.float64)
+        now = pandas.Timestamp.now(tz="UTC").timestamp() if now is None else now
+
+        valid = ~numpy.isnan(h)
+        self.empty = ~valid.any(axis=-1)
+        last = h.shape[-1] - 1
+        if h.shape[-1] == 0:
+            # Nothing to index, report every stock as empty
+            t, o, h, l, valid = [numpy.zeros(h.shape[:-1] + (1,), dtype=array.dtype) for array in (t, o, h, l, valid)]
+            last = 0
+
+        # Search the reversed bars so that argmax/argmin pick the latest of equal prices
+        self.ath_index = last - numpy.where(valid, h, -numpy.inf)[..., ::-1].argmax(axis=-1)
+        self.atl_index = last - numpy.where(valid, l, numpy.inf)[..., ::-1].argmin(axis=-1)
+        first = valid.argmax(axis=-1)
+        latest = last - valid[..., ::-1].argmax(axis=-1)
+
+        self.ath_price = self._take(h, self.ath_index)
+        self.ath_timestamp = self._take(t, self.ath_index)
+        self.ath_date = self._date(self.ath_timestamp)
+        self.atl_price = self._take(l, self.atl_index)
+        self.atl_timestamp = self._take(t, self.atl_index)
+        self.atl_date = self._date(self.atl_timestamp)
+        self.listing_open_price = self._take(o, first)
+        self.listing_timestamp = self._take(t, first)
+        self.last_traded_timestamp = self._take(t, latest)
+        self.last_traded_date = self._date(self.last_traded_timestamp)
+        self.listed_days = (int(now) - self.listing_timestamp) // DAY
+
+    @staticmethod
+    def _take(array: numpy.ndarray, index: numpy.ndarray) -> numpy.ndarray:
+        return numpy.take_along_axis(array, numpy.expand_dims(index, axis=-1), axis=-1)[..., 0]
+
+    @staticmethod
+    def _date(timestamp: numpy.ndarray) -> numpy.ndarray:
+        """Malaysia date of epoch timestamps.
+        """
+        return (timestamp.astype("datetime64[s]") + UTC_OFFSET).astype("datetime64[D]")
+
+    @classmethod
+    def from_bars(cls, bars: Bars, now: float | None = None) -> "PriceStats":
+        return cls(t=bars.t, o=bars.o, h=bars.h, l=bars.l, now=now)
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pandas.DataFrame, now: float | None = None) -> "PriceStats":
+        """Statistics of a historical data dataframe, in any row order.
+        """
+        return cls.from_bars(bars=Bars.from_dataframe(dataframe=dataframe), now=now)
+
+    @classmethod
+    def stack(cls, bars: list, now: float | None = None) -> "PriceStats":
+        """Statistics of many stocks at once, their bars are padded with NaN to a 2-D array of shape (stocks, bars).
+        """
+        width = max((len(item) for item in bars), default=0)
+        arrays = {column: numpy.full((len(bars), width), numpy.nan) for column in ("o", "h", "l")}
+        arrays["t"] = numpy.zeros((len(bars), width), dtype=numpy.int64)
+        for row, item in enumerate(bars):
+            for column, array in arrays.items():
+                array[row, :len(item)] = getattr(item, column)
+        return cls(**arrays, now=now)
+
+    def record(self, index: int | None = None) -> dict:
+        """Statistics as plain python values, of the stock at index for a batch.
+        A stock without bars has None for every field.
+        """
+        select = (lambda array: array) if index is None else (lambda array: array[index])
+        if select(self.empty):
+            return dict.fromkeys(self.fields)
+        return {field: select(getattr(self, field)).item() for field in self.fields}
+
+    def to_dataframe(self) -> pandas.DataFrame:
+        """One row of statistics per stock of a batch, rows without bars are NaN/NaT.
+        """
+        dataframe = pandas.DataFrame(data={field: numpy.atleast_1d(getattr(self, field)) for field in self.fields})
+        dataframe.loc[numpy.atleast_1d(self.empty), :] = None
+        return dataframe
@@ -3,171 +3,197 @@
 # -*- coding: utf-8 -*-
 
 # Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import threading
+import asyncio
+import queue
 import datetime
 import logging
+import json
 import ast
 
 # Import third-party libraries
 from lxml import etree
 import requests
 import pandas
-import numpy
 
 # Import internal libraries
 from klsescreener.resolution import Resolution
 from shared.decorators import performance
-from klsescreener import KLSEScreener
+from klsescreener import KLSEScreener, FetchEngine, TableExtractor, SCHEMAS
+from .resample import period_start, resample, source_resolution
+from .store import Bars, BarStore
+from .sinks import JsonLinesSink
+from .stats import PriceStats
 
 
 class Stock(KLSEScreener):
 
+    # Optional BarStore shared by every Stock, historical_data() then only downloads bars it has not stored yet
+    store = None
+    # Build every resolution locally from 1 minute or daily bars instead of downloading each one
+    local_resampling = False
+
     __slots__ = [
-        "_dataframe_1d",
+        "_chunks",
         "_html_content",
+        "_lock",
+        "_locks",
+        "_tables",
         "_tree",
+        "_values",
         "cdt",  # Current date time
         "cts",  # Current timestamp
         "headers",
     ]
 
-    def __init__(self, code: int | str):
+    # XPath of each text attribute on the stock page
+    _xpaths = {
+        "background": "/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div/div/div[1]",
+        "long_name": "/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/span",
+        "name": "/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/h2",
+        "website": "/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div/div/div[1]/p[2]/a",
+    }
+
+    def __init__(self, code: int | str, store: BarStore | None = None, local_resampling: bool | None = None):
+        """Nothing is downloaded here, the stock page and the daily history are fetched on first use.
+        """
         super().__init__()
+        if store is not None:
+            self.store = store
+        if local_resampling is not None:
+            self.local_resampling = local_resampling
         self.code = code
         self.code_url = self.code
         self.cdt = datetime.datetime.today()
         self.cts = datetime.datetime.now().timestamp()
 
-        self._html_content = self.fetch_text(url=self.code_url)
-        self._tree = etree.HTML(text=self._html_content)
-
-        self.name = None
-        self.long_name = None
-        self.background = None
-        self.website = None
-
-        self.listing_timestamp = None
-        self.listing_datetime = None
-        self.listing_date = None
+        self._chunks = {}
+        self._html_content = None
+        self._tables = None
+        self._tree = None
+        self._values = {}
+        # One lock per lazy value and one for the page, so that fields fetched at the same time, e.g. by
+        # gather_stocks(), compute each value once while unrelated values are still computed in parallel
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    def _guard(self, name: str) -> threading.RLock:
+        with self._lock:
+            return self._locks.setdefault(name, threading.RLock())
+
+    def _lazy(self, name: str, compute) -> object:
+        """Value of a lazy attribute, computed on first access and kept until refresh().
+        Concurrent first accesses wait for one computation instead of repeating it.
+        """
+        if name in self._values:
+            return self._values[name]
+        with self._guard(name=name):
+            if name not in self._values:
+                self._values[name] = compute()
+            return self._values[name]
+
+    def _assign(self, name: str, value: object) -> None:
+        """Override a lazy attribute, assigning None computes it again on next access.
+        """
+        if value is None:
+            self._values.pop(name, None)
+        else:
+            self._values[name] = value
 
-        self._dataframe_1d = None
-        if self.listing_timestamp is not None:
-            self._dataframe_1d = self.historical_data_1D(stimestamp=self.listing_timestamp, etimestamp=self.cts)
-        self.listing_open_price = None
-        self.last_traded_date = None
-        self.listed_days = None
+    def _text(self, name: str) -> str | None:
+        try:
+            return self._document().xpath(_path=self._xpaths[name])[0].text.strip()
+        except (IndexError, AttributeError):
+            logging.debug(f"No {name} found on the page of stockcode \"{self.code}\".")
+            return None
 
-        self.ath_price = None
-        self.ath_timestamp = None
-        self.ath_date = None
-        self.ath_days = None
+    @property
+    def _dataframe_1d(self) -> pandas.DataFrame:
+        def compute():
+            if not self.listing_timestamp:
+                return pandas.DataFrame()
+            return self.historical_data_1D(stimestamp=self.listing_timestamp, etimestamp=self.cts)
+        return self._lazy("dataframe_1d", compute)
 
-        self.atl_price = None
-        self.atl_timestamp = None
-        self.atl_date = None
-        self.atl_days = None
+    @property
+    def _price_stats(self) -> dict:
+        """ATH/ATL, listing and last trade statistics of the daily history, all computed in one pass.
+        """
+        return self._lazy("price_stats", lambda: PriceStats.from_dataframe(dataframe=self._dataframe_1d, now=self.cts).record())
 
     @property
     def ath_date(self):
-        return self._ath_date
+        return self._lazy("ath_date", lambda: self._price_stats["ath_date"])
 
     @ath_date.setter
-    def ath_date(self, date: None):
-        if date is None and self.ath_price:
-            self._ath_date = self._dataframe_1d[self._dataframe_1d["h"] == self.ath_price].iloc[0, :]["d"].date()
-        else:
-            self._ath_date = timestamp
+    def ath_date(self, date: datetime.date | None):
+        self._assign("ath_date", date)
 
     @property
     def ath_days(self):
-        return self._ath_days
+        return self._lazy("ath_days", lambda: None if self.ath_timestamp is None else (self.cdt - datetime.datetime.fromtimestamp(self.ath_timestamp)).days)
 
     @ath_days.setter
-    def ath_days(self, days: None):
-        if days is None and self.ath_timestamp:
-            self._ath_days = (self.cdt - datetime.datetime.fromtimestamp(self._ath_timestamp)).days
-        else:
-            self._ath_days = days
+    def ath_days(self, days: int | None):
+        self._assign("ath_days", days)
 
     @property
     def ath_price(self):
-        return self._ath_price
+        return self._lazy("ath_price", lambda: self._price_stats["ath_price"])
 
     @ath_price.setter
     def ath_price(self, price: float | int | None):
-        if price is None and not self._dataframe_1d.empty:
-            self._ath_price = self._dataframe_1d["h"].max()
-        else:
-            self._ath_price = price
+        self._assign("ath_price", price)
 
     @property
     def ath_timestamp(self):
-        return self._ath_timestamp
+        return self._lazy("ath_timestamp", lambda: self._price_stats["ath_timestamp"])
 
     @ath_timestamp.setter
     def ath_timestamp(self, timestamp: int | None):
-        if timestamp is None and self.ath_price:
-            self._ath_timestamp = self._dataframe_1d[self._dataframe_1d["h"] == self.ath_price].iloc[0, :]["d"].timestamp()
-        else:
-            self._ath_timestamp = timestamp
+        self._assign("ath_timestamp", timestamp)
 
     @property
     def atl_date(self):
-        return self._atl_date
+        return self._lazy("atl_date", lambda: self._price_stats["atl_date"])
 
     @atl_date.setter
-    def atl_date(self, date: None):
-        if date is None and self.atl_price:
-            self._atl_date = self._dataframe_1d[self._dataframe_1d["l"] == self.atl_price].iloc[0, :]["d"].date()
-        else:
-            self._atl_date = timestamp
+    def atl_date(self, date: datetime.date | None):
+        self._assign("atl_date", date)
 
     @property
     def atl_days(self):
-        return self._atl_days
+        return self._lazy("atl_days", lambda: None if self.atl_timestamp is None else (self.cdt - datetime.datetime.fromtimestamp(self.atl_timestamp)).days)
 
     @atl_days.setter
-    def atl_days(self, days: None):
-        if days is None and self.atl_timestamp:
-            self._atl_days = (self.cdt - datetime.datetime.fromtimestamp(self._atl_timestamp)).days
-        else:
-            self._atl_days = days
+    def atl_days(self, days: int | None):
+        self._assign("atl_days", days)
 
     @property
     def atl_price(self):
-        return self._atl_price
+        return self._lazy("atl_price", lambda: self._price_stats["atl_price"])
 
     @atl_price.setter
     def atl_price(self, price: float | int | None):
-        if price is None and not self._dataframe_1d.empty:
-            self._atl_price = self._dataframe_1d["l"].min()
-        else:
-            self._atl_price = price
+        self._assign("atl_price", price)
 
     @property
     def atl_timestamp(self):
-        return self._atl_timestamp
+        return self._lazy("atl_timestamp", lambda: self._price_stats["atl_timestamp"])
 
     @atl_timestamp.setter
     def atl_timestamp(self, timestamp: int | None):
-        if timestamp is None and self.atl_price:
-            self._atl_timestamp = self._dataframe_1d[self._dataframe_1d["l"] == self.atl_price].iloc[0, :]["d"].timestamp()
-        else:
-            self._atl_timestamp = timestamp
+        self._assign("atl_timestamp", timestamp)
 
     @property
     def background(self):
-        return self._background
+        return self._lazy("background", lambda: self._text("background"))
 
     @background.setter
     def background(self, text: str | None):
-        if text is None:
-            try:
-                self._background = self._tree.xpath(_path="/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div/div/div[1]")[0].text.strip()
-            except Exception:
-                pass
-        else:
-            self._backgrounde = ""
+        self._assign("background", text)
 
     @property
     def code(self):
@@ -190,115 +216,121 @@ class Stock(KLSEScreener):
 
     @property
     def last_traded_date(self):
-        return self._last_traded_date
+        return self._lazy("last_traded_date", lambda: self._price_stats["last_traded_date"])
 
     @last_traded_date.setter
-    def last_traded_date(self, date: None):
-        if date is None and not self._dataframe_1d.empty:
-            self._last_traded_date = self._dataframe_1d.iloc[0, :]["Date"]
-        else:
-            self._last_traded_date = date
+    def last_traded_date(self, date: str | None):
+        self._assign("last_traded_date", date)
 
     @property
     def listed_days(self):
-        return self._listed_days
+        return self._lazy("listed_days", lambda: self._price_stats["listed_days"])
 
     @listed_days.setter
     def listed_days(self, days: int | None):
-        if days is None and not self._dataframe_1d.empty:
-            self._listed_days = (self.cdt - self._dataframe_1d.iloc[-1, :]["d"]).days
-        else:
-            self._listed_days = days
+        self._assign("listed_days", days)
 
     @property
     def listing_date(self):
-        return self._listing_date
+        return self._lazy("listing_date", lambda: str(self.listing_datetime.date()) if self.listing_datetime else None)
 
     @listing_date.setter
-    def listing_date(self, date: int | None):
-        if date is None and self.listing_datetime:
-            self._listing_date = str(self.listing_datetime.date())
-        else:
-            self._listing_date = date
+    def listing_date(self, date: str | None):
+        self._assign("listing_date", date)
 
     @property
     def listing_datetime(self):
-        return self._listing_datetime
+        return self._lazy("listing_datetime", lambda: datetime.datetime.fromtimestamp(self.listing_timestamp) if self.listing_timestamp else None)
 
     @listing_datetime.setter
-    def listing_datetime(self, date: None):
-        if date is None and self.listing_timestamp:
-            self._listing_datetime = datetime.datetime.fromtimestamp(timestamp=self.listing_timestamp)
-        else:
-            self._listing_datetime = date
+    def listing_datetime(self, date: datetime.datetime | None):
+        self._assign("listing_datetime", date)
 
     @property
     def listing_open_price(self):
-        return self._listing_open_price
+        return self._lazy("listing_open_price", lambda: self._price_stats["listing_open_price"])
 
     @listing_open_price.setter
     def listing_open_price(self, price: float | int | None):
-        if price is None and not self._dataframe_1d.empty:
-            self._listing_open_price = self._dataframe_1d.iloc[-1, :]["o"]
-        else:
-            self._listing_open_price = price
+        self._assign("listing_open_price", price)
 
     @property
     def listing_timestamp(self):
-        return self._listing_timestamp
+        return self._lazy("listing_timestamp", lambda: self.get_listing_date(return_timestamp=True))
 
     @listing_timestamp.setter
     def listing_timestamp(self, timestamp: int | None):
-        if timestamp is None:
-            self._listing_timestamp = self.get_listing_date(return_timestamp=True)
-        else:
-            self._listing_timestamp = timestamp
+        self._assign("listing_timestamp", timestamp)
 
     @property
     def long_name(self):
-        return self._long_name
+        return self._lazy("long_name", lambda: self._text("long_name"))
 
     @long_name.setter
     def long_name(self, name: str | None):
-        if name is None:
-            try:
-                self._long_name = self._tree.xpath(_path="/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/span")[0].text.strip()
-            except Exception:
-                pass
-        else:
-            self._long_name = ""
+        self._assign("long_name", name)
 
     @property
     def name(self):
-        return self._name
+        return self._lazy("name", lambda: self._text("name"))
 
     @name.setter
     def name(self, name: str | None):
-        if name is None:
-            try:
-                self._name = self._tree.xpath(_path="/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/h2")[0].text.strip()
-            except Exception:
-                pass
-        else:
-            self._name = ""
+        self._assign("name", name)
 
     @property
     def website(self):
-        return self._website
+        return self._lazy("website", lambda: self._text("website"))
 
     @website.setter
     def website(self, text: str | None):
-        if text is None:
-            try:
-                self._website = self._tree.xpath(_path="/html/body/div/div[1]/div[3]/div[1]/div/div[3]/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div/div/div[1]/p[2]/a")[0].text.strip()
-            except Exception:
-                pass
-        else:
-            self._website = ""
+        self._assign("website", text)
+
+    def _load(self, html_content: str) -> None:
+        self._html_content = html_content
+        self._tree = etree.HTML(text=self._html_content)
+        self._tables = None
+
+    def _document(self) -> etree._Element:
+        """Parsed stock page, downloaded on first use.
+        """
+        with self._guard(name="page"):
+            if self._tree is None:
+                self._load(html_content=self.fetch_text(url=self.code_url))
+            return self._tree
+
+    def refresh(self) -> None:
+        """Forget the downloaded stock page, every table parsed from it and every lazy attribute.
+        They are downloaded and computed again on next access.
+        """
+        self._html_content = None
+        self._tree = None
+        self._tables = None
+        self._values = {}
+
+    def _extractor(self) -> TableExtractor:
+        """Table extractor over the downloaded stock page, tables are parsed on first use and kept until refresh().
+        """
+        with self._guard(name="page"):
+            if self._tables is None:
+                self._tables = TableExtractor(document=self._document())
+            return self._tables
+
+    def _page_tables(self, match: str = ".+", extract_links: str | None = None) -> list:
+        """Select tables from the downloaded stock page, same as fetch_html but without another download.
+        """
+        return self._extractor().tables(match=match, extract_links=extract_links)
+
+    def _page_table(self, index: int = 0, match: str = ".+", extract_links: str | None = None) -> pandas.DataFrame:
+        """Same as _page_tables()[index] but only that table is parsed, or taken from the cache for this page.
+        """
+        self._document()
+        key = json.dumps(["table", index, match, extract_links, None, None, None])
+        return self._parsed(url=self.code_url, key=key, content=self._html_content, parse=lambda: self._extractor().table(index=index, match=match, extract_links=extract_links))
 
     @performance()
     def info(self, transpose: bool = False, return_json: bool = False, extended_info: bool = False) -> pandas.DataFrame | dict:
-        dataframe = self.fetch_html(url=self.code_url)[0].dropna()
+        dataframe = self._page_table().dropna()
 
         # Adding more stock information if is true
         if extended_info is True:
@@ -332,47 +364,131 @@ class Stock(KLSEScreener):
                 return ast.literal_eval(dataframe.to_json(orient="records"))[0]
         return dataframe
 
+    async def ainfo(self, transpose: bool = False, return_json: bool = False, extended_info: bool = False) -> pandas.DataFrame | dict:
+        """Async variant of info.
+        """
+        return await self.engine.run(self.info, transpose=transpose, return_json=return_json, extended_info=extended_info)
+
     @performance()
-    def quarter_reports(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, match="Financial Year", extract_links="all")[0].iloc[:, :13]
+    def quarter_reports(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(match="Financial Year", extract_links="all").iloc[:, :13]
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["reports"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def annual_reports(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, match="Financial Year", extract_links="all")[1]
+    def annual_reports(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(index=1, match="Financial Year", extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["reports"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def dividend_reports(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, match="Financial Year", extract_links="all")[2].iloc[:, :8]
+    def dividend_reports(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(index=2, match="Financial Year", extract_links="all").iloc[:, :8]
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["reports"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def capital_changes(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, match="Ratio", extract_links="all")[0]
+    def capital_changes(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(match="Ratio", extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["reports"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def warrants(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, extract_links="all")[-2]
+    def warrants(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(index=-2, extract_links="all")
         dataframe = self._post_process_dataframe(dataframe)
-        return dataframe
+        return SCHEMAS["reports"].apply(dataframe=dataframe) if typed else dataframe
 
     @performance()
-    def shareholding_changes(self) -> pandas.DataFrame:
-        dataframe = self.fetch_html(url=self.code_url, match="Date Change")[0]
-        return dataframe
+    def shareholding_changes(self, typed: bool = False) -> pandas.DataFrame:
+        dataframe = self._page_table(match="Date Change")
+        return SCHEMAS["shareholding_changes"].apply(dataframe=dataframe) if typed else dataframe
 
-    def historical_data(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999) -> pandas.DataFrame:
+    def _history_url(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999) -> str:
         url = f"{self.url}/trading_view/history?symbol={self.code}&resolution={resolution}&from={stimestamp}&to={etimestamp}&countback={countback}&currencyCode=MYR"
         logging.debug(f"Fetching historical data for stockcode \"{self.code}\" with resolution {resolution} from {datetime.datetime.fromtimestamp(stimestamp)} ({stimestamp}) to {datetime.datetime.fromtimestamp(etimestamp)} ({etimestamp}). {url}")
-        dataframe = self.fetch_json(url=url)
+        return url
 
+    def _fetch_bars(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999) -> pandas.DataFrame:
+        """Download the raw t/o/h/l/c/v bars of a range.
+        """
+        dataframe = self.fetch_json(url=self._history_url(resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback))
+        dataframe.drop(columns=["s", "from", "to", "exact_from", "server", "ip", "qt", "nextTime"], axis=1, inplace=True, errors="ignore")
+        return dataframe
+
+    async def _afetch_bars(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999) -> pandas.DataFrame:
+        """Async variant of _fetch_bars.
+        """
+        dataframe = await self.afetch_json(url=self._history_url(resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback))
+        dataframe.drop(columns=["s", "from", "to", "exact_from", "server", "ip", "qt", "nextTime"], axis=1, inplace=True, errors="ignore")
+        return dataframe
+
+    def _fetch_bars_chunked(self, resolution: str, stimestamp: int, etimestamp: int, chunk: int, workers: int = 4, retries: int = 2) -> pandas.DataFrame:
+        """Download a range as windows of chunk seconds, fetched concurrently and merged on t.
+        A failing window is retried on its own. Windows fetched before a window finally fails are kept, so calling
+        again with the same range only downloads what is still missing.
+        """
+        bounds = [stimestamp] + [bound for bound in range((int(stimestamp) // chunk + 1) * chunk, int(etimestamp), chunk)] + [etimestamp]
+        windows = [(resolution, start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+
+        def fetch_window(window):
+            if window in self._chunks:
+                return self._chunks[window]
+            for attempt in range(retries + 1):
+                try:
+                    dataframe = self._fetch_bars(resolution=resolution, stimestamp=window[1], etimestamp=window[2])
+                    break
+                except (TimeoutError, requests.exceptions.RequestException) as exception:
+                    if attempt == retries:
+                        raise
+                    logging.warning(f"Retrying window {window} of stockcode \"{self.code}\" after {exception!r}.")
+            self._chunks[window] = dataframe
+            return dataframe
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            dataframes = list(executor.map(fetch_window, windows))
+        for window in windows:
+            self._chunks.pop(window, None)
+
+        dataframes = [dataframe for dataframe in dataframes if not dataframe.empty]
+        if not dataframes:
+            return pandas.DataFrame()
+        dataframe = pandas.concat(objs=dataframes).drop_duplicates(subset=["t"], keep="last").sort_values(by=["t"]).reset_index(drop=True)
+        return dataframe
+
+    def _bars(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999, chunk: int | None = None) -> pandas.DataFrame:
+        """Raw t/o/h/l/c/v bars of a range, from the bar store if there is one.
+        """
+        def fetch(start, end):
+            if chunk is None:
+                return self._fetch_bars(resolution=resolution, stimestamp=start, etimestamp=end)
+            return self._fetch_bars_chunked(resolution=resolution, stimestamp=start, etimestamp=end, chunk=chunk)
+
+        if self.store is None and chunk is None:
+            return self._fetch_bars(resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback)
+        if self.store is None:
+            return fetch(start=stimestamp, end=etimestamp).tail(countback)
+        return self.store.bars(code=self.code, resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, fetch=fetch).to_dataframe().tail(countback)
+
+    def historical_data(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999, chunk: int | None = None) -> pandas.DataFrame:
+        """Get the bars of a range.
+        With chunk the range is downloaded as concurrent windows of chunk seconds, see _fetch_bars_chunked().
+        """
+        if self.local_resampling is True and Resolution(resolution) != source_resolution(resolution=resolution):
+            # Build the bars from 1 minute or daily bars, starting from the beginning of the first bar
+            dataframe = self._bars(resolution=source_resolution(resolution=resolution).value, stimestamp=period_start(timestamp=stimestamp, resolution=resolution), etimestamp=etimestamp, chunk=chunk)
+            dataframe = resample(bars=Bars.from_dataframe(dataframe=dataframe), resolution=resolution).to_dataframe().tail(countback)
+        else:
+            dataframe = self._bars(resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback, chunk=chunk)
+
+        return self._historical_dataframe(dataframe=dataframe, resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp)
+
+    def _historical_dataframe(self, dataframe: pandas.DataFrame, resolution: str, stimestamp: int, etimestamp: int) -> pandas.DataFrame:
+        """Add the date and time columns to raw bars, latest bar first.
+        """
         # Post-process the dataframe
+        if "t" not in dataframe.columns:
+            dataframe = pandas.DataFrame(columns=["t", "o", "h", "l", "c", "v"])
         dataframe.insert(loc=0, column="d", value=pandas.to_datetime(dataframe["t"], unit="s") + pandas.to_timedelta("8 hours"))
         dataframe.insert(loc=0, column="Time", value=dataframe["d"].dt.time)
         dataframe.insert(loc=0, column="Date", value=dataframe["d"].dt.date)
@@ -380,12 +496,30 @@ class Stock(KLSEScreener):
         dataframe.insert(loc=0, column="Month", value=dataframe["d"].dt.month)
         dataframe.insert(loc=0, column="Year", value=dataframe["d"].dt.year)
         dataframe.insert(loc=0, column="Resolution", value=resolution)
-        dataframe.drop(columns=["s", "from", "to", "exact_from", "server", "ip", "qt"], axis=1, inplace=True)
         dataframe.sort_values(by=["t"], ascending=False, inplace=True)
         dataframe.reset_index(drop=True, inplace=True)
         logging.debug(f"Fetched {len(dataframe)} rows of historical data for stockcode \"{self.code}\" with resolution {resolution} from {datetime.datetime.fromtimestamp(stimestamp)} ({stimestamp}) to {datetime.datetime.fromtimestamp(etimestamp)} ({etimestamp}).")
         return dataframe
 
+    async def ahistorical_data(self, resolution: str, stimestamp: int, etimestamp: int, countback: int = 99999999, chunk: int | None = None) -> pandas.DataFrame:
+        """Async variant of historical_data.
+        """
+        if self.store is not None or chunk is not None or self.local_resampling is True:
+            return await self.engine.run(self.historical_data, resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback, chunk=chunk)
+        dataframe = await self._afetch_bars(resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp, countback=countback)
+        return self._historical_dataframe(dataframe=dataframe, resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp)
+
+    @classmethod
+    async def acreate(cls, code: int | str, engine: FetchEngine | None = None) -> "Stock":
+        """Construct a Stock and download its page without blocking the event loop.
+        With engine, every async method of the stock runs on it instead of the shared engine.
+        """
+        stock = cls(code=code)
+        if engine is not None:
+            stock.engine = engine
+        stock._load(html_content=await stock.afetch_text(url=stock.code_url))
+        return stock
+
     @performance()
     def historical_data_1m(self, stimestamp: int = int((datetime.datetime.now() - datetime.timedelta(days=360)).timestamp()), etimestamp: int = int(datetime.datetime.now().timestamp())) -> pandas.DataFrame:
         dataframe = self.historical_data(resolution=Resolution.MINUTE_1.value, stimestamp=stimestamp, etimestamp=etimestamp)
@@ -488,31 +622,136 @@ class Stock(KLSEScreener):
         return date
 
 
-@performance(log=print)
-def generate_dashboard(thread_count: int = 16):
-    """Extended table with more information
+async def gather_stocks(codes: list, fields: tuple = ("info",), concurrency: int | None = None) -> dict:
+    """Fetch the given Stock fields for many codes concurrently.
+    Each field is the name of a Stock method called without arguments, the result is
+    {code: {field: result}}. A failing stock or field is logged and its result is the raised exception.
+    With concurrency, the calls run on an engine of their own with that many calls (and threads) in flight,
+    otherwise on the shared Stock.engine, see FetchEngine.
     """
+    engine = Stock.engine if concurrency is None else FetchEngine(concurrency=concurrency)
+
+    async def gather_field(stock, field):
+        return await engine.run(getattr(stock, field))
+
+    async def gather_stock(code):
+        try:
+            stock = await Stock.acreate(code=code, engine=engine)
+        except Exception as exception:
+            logging.warning(f"Failed to create stock \"{code}\": {exception!r}")
+            return {field: exception for field in fields}
+        results = await asyncio.gather(*[gather_field(stock, field) for field in fields], return_exceptions=True)
+        for field, result in zip(fields, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Failed to fetch {field} for stock \"{code}\": {result!r}")
+        return dict(zip(fields, results))
+
+    try:
+        results = await asyncio.gather(*[gather_stock(code) for code in codes])
+    finally:
+        if engine is not Stock.engine:
+            engine.shutdown()
+    return dict(zip(codes, results))
+
+
+def _fetch_stage(code: int | str) -> Stock:
+    stock = Stock(code=code)
+    stock._document()
+    return stock
 
-    @performance(log=logging.info)
-    def sThread(dataframe: pandas.DataFrame, sub_dataframe: pandas.DataFrame):
-        for index, row in sub_dataframe.iterrows():
-            info = Stock(code=row["Code"]).info(extended_info=True).T
-            info.columns = info.iloc[0]
-            info = info[1:]
-            dataframe.loc[dataframe["Code"] == row["Code"], info.columns] = info.iloc[0].values
 
+def _parse_stage(stock: Stock) -> pandas.DataFrame:
+    return stock.info(extended_info=True)
+
+
+def _derive_stage(code: int | str, info: pandas.DataFrame, fields: tuple | None = None) -> dict:
+    """Flatten the two column info table into one plain record of the stock, only keeping fields if given.
+    """
+    record = dict(zip(info.iloc[:, 0], info.iloc[:, 1]))
+    if fields is not None:
+        record = {field: record.get(field) for field in fields}
+    return {"Code": code, **record}
+
+
+def _dashboard_worker(codes: queue.Queue, records: queue.Queue, fields: tuple | None = None):
+    """Take codes until the None sentinel, put one record per code or None if the stock failed.
+    """
+    while (code := codes.get()) is not None:
+        try:
+            records.put(_derive_stage(code=code, info=_parse_stage(stock=_fetch_stage(code=code)), fields=fields))
+        except Exception as exception:
+            logging.warning(f"Failed to generate dashboard record for stock \"{code}\": {exception!r}")
+            records.put(None)
+
+
+def _merge_records(dataframe: pandas.DataFrame, records: list) -> pandas.DataFrame:
+    """Write the records into the screener table by Code in one pass per column.
+    """
+    records = [record for record in records if record is not None]
+    if not records:
+        return dataframe
+    info = pandas.DataFrame.from_records(data=records).drop_duplicates(subset=["Code"], keep="last").set_index("Code")
+    aligned = info.reindex(dataframe["Code"].to_numpy())
+    aligned.index = dataframe.index
+    found = dataframe["Code"].isin(info.index)
+    for column in [column for column in aligned.columns if column in dataframe.columns]:
+        dataframe.loc[found, column] = aligned.loc[found, column]
+    return pandas.concat(objs=[dataframe, aligned[[column for column in aligned.columns if column not in dataframe.columns]]], axis=1)
+
+
+def iter_dashboard(codes: list | None = None, fields: tuple | None = None, thread_count: int = 16, sink=None):
+    """Yield the dashboard record of each stock as soon as it is ready, in completion order.
+    codes defaults to every listed stock, fields limits the record to those info fields besides Code and sink is
+    called with every record before it is yielded, for example a JsonLinesSink or CsvSink.
+    Stocks that fail are logged and skipped.
+    """
+    if codes is None:
+        codes = KLSEScreener().get_stockcodes()
+    pending = queue.Queue()
+    records = queue.Queue()
+    for code in codes:
+        pending.put(code)
+    number_of_codes = pending.qsize()
+
+    workers = [threading.Thread(target=_dashboard_worker, args=[pending, records, fields], daemon=True) for _ in range(max(1, min(thread_count, number_of_codes)))]
+    for worker in workers:
+        pending.put(None)
+        worker.start()
+    try:
+        for _ in range(number_of_codes):
+            record = records.get()
+            if record is None:
+                continue
+            if sink is not None:
+                sink(record)
+            yield record
+    finally:
+        # Stop the workers after their current stock when the consumer stops early
+        with contextlib.suppress(queue.Empty):
+            while True:
+                pending.get_nowait()
+        for worker in workers:
+            pending.put(None)
+
+
+@performance(log=print)
+def generate_dashboard(thread_count: int = 16, resume: str | None = None):
+    """Extended table with more information
+    Built on iter_dashboard(), only the calling thread touches the dataframe, merging all records at the end.
+    With resume, every finished record is appended to that journal file as it arrives, codes already in the
+    journal are not fetched again and their stored records are merged instead.
+    """
     dataframe = KLSEScreener().screener()
-    dataframes = numpy.array_split(ary=dataframe, indices_or_sections=thread_count, axis=0)
+    collected = JsonLinesSink.read(path=resume) if resume is not None else []
+    completed = {record["Code"] for record in collected}
+    if completed:
+        logging.info(f"Resuming dashboard with {len(completed)} stocks from {resume}.")
 
-    threads = []
-    for df in dataframes:
-        threads.append(threading.Thread(target=sThread, args=[dataframe, df]))
-    for thread in threads:
-        thread.start()
-    for thread in threads:
-        thread.join()
+    codes = [code for code in dataframe["Code"].dropna().unique() if code not in completed]
+    with JsonLinesSink(path=resume) if resume is not None else contextlib.nullcontext() as journal:
+        collected.extend(iter_dashboard(codes=codes, thread_count=thread_count, sink=journal))
 
-    return dataframe
+    return _merge_records(dataframe=dataframe, records=collected)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+import threading
+import logging
+import json
+import time
+import os
+
+# Import third-party libraries
+import pandas
+import numpy
+
+
+class Bars:
+    """Columnar OHLCV bars sorted by t, each column is a fixed width numpy array.
+    Arrays loaded from a BarStore are read-only memory maps, slicing them with between() does not copy.
+    """
+
+    columns = ("t", "o", "h", "l", "c", "v")
+
+    def __init__(self, t: numpy.ndarray, o: numpy.ndarray, h: numpy.ndarray, l: numpy.ndarray, c: numpy.ndarray, v: numpy.ndarray):
+        self.t = t
+        self.o = o
+        self.h = h
+        self.l = l
+        self.c = c
+        self.v = v
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls(*[numpy.empty(0, dtype=numpy.int64 if column == "t" else numpy.float64) for column in cls.columns])
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pandas.DataFrame) -> "Bars":
+        if dataframe.empty or "t" not in dataframe.columns:
+            return cls.empty()
+        dataframe = dataframe.sort_values(by=["t"])
+        return cls(*[dataframe[column].to_numpy() for column in cls.columns])
+
+    def between(self, stimestamp: float, etimestamp: float) -> "Bars":
+        """Bars with stimestamp <= t <= etimestamp, as views over the same arrays.
+        """
+        start = numpy.searchsorted(self.t, stimestamp, side="left")
+        end = numpy.searchsorted(self.t, etimestamp, side="right")
+        return Bars(*[getattr(self, column)[start:end] for column in self.columns])
+
+    @property
+    def d(self) -> numpy.ndarray:
+        """Bar time in Malaysia time (UTC+8), computed on demand.
+        """
+        return self.t.astype("datetime64[s]") + numpy.timedelta64(8, "h")
+
+    def to_dataframe(self) -> pandas.DataFrame:
+        return pandas.DataFrame(data={column: numpy.array(getattr(self, column)) for column in self.columns})
+
+
+class BarStore:
+    """Local store of OHLCV bars keyed by (code, resolution), one .npy file per column.
+    Each key keeps one contiguous covered range, a request only downloads the part of its range that is not
+    covered yet plus the last stored bar, which may still have been forming when it was stored.
+    """
+
+    def __init__(self, root: str = os.path.join(os.path.expanduser("~"), ".klsescreener", "bars")):
+        self.root = root
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, code: str, resolution: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault((code, resolution), threading.Lock())
+
+    def _path(self, code: str, resolution: str) -> str:
+        return os.path.join(self.root, code, resolution)
+
+    def _meta(self, code: str, resolution: str) -> dict:
+        path = os.path.join(self._path(code=code, resolution=resolution), "meta.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def _read(self, code: str, resolution: str, meta: dict, mmap: bool) -> Bars:
+        if not meta or meta["rows"] == 0:
+            return Bars.empty()
+        path = self._path(code=code, resolution=resolution)
+        return Bars(*[numpy.load(os.path.join(path, f"{column}.{meta['version']}.npy"), mmap_mode="r" if mmap else None) for column in Bars.columns])
+
+    def load(self, code: str, resolution: str, stimestamp: float | None = None, etimestamp: float | None = None, mmap: bool = True) -> Bars:
+        """Load the stored bars of a time slice without downloading anything.
+        With mmap the columns are memory maps, only the pages of the requested slice are ever read.
+        """
+        with self._lock(code=code, resolution=resolution):
+            bars = self._read(code=code, resolution=resolution, meta=self._meta(code=code, resolution=resolution), mmap=mmap)
+        if stimestamp is None and etimestamp is None:
+            return bars
+        return bars.between(stimestamp=-numpy.inf if stimestamp is None else stimestamp, etimestamp=numpy.inf if etimestamp is None else etimestamp)
+
+    def save(self, code: str, resolution: str, bars: Bars, meta: dict) -> dict:
+        """Write a new version of the columns, then switch meta.json over to it and remove the previous version.
+        Readers that still map the previous version keep their view of it.
+        """
+        path = self._path(code=code, resolution=resolution)
+        os.makedirs(path, exist_ok=True)
+        previous = meta.get("version")
+        meta = {**meta, "version": (previous or 0) + 1, "rows": len(bars)}
+        for column in Bars.columns:
+            numpy.save(os.path.join(path, f"{column}.{meta['version']}.npy"), numpy.ascontiguousarray(getattr(bars, column)))
+        with open(os.path.join(path, "meta.json.tmp"), "w") as file:
+            json.dump(meta, file)
+        os.replace(os.path.join(path, "meta.json.tmp"), os.path.join(path, "meta.json"))
+        if previous is not None:
+            for column in Bars.columns:
+                try:
+                    os.remove(os.path.join(path, f"{column}.{previous}.npy"))
+                except OSError:
+                    # Still mapped by a reader on a platform that does not allow removing it
+                    logging.debug(f"Could not remove {column}.{previous}.npy from {path}.")
+        return meta
+
+    def clear(self, code: str, resolution: str) -> None:
+        path = self._path(code=code, resolution=resolution)
+        with self._lock(code=code, resolution=resolution):
+            if os.path.isdir(path):
+                for name in os.listdir(path):
+                    os.remove(os.path.join(path, name))
+
+    def missing(self, meta: dict, stimestamp: float, etimestamp: float) -> list:
+        """Ranges of [stimestamp, etimestamp] to download so the covered range stays contiguous.
+        """
+        if not meta:
+            return [(stimestamp, etimestamp)]
+        ranges = []
+        if stimestamp < meta["start"]:
+            ranges.append((stimestamp, meta["start"]))
+        if etimestamp > meta["end"]:
+            ranges.append((meta["last"] if meta["last"] is not None else meta["end"], etimestamp))
+        return ranges
+
+    def bars(self, code: str, resolution: str, stimestamp: float, etimestamp: float, fetch) -> Bars:
+        """Get the bars in [stimestamp, etimestamp].
+        fetch(stimestamp, etimestamp) downloads the raw bars of a range as a dataframe, it is only called for what is missing.
+        """
+        with self._lock(code=code, resolution=resolution):
+            meta = self._meta(code=code, resolution=resolution)
+            bars = self._read(code=code, resolution=resolution, meta=meta, mmap=True)
+            ranges = self.missing(meta=meta, stimestamp=stimestamp, etimestamp=etimestamp)
+            if ranges:
+                logging.debug(f"Bar store for stockcode \"{code}\" with resolution {resolution} is missing {ranges}.")
+                parts = [bars] + [Bars.from_dataframe(fetch(start, end)) for start, end in ranges]
+                parts = [part for part in parts if len(part)]
+                if parts:
+                    # Later parts win for a repeated t, numpy.unique() keeps the first so search the reversed order
+                    t = numpy.concatenate([part.t for part in parts])[::-1]
+                    _, index = numpy.unique(t, return_index=True)
+                    bars = Bars(*[numpy.concatenate([getattr(part, column) for part in parts])[::-1][index] for column in Bars.columns])
+                # Never mark the future as covered, those bars do not exist yet
+                end = min(etimestamp, int(time.time()))
+                meta = {
+                    **meta,
+                    "start": min(stimestamp, meta.get("start", stimestamp)),
+                    "end": max(end, meta.get("end", end)),
+                    "last": int(bars.t[-1]) if len(bars) else None,
+                }
+                meta = self.save(code=code, resolution=resolution, bars=bars, meta=meta)
+                bars = self._read(code=code, resolution=resolution, meta=meta, mmap=True)
+        return bars.between(stimestamp=stimestamp, etimestamp=etimestamp)
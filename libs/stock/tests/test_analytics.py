@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from stock import Bars, PricePanel
+from stock import analytics
+
+
+STIMESTAMP = 1704067200  # 2024-01-01 00:00:00 UTC
+DAY = 86400
+
+
+def bars(close: numpy.ndarray, t: numpy.ndarray) -> Bars:
+    return Bars(t=t, o=close, h=close, l=close, c=close, v=numpy.ones(len(t)))
+
+
+@pytest.fixture
+def market():
+    """Fixture to create an index and a panel of 6 stocks driven by it, with missing bars."""
+    rng = numpy.random.default_rng(0)
+    t = STIMESTAMP + numpy.arange(300, dtype=numpy.int64) * DAY
+    index_returns = rng.normal(0, 0.01, 300)
+    benchmark = bars(close=1000 * numpy.cumprod(1 + index_returns), t=t)
+    stocks = {}
+    for number, loading in enumerate((0.5, 1.0, 1.5, 0.0, 1.0, 2.0)):
+        close = 1 + numpy.cumsum(loading * index_returns + rng.normal(0, 0.01, 300)) * 0.1 + 1
+        keep = rng.random(300) > 0.1
+        stocks[f"{number:04d}"] = bars(close=close[keep], t=t[keep])
+    return benchmark, PricePanel.from_bars(bars=stocks)
+
+
+def test_correlation_matches_pandas(market):
+    """Test the correlation matrix of returns against pandas."""
+    _, panel = market
+    stock_returns = analytics.returns(panel=panel)
+    expected = pandas.DataFrame(stock_returns.T).corr(min_periods=20).to_numpy()
+    numpy.testing.assert_allclose(analytics.correlation(returns=stock_returns), expected, atol=1e-10)
+
+
+def test_beta_matches_regression(market):
+    """Test beta and correlation to the benchmark against a least squares fit of each stock."""
+    benchmark, panel = market
+    stock_returns = analytics.returns(panel=panel)
+    index_returns = numpy.diff(benchmark.c) / benchmark.c[:-1]
+    betas, correlations = analytics.beta(returns=stock_returns, benchmark=index_returns)
+    for row in range(len(panel)):
+        valid = ~numpy.isnan(stock_returns[row])
+        slope = numpy.polyfit(index_returns[valid], stock_returns[row][valid], 1)[0]
+        assert betas[row] == pytest.approx(slope)
+        assert correlations[row] == pytest.approx(numpy.corrcoef(index_returns[valid], stock_returns[row][valid])[0, 1])
+
+
+def test_rolling_beta_matches_window(market):
+    """Test that the rolling beta of each bar matches beta over the window ending at that bar."""
+    benchmark, panel = market
+    stock_returns = analytics.returns(panel=panel)
+    index_returns = numpy.diff(benchmark.c) / benchmark.c[:-1]
+    betas, correlations = analytics.rolling_beta(returns=stock_returns, benchmark=index_returns, window=60)
+    assert betas.shape == stock_returns.shape
+    for end in (19, 59, 150, stock_returns.shape[-1] - 1):
+        expected_betas, expected_correlations = analytics.beta(returns=stock_returns[:, max(end - 59, 0):end + 1], benchmark=index_returns[max(end - 59, 0):end + 1])
+        numpy.testing.assert_allclose(betas[:, end], expected_betas, atol=1e-9)
+        numpy.testing.assert_allclose(correlations[:, end], expected_correlations, atol=1e-9)
+    assert numpy.isnan(betas[:, :10]).all()
+    expected = pandas.Series(stock_returns[1]).rolling(60, min_periods=20).corr(pandas.Series(index_returns)).to_numpy()
+    numpy.testing.assert_allclose(correlations[1], expected, atol=1e-9)
+
+
+def test_rolling_correlation(market):
+    """Test that the rolling correlation of the last bar matches the correlation of the last window."""
+    _, panel = market
+    stock_returns = analytics.returns(panel=panel)
+    rolling = analytics.rolling_correlation(returns=stock_returns, window=60)
+    assert rolling.shape == (stock_returns.shape[-1], len(panel), len(panel))
+    numpy.testing.assert_allclose(rolling[-1], analytics.correlation(returns=stock_returns[:, -60:]), atol=1e-12)
+    assert numpy.isnan(rolling[0]).all()
+
+
+def test_group_correlation():
+    """Test the average correlation of each stock with the other stocks of its group."""
+    correlations = numpy.array([[1, 0.5, 0.1], [0.5, 1, 0.3], [0.1, 0.3, 1]])
+    numpy.testing.assert_allclose(analytics.group_correlation(correlations=correlations, groups=["A", "A", "B"]), [0.5, 0.5, numpy.nan])
+
+
+def test_screener_analytics(market):
+    """Test the beta, relative strength and group correlation columns added to a screener table."""
+    benchmark, panel = market
+    screener = pandas.DataFrame(data={"Code": ["0005", "0000", "0001", "0002", "0003", "0004", "9999"], "Category": ["X", "X", "X", "Y", "Y", "Y", "Y"]})
+    dataframe = analytics.screener_analytics(screener=screener, panel=panel, benchmark=benchmark, window=200, lookback=20)
+    assert list(dataframe["Code"]) == list(screener["Code"])
+    assert dataframe.set_index("Code").loc["0005", "Beta"] > dataframe.set_index("Code").loc["0003", "Beta"]
+    assert dataframe["RS Percentile"].iloc[:6].between(0, 100).all()
+    assert dataframe.iloc[-1, 2:].isna().all()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import numpy
+import pytest
+
+# Import internal libraries
+from stock import Bars, Fees, PricePanel, backtest, sweep
+
+
+STIMESTAMP = 1704067200  # 2024-01-01 00:00:00 UTC
+DAY = 86400
+
+
+def momentum(panel, window):
+    """Hold a stock while its close is above its close window bars before."""
+    close = panel.filled()
+    signals = numpy.zeros(close.shape, dtype=bool)
+    signals[:, window:] = close[:, window:] > close[:, :-window]
+    return signals
+
+
+@pytest.fixture
+def panel():
+    """Fixture to create a panel of 2 stocks with 1.00 and 2.00 closes, the second one rising 0.10 a bar."""
+    t = STIMESTAMP + numpy.arange(6, dtype=numpy.int64) * DAY
+    flat = numpy.ones(6)
+    rising = 2 + numpy.arange(6) * 0.1
+    return PricePanel.from_bars(bars={
+        "0001": Bars(t=t, o=flat, h=flat, l=flat, c=flat, v=flat),
+        "0002": Bars(t=t, o=rising, h=rising, l=rising, c=rising, v=flat),
+    })
+
+
+def test_fees():
+    """Test the brokerage, SST, stamp duty and clearing fee of a trade."""
+    fees = Fees()
+    # RM10,000 trade: brokerage 10 + 8% SST, stamp duty 10 x 1.00, clearing 3
+    assert fees([10000.0])[0] == pytest.approx(10.8 + 10 + 3)
+    # Minimum brokerage, stamp duty on the part of RM1,000
+    assert fees([500.0])[0] == pytest.approx(8.64 + 1.0 + 0.15)
+    # Stamp duty capped at RM1,000
+    assert fees([2000000.0])[0] == pytest.approx(2000 * 1.08 + 1000 + 600)
+    assert fees([0.0])[0] == 0
+
+
+def test_backtest_lots_and_equity(panel):
+    """Test positions rounded down to board lots, the equity curve and a closed round trip."""
+    signals = numpy.zeros(panel.shape)
+    signals[1, 1:4] = 1
+    result = backtest(panel=panel, signals=signals, capital=10000, allocation=5050, fees=Fees(brokerage=0, brokerage_minimum=0, sst=0, stamp_duty=0, clearing=0))
+    # Bought at the open of bar 2 at 2.20, 5050 / 2.20 = 2295 shares rounded down to 2200, sold at the open of bar 5 at 2.50
+    numpy.testing.assert_array_equal(result.shares[1], [0, 0, 2200, 2200, 2200, 0])
+    assert result.equity[-1] == pytest.approx(10000 + 2200 * 0.3)
+    round_trips = result.round_trips()
+    assert len(round_trips) == 1
+    assert round_trips.loc[0, "Code"] == "0002"
+    assert round_trips.loc[0, "Bars"] == 3
+    assert round_trips.loc[0, "Profit"] == pytest.approx(2200 * 0.3)
+
+
+def test_backtest_fees_and_open_position(panel):
+    """Test fees in the equity curve and round trips still open at the last bar."""
+    signals = numpy.ones(panel.shape, dtype=bool)
+    result = backtest(panel=panel, signals=signals, capital=10000, execution="close")
+    assert numpy.count_nonzero(result.trades) == 2
+    statistics = result.statistics()
+    assert statistics["Round Trips"] == 2
+    assert statistics["Fees"] == pytest.approx(result.fees.sum())
+    assert result.equity[-1] == pytest.approx(10000 + 2500 * 0.5 - result.fees.sum())
+    assert numpy.isnat(result.round_trips()["Exit"]).all()
+
+
+def test_sweep(panel):
+    """Test that a parameter sweep gives the same results in parallel as in series."""
+    serial = sweep(panel=panel, strategy=momentum, grid={"window": [1, 2]}, capital=10000)
+    parallel = sweep(panel=panel, strategy=momentum, grid={"window": [1, 2]}, processes=2, capital=10000)
+    assert list(serial["window"]) == [1, 2]
+    assert serial.equals(parallel)
+
+
+def test_short_round_trips(panel):
+    """Test round trips of short positions, alone and flipped to long on one bar."""
+    signals = numpy.zeros(panel.shape)
+    signals[1] = [-1, -1, 1, 1, 0, 0]
+    result = backtest(panel=panel, signals=signals, capital=10000, allocation=5000, execution="close", fees=Fees(brokerage=0, brokerage_minimum=0, sst=0, stamp_duty=0, clearing=0))
+    numpy.testing.assert_array_equal(result.shares[1], [-2500, -2500, 2200, 2200, 0, 0])
+    round_trips = result.round_trips()
+    assert list(round_trips["Side"]) == ["Short", "Long"]
+    assert list(round_trips["Bars"]) == [2, 2]
+    # Short at 2.00 and covered at 2.20, then long at 2.20 and sold at 2.40
+    assert list(round_trips["Profit"]) == pytest.approx([-2500 * 0.2, 2200 * 0.2])
+    assert list(round_trips["Return"]) == pytest.approx([-0.1, 0.2 / 2.2])
+    assert round_trips["Profit"].sum() == pytest.approx(result.equity[-1] - 10000)
+
+    # A short only signal with fees, still open at the last bar
+    signals[1] = -1
+    result = backtest(panel=panel, signals=signals, capital=10000, allocation=5000, execution="close")
+    round_trips = result.round_trips()
+    assert list(round_trips["Side"]) == ["Short"]
+    assert numpy.isnat(round_trips["Exit"]).all()
+    assert round_trips.loc[0, "Profit"] == pytest.approx(-2500 * 0.5 - result.fees.sum())
+    assert round_trips["Fees"].sum() == pytest.approx(result.fees.sum())
+
+
+def test_flip_splits_fees(panel):
+    """Test the fees of a long to short flip split between the two round trips by shares."""
+    signals = numpy.zeros(panel.shape)
+    signals[0] = [1, 1, -1, -1, 0, 0]
+    result = backtest(panel=panel, signals=signals, capital=10000, allocation=5000, execution="close")
+    round_trips = result.round_trips()
+    assert list(round_trips["Side"]) == ["Long", "Short"]
+    assert round_trips["Fees"].sum() == pytest.approx(result.fees.sum())
+    assert round_trips["Profit"].sum() == pytest.approx(result.equity[-1] - 10000)
+    # 5000 shares closed and 5000 opened on the flip, so each round trip pays half of its fees
+    assert round_trips.loc[0, "Fees"] == pytest.approx(result.fees[0, 0] + result.fees[0, 2] / 2)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from stock import Indicators, add_indicators
+from stock import indicators
+
+
+@pytest.fixture
+def bars():
+    """Fixture to create a random walk of 500 daily bars."""
+    rng = numpy.random.default_rng(0)
+    close = 1 + numpy.cumsum(rng.normal(0, 0.01, 500))
+    return {
+        "high": close + rng.random(500) * 0.02,
+        "low": close - rng.random(500) * 0.02,
+        "close": close,
+        "volume": rng.integers(100, 10000, 500).astype(numpy.float64),
+    }
+
+
+def test_matches_pandas(bars):
+    """Test the SMA, EMA, Bollinger bands, rolling high, RSI and VWAP against pandas."""
+    close = pandas.Series(bars["close"])
+    numpy.testing.assert_allclose(indicators.sma(bars["close"], window=20), close.rolling(20).mean())
+    numpy.testing.assert_allclose(indicators.ema(bars["close"], span=20), close.ewm(span=20, adjust=False).mean())
+    numpy.testing.assert_allclose(indicators.ema(bars["close"], alpha=0.001), close.ewm(alpha=0.001, adjust=False).mean())
+    numpy.testing.assert_allclose(indicators.bollinger(bars["close"], window=20)[1], close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0))
+    numpy.testing.assert_allclose(indicators.rolling_high(bars["high"], window=10), pandas.Series(bars["high"]).rolling(10).max())
+
+    change = close.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    numpy.testing.assert_allclose(indicators.rsi(bars["close"])[1:], (100 - 100 / (1 + gain / loss))[1:])
+
+    typical = (bars["high"] + bars["low"] + bars["close"]) / 3
+    numpy.testing.assert_allclose(indicators.vwap(**bars), numpy.cumsum(typical * bars["volume"]) / numpy.cumsum(bars["volume"]))
+
+
+def test_panel_matches_rows(bars):
+    """Test that indicators of a panel match those of each row alone, leading NaN bars included."""
+    panel = {key: numpy.vstack((value, numpy.concatenate((numpy.full(100, numpy.nan), value[100:])))) for key, value in bars.items()}
+    values = Indicators().update(**panel)
+    single = Indicators().update(**{key: value[100:] for key, value in bars.items()})
+    for column in Indicators.columns:
+        assert values[column].shape == (2, 500)
+        assert numpy.isnan(values[column][1, :100]).all()
+        numpy.testing.assert_allclose(values[column][1, 100:], single[column], err_msg=column)
+
+
+def test_update_matches_full(bars):
+    """Test that indicators updated in chunks match those computed at once."""
+    full = Indicators().update(**bars)
+    incremental = Indicators()
+    for start, end in ((0, 10), (10, 250), (250, 251), (251, 500)):
+        incremental.update(**{key: value[start:end] for key, value in bars.items()})
+    for column in Indicators.columns:
+        numpy.testing.assert_allclose(incremental.values[column], full[column], err_msg=column)
+
+
+def test_add_indicators_keeps_row_order(bars):
+    """Test add_indicators on a dataframe with the latest bar first."""
+    dataframe = pandas.DataFrame(data={"t": numpy.arange(500), "h": bars["high"], "l": bars["low"], "c": bars["close"], "v": bars["volume"]})
+    latest_first = add_indicators(dataframe.iloc[::-1])
+    numpy.testing.assert_allclose(latest_first["ema"].to_numpy()[::-1], indicators.ema(bars["close"], span=20))
+    assert list(latest_first.index) == list(dataframe.index[::-1])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+from unittest.mock import patch
+import time
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from klsescreener import ScreenerSnapshot
+from stock import PricePanel, Stock
+
+
+STIMESTAMP = 1704067200  # 2024-01-01 00:00:00 UTC
+DAY = 86400
+
+DAYS = {
+    "0001": [0, 1, 2, 3, 4],
+    "0002": [1, 3, 4],
+    "0003": [],
+}
+
+
+def historical_data(self, resolution, stimestamp, etimestamp, countback=99999999, chunk=None):
+    t = STIMESTAMP + numpy.array(DAYS[self.code], dtype=numpy.int64) * DAY
+    close = int(self.code) + numpy.arange(len(t), dtype=numpy.float64)
+    # Latest bar first like Stock.historical_data()
+    return pandas.DataFrame(data={"t": t, "o": close, "h": close, "l": close, "c": close, "v": numpy.ones(len(t))}).iloc[::-1]
+
+
+@pytest.fixture
+def panel():
+    """Fixture to create a PricePanel from fake historical data."""
+    with patch.object(Stock, "historical_data", historical_data):
+        return PricePanel.build(codes=list(DAYS), stimestamp=STIMESTAMP, etimestamp=STIMESTAMP + 5 * DAY)
+
+
+def test_build(panel):
+    """Test PricePanel.build aligning the bars of stocks with missing bars."""
+    assert panel.shape == (3, 5)
+    assert list(panel.t) == list(STIMESTAMP + numpy.arange(5) * DAY)
+    assert panel["c"].dtype == numpy.float64
+    numpy.testing.assert_array_equal(panel.mask, [[True] * 5, [False, True, False, True, True], [False] * 5])
+    numpy.testing.assert_array_equal(panel["c"][1], [numpy.nan, 2, numpy.nan, 3, 4])
+    numpy.testing.assert_array_equal(panel.filled()[1], [numpy.nan, 2, 2, 3, 4])
+
+
+def test_build_failure_is_missing():
+    """Test that a stock failing to download is left without bars."""
+    def failing(self, *args, **kwargs):
+        raise ConnectionError("offline")
+
+    with patch.object(Stock, "historical_data", failing):
+        panel = PricePanel.build(codes=["0001"], stimestamp=STIMESTAMP)
+    assert panel.shape == (1, 0)
+
+
+def test_build_default_window():
+    """Test PricePanel.build resolving the default window when it is called rather than when it is imported."""
+    windows = []
+
+    def recording(self, resolution, stimestamp, etimestamp, countback=99999999, chunk=None):
+        windows.append((stimestamp, etimestamp))
+        return historical_data(self, resolution=resolution, stimestamp=stimestamp, etimestamp=etimestamp)
+
+    with patch.object(Stock, "historical_data", recording):
+        PricePanel.build(codes=["0001"])
+    stimestamp, etimestamp = windows[0]
+    assert abs(etimestamp - time.time()) < 5
+    assert abs(stimestamp - (time.time() - 360 * DAY)) < 5
+
+
+def test_select(panel):
+    """Test selecting stocks of a panel by code, category and market."""
+    snapshot = ScreenerSnapshot(dataframe=pandas.DataFrame(data={
+        "Code": ["0001", "0002", "0004"],
+        "Name": ["A", "B", "D"],
+        "Category": ["Technology", "Property", "Technology"],
+        "Market": ["Main Market", "Main Market", "ACE Market"],
+    }), ttl=60)
+    assert panel.by_category(category="Technology", snapshot=snapshot).codes == ["0001"]
+    assert panel.by_market(market="Main Market", snapshot=snapshot).codes == ["0001", "0002"]
+    assert panel.select(codes=["0002", "0001"])["c"][0, -1] == 4
+
+    window = panel.between(stimestamp=STIMESTAMP + DAY, etimestamp=STIMESTAMP + 3 * DAY)
+    assert window.shape == (3, 3)
+    assert numpy.shares_memory(window["c"], panel["c"])
+    assert list(window.to_dataframe().index) == list(DAYS)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from klsescreener import Resolution
+from stock import Bars, resample
+
+
+def session_minutes(days: int) -> Bars:
+    """1 minute bars of every Bursa trading session (09:00-12:30, 14:30-17:00 UTC+8) on consecutive days."""
+    local_seconds = numpy.concatenate([numpy.arange(9 * 3600, 12 * 3600 + 30 * 60, 60), numpy.arange(14 * 3600 + 30 * 60, 17 * 3600, 60)])
+    first_day = 19723  # 2024-01-01 in days since epoch
+    t = numpy.concatenate([(first_day + day) * 86400 + local_seconds - 8 * 3600 for day in range(days)])
+    rng = numpy.random.default_rng(0)
+    c = 1 + rng.random(len(t))
+    return Bars(t=t, o=c - 0.01, h=c + 0.02, l=c - 0.02, c=c, v=rng.integers(1, 1000, len(t)))
+
+
+def reference(bars: Bars, rule: str, origin: str = "start_day", offset: str | None = None) -> pandas.DataFrame:
+    dataframe = bars.to_dataframe()
+    dataframe.index = pandas.to_datetime(dataframe["t"], unit="s") + pandas.Timedelta(hours=8)
+    resampled = dataframe.resample(rule, origin=origin, offset=offset).agg({"o": "first", "h": "max", "l": "min", "c": "last", "v": "sum"})
+    return resampled.dropna().reset_index(drop=True)
+
+
+@pytest.mark.parametrize("resolution, rule", [(Resolution.MINUTE_5, "5min"), (Resolution.MINUTE_15, "15min"), (Resolution.MINUTE_30, "30min")])
+def test_resample_minutes(resolution, rule):
+    """Test resampling 1 minute bars to minute resolutions against pandas resample."""
+    bars = session_minutes(days=3)
+    resampled = resample(bars=bars, resolution=resolution).to_dataframe()
+    pandas.testing.assert_frame_equal(resampled.drop(columns=["t"]), reference(bars, rule), check_dtype=False)
+
+
+def test_resample_hours_follow_sessions():
+    """Test hourly bars starting at the morning and afternoon sessions of Bursa Malaysia."""
+    bars = session_minutes(days=2)
+    hourly = resample(bars=bars, resolution=Resolution.HOUR_1)
+    local = pandas.to_datetime(hourly.t[:7], unit="s") + pandas.Timedelta(hours=8)
+    assert [timestamp.strftime("%H:%M") for timestamp in local] == ["09:00", "10:00", "11:00", "12:00", "14:30", "15:30", "16:30"]
+    four_hourly = resample(bars=bars, resolution=Resolution.HOUR_4)
+    assert len(four_hourly) == 4
+    assert four_hourly.v.sum() == bars.v.sum()
+
+
+def test_resample_daily_weekly_monthly():
+    """Test resampling to daily, weekly and monthly bars."""
+    bars = session_minutes(days=40)
+    daily = resample(bars=bars, resolution=Resolution.DAILY)
+    assert len(daily) == 40
+    assert daily.t[0] == 1704067200  # 2024-01-01 00:00 UTC
+    pandas.testing.assert_frame_equal(daily.to_dataframe().drop(columns=["t"]), reference(bars, "1D"), check_dtype=False)
+
+    weekly = resample(bars=daily, resolution=Resolution.WEEKLY)
+    assert list(pandas.to_datetime(weekly.t, unit="s").day_name().unique()) == ["Monday"]
+    assert weekly.v.sum() == bars.v.sum()
+
+    monthly = resample(bars=daily, resolution=Resolution.MONTH_1)
+    assert list(pandas.to_datetime(monthly.t, unit="s").strftime("%Y-%m-%d")) == ["2024-01-01", "2024-02-01"]
+    quarterly = resample(bars=daily, resolution=Resolution.MONTH_3)
+    assert len(quarterly) == 1
+    assert quarterly.h[0] == bars.h.max()
+    assert quarterly.c[0] == bars.c[-1]
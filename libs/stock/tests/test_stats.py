@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import standard libraries
+import datetime
+
+# Import third-party libraries
+import numpy
+
+# Import internal libraries
+from stock import Bars, PriceStats
+
+
+STIMESTAMP = 1704067200  # 2024-01-01 00:00:00 UTC
+
+
+def daily_bars(h: list, l: list) -> Bars:
+    rows = len(h)
+    return Bars(
+        t=STIMESTAMP + numpy.arange(rows, dtype=numpy.int64) * 86400,
+        o=numpy.arange(1, rows + 1, dtype=numpy.float64),
+        h=numpy.array(h, dtype=numpy.float64),
+        l=numpy.array(l, dtype=numpy.float64),
+        c=numpy.ones(rows),
+        v=numpy.ones(rows),
+    )
+
+
+def test_record():
+    """Test the all time high and low, listing and last traded fields of PriceStats."""
+    bars = daily_bars(h=[2, 6, 4, 6, 5], l=[1, 0.5, 3, 4, 0.5])
+    record = PriceStats.from_bars(bars=bars, now=STIMESTAMP + 10 * 86400).record()
+    assert record["ath_price"] == 6
+    assert record["ath_index"] == 3  # Latest of the repeated highs
+    assert record["ath_timestamp"] == STIMESTAMP + 3 * 86400
+    assert record["ath_date"] == datetime.date(2024, 1, 4)
+    assert record["atl_price"] == 0.5
+    assert record["atl_date"] == datetime.date(2024, 1, 5)
+    assert record["listing_open_price"] == 1
+    assert record["last_traded_date"] == datetime.date(2024, 1, 5)
+    assert record["listed_days"] == 10
+
+
+def test_from_dataframe_latest_first():
+    """Test PriceStats of a dataframe with the latest bar first like Stock.historical_data."""
+    dataframe = daily_bars(h=[2, 6, 4], l=[1, 0.5, 3]).to_dataframe().iloc[::-1]
+    record = PriceStats.from_dataframe(dataframe=dataframe, now=STIMESTAMP).record()
+    assert record["ath_index"] == 1
+    assert record["listing_timestamp"] == STIMESTAMP
+
+
+def test_stack_matches_single():
+    """Test that PriceStats of stacked stocks match those of each stock alone."""
+    batch = [daily_bars(h=[2, 6, 4, 6, 5], l=[1, 0.5, 3, 4, 0.5]), daily_bars(h=[3, 1], l=[2, 0.1]), Bars.empty()]
+    stats = PriceStats.stack(bars=batch, now=STIMESTAMP)
+    for index, bars in enumerate(batch[:2]):
+        assert stats.record(index=index) == PriceStats.from_bars(bars=bars, now=STIMESTAMP).record()
+    assert stats.record(index=2) == dict.fromkeys(PriceStats.fields)
+    dataframe = stats.to_dataframe()
+    assert list(dataframe.columns) == list(PriceStats.fields)
+    assert dataframe.iloc[2].isna().all()
+
+
+def test_empty():
+    """Test PriceStats of a stock without bars."""
+    assert PriceStats.from_bars(bars=Bars.empty()).record() == dict.fromkeys(PriceStats.fields)
+    assert PriceStats.stack(bars=[]).to_dataframe().empty
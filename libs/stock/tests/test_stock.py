@@ -4,14 +4,17 @@
 
 # Import standard libraries
 from unittest.mock import patch
+import threading
 import datetime
+import asyncio
+import time
 
 # Import third-party libraries
 import pandas
 import pytest
 
 # Import internal libraries
-from stock import Stock, generate_dashboard
+from stock import BarStore, JsonLinesSink, Stock, gather_stocks, generate_dashboard, iter_dashboard
 from klsescreener import KLSEScreener
 
 
@@ -67,6 +70,61 @@ def test_shareholding_changes(stock):
     assert isinstance(dataframe, pandas.DataFrame)
 
 
+def test_report_tables_reuse_page(stock):
+    """Test that report methods select from the downloaded page instead of fetching it again."""
+    stock.info()
+    with patch.object(Stock, "fetch_text") as mock_fetch_text, patch.object(Stock, "fetch_html") as mock_fetch_html:
+        stock.info()
+        stock.quarter_reports()
+        stock.annual_reports()
+        stock.shareholding_changes()
+        mock_fetch_text.assert_not_called()
+        mock_fetch_html.assert_not_called()
+
+
+def test_lazy_attributes():
+    """Test that constructing a Stock downloads nothing and each attribute only fetches what it needs."""
+    with patch.object(Stock, "fetch_text") as mock_fetch_text, patch.object(Stock, "fetch_json") as mock_fetch_json:
+        stock = Stock(code="1818")
+        mock_fetch_text.assert_not_called()
+        mock_fetch_json.assert_not_called()
+
+        mock_fetch_text.return_value = "<html><body></body></html>"
+        assert stock.name is None
+        assert stock.name is None
+        mock_fetch_text.assert_called_once()
+        mock_fetch_json.assert_not_called()
+
+        stock.listing_timestamp = 1704067200
+        assert stock.listing_date == str(datetime.datetime.fromtimestamp(1704067200).date())
+        mock_fetch_json.assert_not_called()
+
+
+def test_lazy_attributes_concurrent():
+    """Test that fields of one Stock resolved at the same time download and parse its page once."""
+    def slow_page(**kwargs):
+        time.sleep(0.1)
+        return "<html><body><table><tr><th>A</th></tr><tr><td>1</td></tr></table></body></html>"
+
+    with patch.object(Stock, "fetch_text", side_effect=slow_page) as mock_fetch_text:
+        stock = Stock(code="1818")
+        threads = [threading.Thread(target=target) for target in (lambda: stock.name, lambda: stock.long_name, lambda: stock._page_tables(), lambda: stock._extractor())]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    mock_fetch_text.assert_called_once()
+
+
+def test_refresh(stock):
+    """Test the refresh method."""
+    stock.quarter_reports()
+    stock.refresh()
+    assert stock._tables is None
+    dataframe = stock.quarter_reports()
+    assert isinstance(dataframe, pandas.DataFrame)
+
+
 def test_historical_data_1m(stock):
     """Test the historical_data_1m method."""
     dataframe = stock.historical_data_1m()
@@ -151,6 +209,60 @@ def test_historical_data_10Y(stock):
     assert isinstance(dataframe, pandas.DataFrame)
 
 
+def test_historical_data_chunked(stock):
+    """Test that a range fetched in windows matches the same range fetched at once."""
+    etimestamp = int(datetime.datetime.now().timestamp())
+    stimestamp = etimestamp - 90 * 86400
+    dataframe = stock.historical_data(resolution="1D", stimestamp=stimestamp, etimestamp=etimestamp)
+    chunked = stock.historical_data(resolution="1D", stimestamp=stimestamp, etimestamp=etimestamp, chunk=30 * 86400)
+    pandas.testing.assert_frame_equal(chunked, dataframe)
+
+
+def test_historical_data_store(tmp_path):
+    """Test that stored bars are not downloaded again."""
+    stock = Stock(code=stockcode(), store=BarStore(root=str(tmp_path)))
+    dataframe = stock.historical_data_1D()
+    with patch.object(Stock, "_fetch_bars") as mock_fetch_bars:
+        pandas.testing.assert_frame_equal(stock.historical_data_1D(), dataframe)
+        mock_fetch_bars.assert_not_called()
+
+
+def test_ainfo(stock):
+    """Test the ainfo method."""
+    dataframe = asyncio.run(stock.ainfo())
+    assert isinstance(dataframe, pandas.DataFrame)
+
+
+def test_gather_stocks():
+    """Test the gather_stocks helper."""
+    results = asyncio.run(gather_stocks(codes=[stockcode()], fields=("info", "quarter_reports")))
+    assert list(results) == [stockcode()]
+    assert isinstance(results[stockcode()]["info"], pandas.DataFrame)
+    assert isinstance(results[stockcode()]["quarter_reports"], pandas.DataFrame)
+
+
+def test_gather_stocks_concurrency():
+    """Test that gather_stocks keeps at most concurrency calls in flight on its own engine."""
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def field(self):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+        return self.code
+
+    codes = [str(code) for code in range(8)]
+    with patch.object(Stock, "fetch_text", return_value="<html></html>"), patch.object(Stock, "info", field):
+        results = asyncio.run(gather_stocks(codes=codes, fields=("info",), concurrency=2))
+    assert {code: result["info"] for code, result in results.items()} == {code: code for code in codes}
+    assert max(peak) <= 2
+
+
 def test_get_listing_date(stock):
     """Test the get_listing_date method."""
     date = stock.get_listing_date()
@@ -173,3 +285,27 @@ def test_generate_dashboard(mock_cls):
     assert dataframe.shape[0] == 1
     assert list(dataframe["Code"]) == [stockcode()]
     assert len(dataframe.columns) > len(dummy_dataframe.columns)
+
+
+def test_iter_dashboard(tmp_path):
+    """Test iter_dashboard streaming records into a sink."""
+    path = str(tmp_path / "dashboard.jsonl")
+    with JsonLinesSink(path=path) as sink:
+        records = list(iter_dashboard(codes=[stockcode()], fields=("All Time High", "Listed Date"), thread_count=1, sink=sink))
+    assert len(records) == 1
+    assert list(records[0]) == ["Code", "All Time High", "Listed Date"]
+    assert JsonLinesSink.read(path=path)[0]["Code"] == stockcode()
+
+
+@patch("stock.stock.Stock")
+@patch("stock.stock.KLSEScreener")
+def test_generate_dashboard_resume(mock_cls, mock_stock, tmp_path):
+    """Test generate_dashboard resuming from a journal with a truncated last line."""
+    journal = tmp_path / "dashboard.jsonl"
+    journal.write_text('{"Code": "1818", "Long Name": "BURSA MALAYSIA BHD"}\n{"Code": "51')
+    mock_cls.return_value.screener.return_value = pandas.DataFrame(data={"Code": [stockcode()], "Name": ["BURSA"]})
+
+    dataframe = generate_dashboard(thread_count=1, resume=str(journal))
+
+    mock_stock.assert_not_called()
+    assert list(dataframe["Long Name"]) == ["BURSA MALAYSIA BHD"]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+# Import third-party libraries
+import pandas
+import numpy
+import pytest
+
+# Import internal libraries
+from stock import Bars, BarStore
+
+
+STIMESTAMP = 1704067200  # 2024-01-01 00:00:00 UTC
+
+
+@pytest.fixture
+def bar_store(tmp_path):
+    """Fixture to create an empty BarStore."""
+    return BarStore(root=str(tmp_path))
+
+
+class Upstream:
+    """Fake /trading_view/history with one bar per minute, records every requested range."""
+
+    def __init__(self, rows: int = 1000):
+        self.dataframe = pandas.DataFrame(data={
+            "t": STIMESTAMP + numpy.arange(rows) * 60,
+            "o": numpy.linspace(1, 2, rows),
+            "h": numpy.linspace(1, 2, rows) + 0.01,
+            "l": numpy.linspace(1, 2, rows) - 0.01,
+            "c": numpy.linspace(1, 2, rows),
+            "v": numpy.arange(rows) * 100,
+        })
+        self.ranges = []
+
+    def fetch(self, stimestamp, etimestamp):
+        self.ranges.append((stimestamp, etimestamp))
+        return self.dataframe[(self.dataframe["t"] >= stimestamp) & (self.dataframe["t"] <= etimestamp)]
+
+
+def test_bars_downloads_only_missing_ranges(bar_store):
+    """Test that BarStore.bars only downloads the ranges it has not stored yet."""
+    upstream = Upstream()
+    bars = bar_store.bars(code="1818", resolution="1", stimestamp=STIMESTAMP + 6000, etimestamp=STIMESTAMP + 12000, fetch=upstream.fetch)
+    assert len(bars) == 101
+    bars = bar_store.bars(code="1818", resolution="1", stimestamp=STIMESTAMP + 6000, etimestamp=STIMESTAMP + 9000, fetch=upstream.fetch)
+    assert len(bars) == 51
+    assert len(upstream.ranges) == 1
+
+    bars = bar_store.bars(code="1818", resolution="1", stimestamp=STIMESTAMP, etimestamp=STIMESTAMP + 12000, fetch=upstream.fetch)
+    assert upstream.ranges[-1] == (STIMESTAMP, STIMESTAMP + 6000)
+    assert len(bars) == 201
+    assert numpy.all(numpy.diff(bars.t) == 60)
+    pandas.testing.assert_frame_equal(bars.to_dataframe(), upstream.dataframe.iloc[:201])
+
+
+def test_load_returns_memory_mapped_views(bar_store):
+    """Test that BarStore.load returns memory mapped views of the stored bars."""
+    upstream = Upstream()
+    bar_store.bars(code="1818", resolution="1", stimestamp=STIMESTAMP, etimestamp=STIMESTAMP + 60000, fetch=upstream.fetch)
+    bars = bar_store.load(code="1818", resolution="1", stimestamp=STIMESTAMP + 600, etimestamp=STIMESTAMP + 1200)
+    assert len(bars) == 11
+    assert isinstance(bars.c, numpy.memmap)
+    assert bars.t.dtype == numpy.int64
+    assert bars.d[0] == numpy.datetime64("2024-01-01T08:10:00")
+
+
+def test_empty(bar_store):
+    """Test loading a stock without stored bars and the empty Bars."""
+    assert len(bar_store.load(code="1818", resolution="1")) == 0
+    assert list(Bars.empty().to_dataframe().columns) == list(Bars.columns)